@@ -339,6 +339,10 @@ def _check_annotation(f_type, f_fullname, f_default):
 
         ot = typing_inspect.get_origin(f_type)
         if ot is None:
+            if typeutils.is_container_type(f_type):
+                # A subclass of a parametrized container type,
+                # e.g. class Foo(Dict[str, int]).
+                return f_type
             raise RuntimeError(
                 f'cannot find origin of a generic type {f_type}')
 
@@ -458,6 +462,9 @@ def _check_type_real(type_, value, raise_error):
         elif ot is not None:
             raise TypeError(f'unsupported typing type: {type_!r}')
 
+        elif value is not None and not isinstance(value, type_):
+            raise_error(type_.__name__, value)
+
     elif type_ is not Any:
         if value is not None and not isinstance(value, type_):
             raise_error(type_.__name__, value)
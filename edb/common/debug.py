@@ -105,6 +105,9 @@ class flags(metaclass=FlagsMeta):
     print_locals = Flag(
         doc="Include values of local variables in tracebacks.")
 
+    compile_stats = Flag(
+        doc="Print the compilation time histograms on server shutdown.")
+
     disable_qcache = Flag(
         doc="Disable server query cache. Parse/Execute will always recompile.")
 
@@ -0,0 +1,389 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Compact LR(1) parser tables and a parser driver running on them.
+
+A ``parsing.Spec`` keeps its action and goto tables as lists of dicts
+of Python objects, and loading it means unpickling all of them.  This
+module flattens the tables of an already constructed spec into two
+integer arrays:
+
+* the action table has a cell for every (state, terminal) pair, where
+  ``0`` is an error, ``n > 0`` is a shift to state ``n - 1``, and
+  ``n < 0`` is a reduction by production ``-n - 1``;
+
+* the goto table has a cell for every (state, non-terminal) pair
+  holding the state to go to after a reduction.
+
+The arrays are stored in a file along with the names of the grammar
+symbols and productions, and are memory-mapped when loaded, so
+loading the tables costs a single read of a small header.
+"""
+
+
+from __future__ import annotations
+from typing import *  # NoQA
+
+import array
+import hashlib
+import importlib
+import json
+import mmap
+import os
+import struct
+import sys
+import types
+
+import parsing
+
+
+MAGIC = b'EDBLRTBL'
+FORMAT_VERSION = 1
+
+# magic, format version, grammar fingerprint, metadata length
+_header = struct.Struct('=8sI20sI')
+_ALIGN = 8
+
+
+class Symbol:
+    """A grammar symbol, as seen by parsing.Token and parsing.Nonterm."""
+
+    __slots__ = ('name', 'prec', 'index')
+
+    def __init__(self, name: str, prec: str, index: int) -> None:
+        self.name = name
+        self.prec = prec
+        self.index = index
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+def grammar_fingerprint(mod: types.ModuleType) -> bytes:
+    """Return a digest of the grammar declared in *mod*.
+
+    The digest covers everything parsing.Spec introspects: docstrings
+    of the token, non-terminal and precedence classes, and docstrings
+    of the production methods.
+    """
+    h = hashlib.sha1()
+    h.update(f'{FORMAT_VERSION}\n'.encode())
+    for name, v in sorted(mod.__dict__.items()):
+        if not isinstance(v, type) or not isinstance(v.__doc__, str):
+            continue
+        h.update(f'{name}: {v.__doc__}\n'.encode())
+        if issubclass(v, parsing.Nonterm):
+            for attr, meth in sorted(v.__dict__.items()):
+                if (isinstance(meth, types.FunctionType)
+                        and isinstance(meth.__doc__, str)):
+                    h.update(f'  {attr}: {meth.__doc__}\n'.encode())
+    return h.digest()
+
+
+def _qualname(cls: type) -> Tuple[str, str]:
+    return (cls.__module__, cls.__qualname__)
+
+
+def _resolve(module: str, qualname: str) -> Any:
+    obj = sys.modules.get(module)
+    if obj is None:
+        obj = importlib.import_module(module)
+    for part in qualname.split('.'):
+        obj = getattr(obj, part)
+    return obj
+
+
+class Tables:
+
+    def __init__(
+        self,
+        *,
+        fingerprint: bytes,
+        tokens: Sequence[Tuple[type, str]],
+        nonterms: Sequence[Tuple[type, str]],
+        productions: Sequence[Tuple[int, int, str]],
+        action: Sequence[int],
+        goto: Sequence[int],
+    ) -> None:
+        self.fingerprint = fingerprint
+        self.tokens = [cls for cls, _ in tokens]
+        self.nonterms = [cls for cls, _ in nonterms]
+        self.token_names = [name for _, name in tokens]
+        self.nonterm_names = [name for _, name in nonterms]
+        self.productions = list(productions)
+        self.action = action
+        self.goto = goto
+        self.ntokens = len(self.tokens)
+        self.nnonterms = len(self.nonterms)
+
+        self.token_index = {cls: i for i, cls in enumerate(self.tokens)}
+
+        # parsing.Token and parsing.Nonterm look their symbol up
+        # in parser._spec._sym2spec when instantiated.
+        self._sym2spec = {}
+        for i, (cls, name) in enumerate(tokens):
+            self._sym2spec[cls] = Symbol(name, 'none', i)
+        for i, (cls, name) in enumerate(nonterms):
+            self._sym2spec[cls] = Symbol(name, 'none', i)
+
+        # (non-terminal class, non-terminal index, number of rhs symbols,
+        # reduction method) for every production.
+        self.reductions = [
+            (self.nonterms[lhs], lhs, nrhs, self.nonterms[lhs].__dict__[meth])
+            for lhs, nrhs, meth in self.productions
+        ]
+
+    @classmethod
+    def from_spec(cls, spec: parsing.Spec, *, fingerprint: bytes) -> Tables:
+        tokens = []
+        nonterms = []
+        for symcls, sym in spec._sym2spec.items():
+            if isinstance(sym, parsing.NontermSpec):
+                nonterms.append((int(sym), symcls, sym.name))
+            else:
+                tokens.append((int(sym), symcls, sym.name))
+
+        tokens.sort(key=lambda t: t[0])
+        nonterms.sort(key=lambda t: t[0])
+        token_index = {seq: i for i, (seq, *_) in enumerate(tokens)}
+        nonterm_index = {seq: i for i, (seq, *_) in enumerate(nonterms)}
+
+        ntokens = len(tokens)
+        nnonterms = len(nonterms)
+        nstates = len(spec._action)
+
+        productions = []
+        production_index = {}
+        action = [0] * (nstates * ntokens)
+        goto = [0] * (nstates * nnonterms)
+
+        for state, actions in enumerate(spec._action):
+            row = state * ntokens
+            for sym, (act,) in actions.items():
+                cell = row + token_index[int(sym)]
+                if isinstance(act, parsing.ShiftAction):
+                    action[cell] = act.nextState + 1
+                elif int(act.production.lhs) in nonterm_index:
+                    # The augmented start production (<S> ::= S <$>)
+                    # is never reduced: parsing stops once <$> is
+                    # shifted.
+                    prod = act.production
+                    idx = production_index.get(int(prod))
+                    if idx is None:
+                        idx = production_index[int(prod)] = len(productions)
+                        productions.append((
+                            nonterm_index[int(prod.lhs)],
+                            len(prod.rhs),
+                            prod.qualified.rpartition('.')[2],
+                        ))
+                    action[cell] = -idx - 1
+
+        for state, gotos in enumerate(spec._goto):
+            row = state * nnonterms
+            for sym, next_state in gotos.items():
+                goto[row + nonterm_index[int(sym)]] = next_state
+
+        typecode = _pick_typecode(action, goto)
+
+        return cls(
+            fingerprint=fingerprint,
+            tokens=[(c, name) for _, c, name in tokens],
+            nonterms=[(c, name) for _, c, name in nonterms],
+            productions=productions,
+            action=array.array(typecode, action),
+            goto=array.array(typecode, goto),
+        )
+
+    def dump(self, path: str) -> None:
+        typecode = _pick_typecode(self.action, self.goto)
+        action = array.array(typecode, self.action)
+        goto = array.array(typecode, self.goto)
+
+        meta = json.dumps({
+            'byteorder': sys.byteorder,
+            'typecode': typecode,
+            'tokens': [
+                (*_qualname(c), name)
+                for c, name in zip(self.tokens, self.token_names)
+            ],
+            'nonterms': [
+                (*_qualname(c), name)
+                for c, name in zip(self.nonterms, self.nonterm_names)
+            ],
+            'productions': self.productions,
+            'action_len': len(action),
+            'goto_len': len(goto),
+        }).encode()
+
+        header = _header.pack(MAGIC, FORMAT_VERSION, self.fingerprint,
+                              len(meta))
+        data = header + meta
+        data += b'\x00' * (-len(data) % _ALIGN)
+        data += action.tobytes()
+        data += b'\x00' * (-len(data) % _ALIGN)
+        data += goto.tobytes()
+
+        # Write to a temporary file first, so that concurrent
+        # readers never see a partially written file.
+        tmp_path = f'{path}.{id(self)}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, *, fingerprint: bytes) -> Optional[Tables]:
+        """Load the tables from *path*.
+
+        Return None if the file does not exist or does not match
+        the grammar with the given *fingerprint*.
+        """
+        try:
+            with open(path, 'rb') as f:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        if len(buf) < _header.size:
+            return None
+
+        magic, version, file_fingerprint, meta_len = _header.unpack_from(buf)
+        if (magic != MAGIC or version != FORMAT_VERSION
+                or file_fingerprint != fingerprint):
+            return None
+
+        offset = _header.size
+        meta = json.loads(buf[offset:offset + meta_len])
+        if meta['byteorder'] != sys.byteorder:
+            return None
+
+        typecode = meta['typecode']
+        itemsize = array.array(typecode).itemsize
+        view = memoryview(buf)
+
+        offset += meta_len
+        offset += -offset % _ALIGN
+        action_size = meta['action_len'] * itemsize
+        action = view[offset:offset + action_size].cast(typecode)
+
+        offset += action_size
+        offset += -offset % _ALIGN
+        goto_size = meta['goto_len'] * itemsize
+        goto = view[offset:offset + goto_size].cast(typecode)
+
+        return cls(
+            fingerprint=fingerprint,
+            tokens=[
+                (_resolve(mod, qualname), name)
+                for mod, qualname, name in meta['tokens']
+            ],
+            nonterms=[
+                (_resolve(mod, qualname), name)
+                for mod, qualname, name in meta['nonterms']
+            ],
+            productions=[tuple(p) for p in meta['productions']],
+            action=action,
+            goto=goto,
+        )
+
+
+def _pick_typecode(*tables: Sequence[int]) -> str:
+    lo = min(min(t, default=0) for t in tables)
+    hi = max(max(t, default=0) for t in tables)
+    if -2 ** 15 <= lo and hi < 2 ** 15:
+        return 'h'
+    else:
+        return 'i'
+
+
+class Lr:
+    """LR(1) parser driven by compact Tables.
+
+    This is a drop-in replacement for parsing.Lr: it is fed tokens
+    with token(), terminated with eoi(), and leaves the result in
+    start[0].
+    """
+
+    def __init__(self, tables: Tables) -> None:
+        self._spec = tables
+        self._tables = tables
+        self._start = None
+        self._states: List[int] = [0]
+        self._values: List[Any] = [None]
+
+    @property
+    def spec(self) -> Tables:
+        return self._tables
+
+    @property
+    def start(self) -> Optional[List[Any]]:
+        return self._start
+
+    def reset(self) -> None:
+        self._start = None
+        self._states = [0]
+        self._values = [None]
+
+    def token(self, token: parsing.Token) -> None:
+        """Feed a token to the parser."""
+        self._act(token, self._tables.token_index[type(token)])
+
+    def eoi(self) -> None:
+        """Signal end-of-input to the parser."""
+        self.token(parsing.EndOfInput(self))
+        # The stack is now [<bottom>, <start symbol>, <$>].
+        self._start = [self._values[1]]
+
+    def _act(self, sym: parsing.Token, term: int) -> None:
+        tables = self._tables
+        action = tables.action
+        goto = tables.goto
+        ntokens = tables.ntokens
+        nnonterms = tables.nnonterms
+        reductions = tables.reductions
+        states = self._states
+        values = self._values
+
+        while True:
+            act = action[states[-1] * ntokens + term]
+
+            if act > 0:
+                states.append(act - 1)
+                values.append(sym)
+                return
+
+            if act == 0:
+                raise parsing.UnexpectedToken(f'Unexpected token: {sym!r}')
+
+            ntcls, lhs, nrhs, method = reductions[-act - 1]
+            if nrhs:
+                rhs = values[-nrhs:]
+                del values[-nrhs:]
+                del states[-nrhs:]
+            else:
+                rhs = ()
+
+            nonterm = ntcls(self)
+            result = method(nonterm, *rhs)
+            # Like parsing.Lr, treat a None result as the non-terminal
+            # itself.
+            if result is None:
+                result = nonterm
+
+            values.append(result)
+            states.append(goto[states[-1] * nnonterms + lhs])
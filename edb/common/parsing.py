@@ -34,6 +34,7 @@ from edb import errors
 from edb.common.exceptions import add_context, get_context
 from edb.common import context as pctx
 from edb.common import lexer
+from edb.common import lrtables
 from edb._edgeql_rust import TokenizerError
 from edb.errors import EdgeQLSyntaxError
 
@@ -107,7 +108,21 @@ class Token(parsing.Token, metaclass=TokenMeta):
         super().__init__(parser)
         self.val = val
         self.clean_value = clean_value
-        self.context = context
+        # Either a ParserContext, or a callable producing one.  Most
+        # tokens never have their context looked at, so the parser
+        # defers building it until it is actually needed.
+        self._context = context
+
+    @property
+    def context(self):
+        context = self._context
+        if callable(context):
+            context = self._context = context()
+        return context
+
+    @context.setter
+    def context(self, context):
+        self._context = context
 
     def __repr__(self):
         return '<Token %s "%s">' % (self.__class__._token, self.val)
@@ -326,6 +341,7 @@ class Parser:
 
     def cleanup(self):
         self.__class__.parser_spec = None
+        self.__class__.parser_tables = None
         self.__class__.lexer_spec = None
         self.lexer = None
         self.parser = None
@@ -360,6 +376,45 @@ class Parser:
         self.__class__.parser_spec = spec
         return spec
 
+    def get_parser_tables(self):
+        cls = self.__class__
+
+        try:
+            tables = cls.__dict__['parser_tables']
+        except KeyError:
+            pass
+        else:
+            if tables is not None:
+                return tables
+
+        mod = self.get_parser_spec_module()
+        path = self.localpath(mod, 'tables')
+        fingerprint = lrtables.grammar_fingerprint(mod)
+
+        tables = lrtables.Tables.load(path, fingerprint=fingerprint)
+        if tables is None:
+            logger.info('Rebuilding parser tables for %s', mod.__name__)
+            tables = lrtables.Tables.from_spec(
+                self.get_parser_spec(), fingerprint=fingerprint)
+            try:
+                tables.dump(path)
+            except OSError:
+                # The package directory may be read-only,
+                # the tables will just be rebuilt next time.
+                pass
+
+        self.__class__.parser_tables = tables
+        return tables
+
+    def get_lr_parser(self):
+        if self.get_debug():
+            # Only the reference implementation can trace its actions.
+            parser = parsing.Lr(self.get_parser_spec())
+            parser.verbose = True
+        else:
+            parser = lrtables.Lr(self.get_parser_tables())
+        return parser
+
     def localpath(self, mod, type):
         return os.path.join(
             os.path.dirname(mod.__file__),
@@ -377,16 +432,30 @@ class Parser:
     def reset_parser(self, input):
         if not self.parser:
             self.lexer = self.get_lexer()
-            self.parser = parsing.Lr(self.get_parser_spec())
+            self.parser = self.get_lr_parser()
             self.parser.parser_data = self.parser_data
-            self.parser.verbose = self.get_debug()
 
         self.parser.reset()
         self.lexer.setinputstr(input)
 
     def process_lex_token(self, mod, tok):
         return mod.TokenMeta.for_lex_token(tok.kind())(
-            self.parser, tok.text(), tok.value(), self.context(tok))
+            self.parser, tok.text(), tok.value(), self.lazy_context(tok))
+
+    def lazy_context(self, tok):
+        lex = self.lexer
+        name = lex.filename if lex.filename else '<string>'
+        buffer = lex.inputstr
+        start = tok.start()
+        end = tok.end()
+
+        def context():
+            return pctx.ParserContext(
+                name=name, buffer=buffer,
+                start=pctx.SourcePoint(*start),
+                end=pctx.SourcePoint(*end))
+
+        return context
 
     def parse(self, input):
         try:
@@ -213,6 +213,12 @@ class Environment:
     allow_generic_type_output: bool
     """Whether to allow the expression to be of a generic type."""
 
+    implicit_fields_used: bool
+    """Whether implicit id or __tid__ fields were added to any shape."""
+
+    implicit_limit_used: bool
+    """Whether the implicit LIMIT was applied to any statement."""
+
     # Caches for costly operations in edb.ir.typeutils
     ptr_ref_cache: PointerRefCache
     type_ref_cache: Dict[uuid.UUID, irast.TypeRef]
@@ -246,6 +252,8 @@ class Environment:
         self.json_parameters = json_parameters
         self.session_mode = session_mode
         self.allow_generic_type_output = allow_generic_type_output
+        self.implicit_fields_used = False
+        self.implicit_limit_used = False
         self.schema_refs = set()
         self.created_schema_objects = set()
         self.func_params = func_params
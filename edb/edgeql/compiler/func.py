@@ -645,6 +645,7 @@ def finalize_args(
                     and ctx.implicit_limit
                     and isinstance(arg.expr, irast.SelectStmt)
                     and arg.expr.limit is None):
+                ctx.env.implicit_limit_used = True
                 arg.expr.limit = setgen.ensure_set(
                     dispatch.compile(
                         qlast.IntegerConstant(value=str(ctx.implicit_limit)),
@@ -29,9 +29,14 @@ from edb import errors
 from edb.ir import ast as irast
 from edb.ir import utils as irutils
 
+from edb.schema import caches as s_caches
+from edb.schema import casts as s_casts
 from edb.schema import functions as s_func
 from edb.schema import types as s_types
 
+if TYPE_CHECKING:
+    from edb.schema import schema as s_schema
+
 from edb.edgeql import qltypes as ft
 
 from . import context
@@ -73,12 +78,147 @@ _OPTIONAL = ft.TypeModifier.OPTIONAL
 _SINGLETON = ft.TypeModifier.SINGLETON
 
 
+class _Arity(NamedTuple):
+
+    #: The minimum number of positional arguments.
+    min_args: int
+    #: The maximum number of positional arguments, None if unbounded.
+    max_args: Optional[int]
+    #: Names of all named only parameters.
+    named: FrozenSet[str]
+    #: Names of named only parameters without a default.
+    required_named: FrozenSet[str]
+
+
+_ARITIES_CACHE = s_caches.CacheKind(
+    'callable_arities',
+    maxsize=8192,
+    depends_on=[s_func.CallableObject, s_func.Parameter],
+)
+
+# (candidate ids, argument type ids, keyword argument type ids,
+# whether in a polymorphic function) -> indexes of the matched
+# candidates.  The views and collection types derived while compiling
+# a query get new ids and never change their bases, so they do not
+# invalidate the resolutions.
+_RESOLUTIONS_CACHE = s_caches.CacheKind(
+    'call_resolutions',
+    maxsize=8192,
+    depends_on=[
+        s_func.CallableObject, s_func.Parameter, s_casts.Cast, s_types.Type,
+    ],
+    ignore_derived=True,
+)
+
+
+def _get_arity(
+        func: s_func.CallableObject, *,
+        schema: s_schema.Schema) -> _Arity:
+
+    cache = schema.get_cache(_ARITIES_CACHE)
+    try:
+        return cast(_Arity, cache[func.id])
+    except KeyError:
+        pass
+
+    min_args = 0
+    max_args: Optional[int] = 0
+    named: Set[str] = set()
+    required_named: Set[str] = set()
+
+    for param in func.get_params(schema).objects(schema):
+        kind = param.get_kind(schema)
+        has_default = param.get_default(schema) is not None
+        if kind is _POSITIONAL:
+            if not has_default:
+                min_args += 1
+            if max_args is not None:
+                max_args += 1
+        elif kind is _VARIADIC:
+            max_args = None
+        else:
+            shortname = param.get_shortname(schema)
+            named.add(shortname)
+            if not has_default:
+                required_named.add(shortname)
+
+    arity = cache[func.id] = _Arity(
+        min_args=min_args,
+        max_args=max_args,
+        named=frozenset(named),
+        required_named=frozenset(required_named),
+    )
+    return arity
+
+
 def find_callable(
         candidates: Iterable[s_func.CallableLike], *,
         args: Sequence[Tuple[s_types.Type, irast.Set]],
         kwargs: Mapping[str, Tuple[s_types.Type, irast.Set]],
         ctx: context.ContextLevel) -> List[BoundCall]:
 
+    candidates = tuple(candidates)
+    if not all(isinstance(c, s_func.CallableObject) for c in candidates):
+        # Ad-hoc callables (e.g. cast wrappers) are not schema
+        # objects and cannot be indexed.
+        return _find_callable(candidates, args=args, kwargs=kwargs, ctx=ctx)
+
+    schema = ctx.env.schema
+    cache = schema.get_cache(_RESOLUTIONS_CACHE)
+
+    in_polymorphic_func = (
+        ctx.env.func_params is not None and
+        ctx.env.func_params.has_polymorphic(schema)
+    )
+
+    key = (
+        tuple(c.id for c in candidates),
+        tuple(arg_type.id for arg_type, _ in args),
+        tuple(sorted((n, arg_type.id) for n, (arg_type, _) in kwargs.items())),
+        in_polymorphic_func,
+    )
+
+    matched_idx: Optional[Tuple[int, ...]] = cache.get(key)
+    if matched_idx is not None:
+        # The resolution only depends on the types of the arguments,
+        # so only the winning candidates need to be bound.
+        matched = []
+        for i in matched_idx:
+            call = try_bind_call_args(args, kwargs, candidates[i], ctx=ctx)
+            assert call is not None
+            matched.append(call)
+        return matched
+
+    # Skip the candidates that cannot possibly accept the given number
+    # of positional arguments and the given keyword arguments.
+    nargs = len(args)
+    kwnames = kwargs.keys()
+    viable = []
+    for i, candidate in enumerate(candidates):
+        arity = _get_arity(
+            cast(s_func.CallableObject, candidate), schema=schema)
+        if (nargs >= arity.min_args
+                and (arity.max_args is None or nargs <= arity.max_args)
+                and kwnames <= arity.named
+                and arity.required_named <= kwnames):
+            viable.append(i)
+
+    matched = _find_callable(
+        [candidates[i] for i in viable], args=args, kwargs=kwargs, ctx=ctx)
+
+    matched_funcs = {id(call.func) for call in matched}
+    cache[key] = tuple(
+        i for i in viable if id(candidates[i]) in matched_funcs)
+
+    return matched
+
+
+def _find_callable(
+        candidates: Iterable[s_func.CallableLike], *,
+        args: Sequence[Tuple[s_types.Type, irast.Set]],
+        kwargs: Mapping[str, Tuple[s_types.Type, irast.Set]],
+        ctx: context.ContextLevel) -> List[BoundCall]:
+
     implicit_cast_distance = None
     matched = []
 
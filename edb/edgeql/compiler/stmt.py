@@ -72,6 +72,7 @@ def compile_SelectQuery(
                 and ctx.implicit_limit and not sctx.inhibit_implicit_limit):
             expr.limit = qlast.IntegerConstant(value=str(ctx.implicit_limit))
             sctx.inhibit_implicit_limit = True
+            ctx.env.implicit_limit_used = True
 
         stmt.result = compile_result_clause(
             expr.result,
@@ -162,6 +163,7 @@ def compile_ForQuery(
 
         if ((ctx.expr_exposed or sctx.stmt is ctx.toplevel_stmt)
                 and ctx.implicit_limit):
+            ctx.env.implicit_limit_used = True
             stmt.limit = setgen.ensure_set(
                 dispatch.compile(
                     qlast.IntegerConstant(value=str(ctx.implicit_limit)),
@@ -218,6 +218,8 @@ def fini_expression(
         stype=expr_type,
         view_shapes=ctx.env.view_shapes,
         view_shapes_metadata=ctx.env.view_shapes_metadata,
+        implicit_fields_used=ctx.env.implicit_fields_used,
+        implicit_limit_used=ctx.env.implicit_limit_used,
         schema=ctx.env.schema,
         schema_refs=frozenset(
             ctx.env.schema_refs - ctx.env.created_schema_objects),
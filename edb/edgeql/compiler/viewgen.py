@@ -791,12 +791,17 @@ def has_implicit_tid(
         is_mutation: bool,
         ctx: context.ContextLevel) -> bool:
 
-    return (
+    implicit_tid = (
         stype.is_object_type()
         and not is_mutation
         and ctx.implicit_tid_in_shapes
     )
 
+    if implicit_tid:
+        ctx.env.implicit_fields_used = True
+
+    return implicit_tid
+
 
 def _get_shape_configuration(
         ir_set: irast.Set, *,
@@ -855,6 +860,9 @@ def _get_shape_configuration(
                                     s_types.ExprType.Update)
         is_parent_update = parent_view_type is s_types.ExprType.Update
 
+        if ctx.implicit_id_in_shapes and not is_mutation:
+            ctx.env.implicit_fields_used = True
+
         implicit_id = (
             # shape is not specified at all
             not shape_ptrs
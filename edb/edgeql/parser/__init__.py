@@ -65,6 +65,6 @@ def parse_sdl(expr, module_aliases=None):
 
 
 def preload():
-    ql_parser.EdgeQLBlockParser().get_parser_spec()
-    ql_parser.EdgeQLExpressionParser().get_parser_spec()
-    ql_parser.EdgeSDLParser().get_parser_spec()
+    ql_parser.EdgeQLBlockParser().get_parser_tables()
+    ql_parser.EdgeQLExpressionParser().get_parser_tables()
+    ql_parser.EdgeSDLParser().get_parser_tables()
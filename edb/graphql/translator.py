@@ -49,6 +49,16 @@ ARG_TYPES = {
     'String': gql_ast.StringValue,
 }
 
+# Parameters of the query cost model.  Every object fetched costs
+# OBJECT_COST, plus FILTER_COST if it has to be checked against a
+# filter.  The number of objects a multi field is expected to return
+# is its static limit, if there is one, and otherwise DEFAULT_MULTI_SIZE
+# for the top-level fields and DEFAULT_LINK_SIZE for multi links.
+OBJECT_COST = 1
+FILTER_COST = 1
+DEFAULT_MULTI_SIZE = 100
+DEFAULT_LINK_SIZE = 10
+
 
 class GraphQLTranslatorContext:
     def __init__(self, *, gqlcore: gt.GQLCoreSchema,
@@ -61,6 +71,7 @@ class GraphQLTranslatorContext:
         self.path = []
         self.filter = None
         self.include_base = [False]
+        self.costs = [0]
         self.gqlcore = gqlcore
         self.query = query
         self.document_ast = document_ast
@@ -98,6 +109,7 @@ class Operation(NamedTuple):
     stmt: Any
     critvars: Any
     vars: Any
+    cost: int
 
 
 class TranspiledOperation(NamedTuple):
@@ -106,6 +118,7 @@ class TranspiledOperation(NamedTuple):
     cacheable: bool
     cache_deps_vars: dict
     variables_desc: dict
+    cost: int
 
 
 class GraphQLTranslator:
@@ -249,6 +262,8 @@ class GraphQLTranslator:
         if opname != self._context.operation_name:
             return None
 
+        self._context.costs = [0]
+
         if node.operation is None or node.operation == 'query':
             stmt = self._visit_query(node)
         elif node.operation is None or node.operation == 'mutation':
@@ -269,6 +284,7 @@ class GraphQLTranslator:
             stmt=stmt,
             critvars=critvars,
             vars=defvars,
+            cost=self._context.costs[0],
         )
 
     def _visit_query(self, node):
@@ -470,6 +486,9 @@ class GraphQLTranslator:
         is_top, path, prevt, target, steps = \
             self._prepare_field(node)
 
+        # accumulate the cost of the nested fields
+        self._context.costs.append(0)
+
         json_mode = False
         is_shadowed = prevt.is_field_shadowed(node.name.value)
 
@@ -626,9 +645,44 @@ class GraphQLTranslator:
                 filterable.result.expr = qlast.Path(
                     steps=[qlast.ObjectRef(name=alias)])
 
+        nested_cost = self._context.costs.pop()
+        if node.selection_set is not None and not json_mode:
+            self._context.costs[-1] += self._get_field_cost(
+                node, prevt, filterable, nested_cost)
+
         path.pop()
         return spec
 
+    def _get_field_cost(self, node, prevt, filterable, nested_cost):
+        # Estimate the cost of fetching the objects of a field as the
+        # number of objects it's expected to produce multiplied by
+        # the cost of fetching each one of them (including the nested
+        # fields).  Terminal fields are considered free.
+        cost = OBJECT_COST + nested_cost
+
+        if (isinstance(filterable, qlast.FilterMixin) and
+                filterable.where is not None):
+            cost += FILTER_COST
+
+        limit = None
+        if isinstance(filterable, qlast.OffsetLimitMixin):
+            limit = filterable.limit
+
+        ptr = None
+        if not isinstance(prevt, gt.GQLBaseQuery):
+            ptr = prevt.edb_base.getptr(prevt.edb_schema, node.name.value)
+
+        if ptr is not None and ptr.singular(prevt.edb_schema):
+            size = 1
+        elif isinstance(limit, qlast.IntegerConstant):
+            size = int(limit.value)
+        elif ptr is None:
+            size = DEFAULT_MULTI_SIZE
+        else:
+            size = DEFAULT_LINK_SIZE
+
+        return size * cost
+
     def visit_InlineFragment(self, node):
         self._validate_fragment_type(node, node)
         result = self.visit(node.selection_set)
@@ -1501,7 +1555,7 @@ def value_node_from_pyvalue(val: Any):
 
 
 def translate(gqlcore: gt.GQLCoreSchema, query, *,
-              operation_name=None, variables=None):
+              operation_name=None, variables=None, max_cost=None):
     try:
         document_ast = graphql.parse(query)
     except graphql.GraphQLError as err:
@@ -1521,7 +1575,8 @@ def translate(gqlcore: gt.GQLCoreSchema, query, *,
     for n, v in variables.items():
         gql_vars[n] = value_node_from_pyvalue(v)
 
-    validation_errors = graphql.validate(gqlcore.graphql_schema, document_ast)
+    validation_errors = graphql.validate(
+        gqlcore.get_graphql_schema_for(document_ast), document_ast)
     if validation_errors:
         err = validation_errors[0]
         if isinstance(err, graphql.GraphQLError):
@@ -1549,6 +1604,14 @@ def translate(gqlcore: gt.GQLCoreSchema, query, *,
 
     op = next(iter(edge_forest_map.values()))
 
+    if debug.flags.graphql_compile:
+        print(f'cost: {op.cost}')
+
+    if max_cost is not None and op.cost > max_cost:
+        raise g_errors.GraphQLValidationError(
+            f'the estimated cost of the operation ({op.cost}) exceeds '
+            f'the maximum allowed cost ({max_cost})')
+
     # convert critvars and vars to JSON-like format
     critvars = {}
     for name, val in op.critvars.items():
@@ -1566,6 +1629,7 @@ def translate(gqlcore: gt.GQLCoreSchema, query, *,
         cacheable=True,
         cache_deps_vars=dict(critvars) if critvars else None,
         variables_desc=defvars,
+        cost=op.cost,
     )
 
 
@@ -42,6 +42,8 @@ from graphql.type import GraphQLEnumValue, GraphQLScalarType
 from graphql.language import ast as gql_ast
 import itertools
 
+from edb.common import lru
+
 from edb.edgeql import ast as qlast
 from edb.edgeql import qltypes
 from edb.edgeql import codegen
@@ -174,6 +176,70 @@ GQL_TO_OPS_MAP = {
 
 HIDDEN_MODULES = s_schema.STD_MODULES - {'std'}
 TOP_LEVEL_TYPES = {'Query', 'Mutation'}
+INTROSPECTION_FIELDS = {'__schema', '__type'}
+BUILTIN_TYPE_NAMES = {'Query', 'String', 'Int', 'Float', 'Boolean', 'ID'}
+CUSTOM_SCALARS = (GraphQLInt64, GraphQLBigint, GraphQLDecimal)
+# The number of query schemas restricted to particular root fields
+# kept by every GQLCoreSchema.
+QUERY_SCHEMA_CACHE_SIZE = 100
+
+
+def _has_introspection_fields(selection_set):
+    if selection_set is None:
+        return False
+
+    for sel in selection_set.selections:
+        if (isinstance(sel, gql_ast.Field) and
+                sel.name.value in INTROSPECTION_FIELDS):
+            return True
+
+        if _has_introspection_fields(getattr(sel, 'selection_set', None)):
+            return True
+
+    return False
+
+
+def _collect_root_fields(selection_set, fragments, names, visited):
+    for sel in selection_set.selections:
+        if isinstance(sel, gql_ast.Field):
+            names.add(sel.name.value)
+        elif isinstance(sel, gql_ast.InlineFragment):
+            _collect_root_fields(
+                sel.selection_set, fragments, names, visited)
+        elif isinstance(sel, gql_ast.FragmentSpread):
+            fragname = sel.name.value
+            if fragname not in visited and fragname in fragments:
+                visited.add(fragname)
+                _collect_root_fields(
+                    fragments[fragname].selection_set, fragments, names,
+                    visited)
+
+
+def _collect_type_names(document_ast, names):
+    for definition in document_ast.definitions:
+        if isinstance(definition, gql_ast.OperationDefinition):
+            for vardef in definition.variable_definitions or ():
+                vartype = vardef.type
+                while not isinstance(vartype, gql_ast.NamedType):
+                    vartype = vartype.type
+                names.add(vartype.name.value)
+        elif isinstance(definition, gql_ast.FragmentDefinition):
+            names.add(definition.type_condition.name.value)
+
+        _collect_fragment_type_names(definition.selection_set, names)
+
+
+def _collect_fragment_type_names(selection_set, names):
+    if selection_set is None:
+        return
+
+    for sel in selection_set.selections:
+        if (isinstance(sel, gql_ast.InlineFragment) and
+                sel.type_condition is not None):
+            names.add(sel.type_condition.name.value)
+
+        _collect_fragment_type_names(
+            getattr(sel, 'selection_set', None), names)
 
 
 class GQLCoreSchema:
@@ -195,38 +261,37 @@ class GQLCoreSchema:
         self._gql_ordertypes = {}
         self._gql_enums = {}
 
-        self._define_types()
-
-        query = self._gql_objtypes['Query'] = GraphQLObjectType(
-            name='Query',
-            fields=self.get_fields('Query'),
-        )
-
-        # If a database only has abstract types and scalars, no
-        # mutations will be possible (such as in a blank database),
-        # but we would still want the reflection to work without
-        # error, even if all that can be discovered through GraphQL
-        # then is the schema.
-        fields = self.get_fields('Mutation')
-        if fields:
-            mutation = self._gql_objtypes['Mutation'] = GraphQLObjectType(
-                name='Mutation',
-                fields=fields,
-            )
-        else:
-            mutation = None
+        self.define_enums()
+        self.define_generic_filter_types()
+        self.define_generic_order_types()
+        self.define_generic_insert_types()
 
-        # get a sorted list of types relevant for the Schema
-        types = [
-            objt for name, objt in
-            itertools.chain(self._gql_objtypes.items(),
-                            self._gql_inobjtypes.items())
-            # the Query is included separately
-            if name not in TOP_LEVEL_TYPES
-        ]
-        types = sorted(types, key=lambda x: x.name)
-        self._gql_schema = GraphQLSchema(
-            query=query, mutation=mutation, types=types)
+        # The GraphQL types reflecting the EdgeDB object types are
+        # defined on demand: building a GraphQL schema forces the
+        # fields of every type reachable from it, and most operations
+        # only need the few types they select.
+        self._edb_objtypes = {}
+        # Maps the names of the GraphQL types reflecting an object
+        # type (the interface, the object type and the filter and order
+        # inputs) onto the name of the EdgeDB type.
+        self._gql_type_names = {}
+        for t in self.edb_schema.get_objects(included_modules=self.modules,
+                                             type=s_objtypes.ObjectType):
+            t_name = t.get_name(self.edb_schema)
+            gql_name = self.get_gql_name(t_name)
+            self._edb_objtypes[t_name] = t
+            self._gql_type_names[gql_name] = t_name
+            self._gql_type_names[gql_name + '_Type'] = t_name
+            self._gql_type_names[
+                self.get_input_name('Filter', gql_name)] = t_name
+            self._gql_type_names[
+                self.get_input_name('Order', gql_name)] = t_name
+
+        self._all_types_defined = False
+        self._gql_schema = None
+        self._gql_query_schema = None
+        self._gql_query_schemas = lru.LRUMapping(
+            maxsize=QUERY_SCHEMA_CACHE_SIZE)
 
         # this map is used for GQL -> EQL translator needs
         self._type_map = {}
@@ -237,8 +302,162 @@ class GQLCoreSchema:
 
     @property
     def graphql_schema(self):
+        """The complete GraphQL schema, including mutations."""
+        if self._gql_schema is None:
+            self._define_types()
+
+            # If a database only has abstract types and scalars, no
+            # mutations will be possible (such as in a blank database),
+            # but we would still want the reflection to work without
+            # error, even if all that can be discovered through GraphQL
+            # then is the schema.
+            fields = self.get_fields('Mutation')
+            if fields:
+                mutation = self._gql_objtypes['Mutation'] = \
+                    GraphQLObjectType(
+                        name='Mutation',
+                        fields=fields,
+                    )
+            else:
+                mutation = None
+
+            types = sorted(
+                itertools.chain(
+                    self._get_output_types(),
+                    self._gql_inobjtypes.values()),
+                key=lambda x: x.name)
+
+            self._gql_schema = GraphQLSchema(
+                query=self._get_query_type(),
+                mutation=mutation,
+                types=types)
+
         return self._gql_schema
 
+    @property
+    def graphql_query_schema(self):
+        """The GraphQL schema of all non-introspection queries."""
+        if self._gql_schema is not None:
+            return self._gql_schema
+
+        if self._gql_query_schema is None:
+            for t_name in self._edb_objtypes:
+                self._get_interface(t_name)
+                self._get_objtype(t_name)
+
+            self._gql_query_schema = GraphQLSchema(
+                query=self._get_query_type(),
+                types=sorted(self._get_output_types(), key=lambda x: x.name))
+
+        return self._gql_query_schema
+
+    def get_graphql_schema_for(self, document_ast):
+        """Get the smallest GraphQL schema sufficient for the document."""
+        if self._gql_schema is not None:
+            return self._gql_schema
+
+        fragments = {}
+        for definition in document_ast.definitions:
+            if (isinstance(definition, gql_ast.OperationDefinition) and
+                    definition.operation == 'mutation'):
+                return self.graphql_schema
+
+            if _has_introspection_fields(definition.selection_set):
+                return self.graphql_schema
+
+            if isinstance(definition, gql_ast.FragmentDefinition):
+                fragments[definition.name.value] = definition
+
+        root_fields = set()
+        for definition in document_ast.definitions:
+            if isinstance(definition, gql_ast.OperationDefinition):
+                _collect_root_fields(
+                    definition.selection_set, fragments, root_fields, set())
+
+        # The types named by the fragment type conditions and the
+        # variable definitions must be in the schema too.
+        type_names = set()
+        _collect_type_names(document_ast, type_names)
+
+        roots = set()
+        for name in root_fields - {'__typename'}:
+            t_name = self._gql_type_names.get(name)
+            if t_name is None or self.get_gql_name(t_name) != name:
+                # Let the validation report the unknown field against
+                # the complete Query type.
+                return self.graphql_query_schema
+            roots.add(t_name)
+
+        if not roots:
+            return self.graphql_query_schema
+
+        roots = frozenset(roots)
+        types = frozenset(type_names - BUILTIN_TYPE_NAMES)
+
+        key = (roots, types)
+        schema = self._gql_query_schemas.get(key)
+        if schema is None:
+            schema = self._build_query_schema(roots, types)
+            self._gql_query_schemas[key] = schema
+
+        return schema
+
+    def _build_query_schema(self, roots, type_names):
+        types = []
+        for name in type_names:
+            t_name = self._gql_type_names.get(name)
+            if t_name is not None:
+                for gqltype in (self._get_interface(t_name),
+                                self._get_objtype(t_name),
+                                self._gql_inobjtypes[t_name],
+                                self._gql_ordertypes[t_name]):
+                    if gqltype is not None and gqltype.name == name:
+                        types.append(gqltype)
+                continue
+
+            gqltype = self._get_generic_type(name)
+            if gqltype is None:
+                # A type defined on demand (such as a nested filter),
+                # or an unknown one, which the validation will report.
+                return self.graphql_query_schema
+            types.append(gqltype)
+
+        query = GraphQLObjectType(
+            name='Query',
+            fields=partial(self.get_query_fields, roots),
+        )
+
+        return GraphQLSchema(
+            query=query,
+            types=sorted(types, key=lambda x: x.name))
+
+    def _get_generic_type(self, name):
+        for gqltype in itertools.chain(
+                CUSTOM_SCALARS,
+                self._gql_enums.values(),
+                self._gql_ordertypes.values(),
+                self._gql_inobjtypes.values()):
+            if gqltype.name == name:
+                return gqltype
+
+        return None
+
+    def _get_query_type(self):
+        query = self._gql_objtypes.get('Query')
+        if query is None:
+            query = self._gql_objtypes['Query'] = GraphQLObjectType(
+                name='Query',
+                fields=self.get_fields('Query'),
+            )
+        return query
+
+    def _get_output_types(self):
+        return [
+            objt for name, objt in self._gql_objtypes.items()
+            # the Query is included separately
+            if name not in TOP_LEVEL_TYPES
+        ]
+
     def get_gql_name(self, name):
         module, shortname = name.split('::', 1)
         if module in {'default', 'std'}:
@@ -288,10 +507,9 @@ class GQLCoreSchema:
                 target = GraphQLList(GraphQLNonNull(el_type))
 
         elif edb_target.is_object_type():
-            target = self._gql_interfaces.get(
-                edb_target.get_name(self.edb_schema),
-                self._gql_objtypes.get(edb_target.get_name(self.edb_schema))
-            )
+            t_name = edb_target.get_name(self.edb_schema)
+            if t_name in self._edb_objtypes:
+                target = self._get_interface(t_name)
 
         elif edb_target.is_scalar() and edb_target.is_enum(self.edb_schema):
             name = self.get_gql_name(edb_target.get_name(self.edb_schema))
@@ -348,6 +566,8 @@ class GQLCoreSchema:
         return target
 
     def _get_query_args(self, typename):
+        # the filter and order types are defined with the interface
+        self._get_interface(typename)
         return {
             'filter': GraphQLArgument(self._gql_inobjtypes[typename]),
             'order': GraphQLArgument(self._gql_ordertypes[typename]),
@@ -384,18 +604,26 @@ class GQLCoreSchema:
         args['data'] = GraphQLArgument(GraphQLNonNull(uptype))
         return args
 
+    def get_query_fields(self, names=None):
+        fields = OrderedDict()
+
+        if names is None:
+            names = self._edb_objtypes
+
+        for name in sorted(names, key=self.get_gql_name):
+            gqltype = self._get_interface(name)
+            fields[gqltype.name] = GraphQLField(
+                GraphQLList(GraphQLNonNull(gqltype)),
+                args=self._get_query_args(name),
+            )
+
+        return fields
+
     def get_fields(self, typename):
         fields = OrderedDict()
 
         if typename == 'Query':
-            for name, gqltype in sorted(self._gql_interfaces.items(),
-                                        key=lambda x: x[1].name):
-                if name in TOP_LEVEL_TYPES:
-                    continue
-                fields[gqltype.name] = GraphQLField(
-                    GraphQLList(GraphQLNonNull(gqltype)),
-                    args=self._get_query_args(name),
-                )
+            fields = self.get_query_fields()
         elif typename == 'Mutation':
             for name, gqltype in sorted(self._gql_objtypes.items(),
                                         key=lambda x: x[1].name):
@@ -464,9 +692,9 @@ class GQLCoreSchema:
         return fields
 
     def get_filter_fields(self, typename, nested=False):
-        selftype = self._gql_inobjtypes[typename]
         fields = OrderedDict()
         if not nested:
+            selftype = self._gql_inobjtypes[typename]
             fields['and'] = GraphQLInputObjectField(
                 GraphQLList(GraphQLNonNull(selftype)))
             fields['or'] = GraphQLInputObjectField(
@@ -852,97 +1080,105 @@ class GQLCoreSchema:
 
         return fields
 
-    def _define_types(self):
-        interface_types = []
-        obj_types = []
+    def _get_interface(self, t_name):
+        # Every ObjectType is reflected as an interface.
+        gqltype = self._gql_interfaces.get(t_name)
+        if gqltype is not None:
+            return gqltype
+
+        t = self._edb_objtypes[t_name]
+        gql_name = self.get_gql_name(t_name)
+        gqltype = GraphQLInterfaceType(
+            name=gql_name,
+            fields=partial(self.get_fields, t_name),
+            resolve_type=lambda obj, info: obj,
+            description=self._get_description(t),
+        )
+        self._gql_interfaces[t_name] = gqltype
 
-        self.define_enums()
-        self.define_generic_filter_types()
-        self.define_generic_order_types()
-        self.define_generic_insert_types()
+        # input object types corresponding to this interface
+        gqlfiltertype = GraphQLInputObjectType(
+            name=self.get_input_name('Filter', gql_name),
+            fields=partial(self.get_filter_fields, t_name),
+        )
+        self._gql_inobjtypes[t_name] = gqlfiltertype
 
-        # Every ObjectType is reflected as an interface.
-        interface_types = list(
-            self.edb_schema.get_objects(included_modules=self.modules,
-                                        type=s_objtypes.ObjectType))
+        # ordering input type
+        gqlordertype = GraphQLInputObjectType(
+            name=self.get_input_name('Order', gql_name),
+            fields=partial(self.get_order_fields, t_name),
+        )
+        self._gql_ordertypes[t_name] = gqlordertype
 
-        # concrete types are also reflected as Type (with a '_Type' postfix)
-        obj_types += [t for t in interface_types
-                      if not t.get_is_abstract(self.edb_schema)]
+        return gqltype
 
-        # interfaces
-        for t in interface_types:
-            t_name = t.get_name(self.edb_schema)
-            gql_name = self.get_gql_name(t_name)
-            gqltype = GraphQLInterfaceType(
-                name=gql_name,
-                fields=partial(self.get_fields, t_name),
-                resolve_type=lambda obj, info: obj,
-                description=self._get_description(t),
-            )
-            self._gql_interfaces[t_name] = gqltype
+    def _get_objtype(self, t_name):
+        # concrete types are also reflected as Type (with a '_Type' postfix)
+        gqltype = self._gql_objtypes.get(t_name)
+        if gqltype is not None:
+            return gqltype
 
-            # input object types corresponding to this interface
-            gqlfiltertype = GraphQLInputObjectType(
-                name=self.get_input_name('Filter', gql_name),
-                fields=partial(self.get_filter_fields, t_name),
-            )
-            self._gql_inobjtypes[t_name] = gqlfiltertype
+        t = self._edb_objtypes[t_name]
+        if t.get_is_abstract(self.edb_schema):
+            return None
 
-            # ordering input type
-            gqlordertype = GraphQLInputObjectType(
-                name=self.get_input_name('Order', gql_name),
-                fields=partial(self.get_order_fields, t_name),
-            )
-            self._gql_ordertypes[t_name] = gqlordertype
+        interfaces = [self._get_interface(t_name)]
 
-            # update object types corresponding to this object (all
-            # non-views can appear as update types)
-            if not t.is_view(self.edb_schema):
-                # only objects that have at least one non-readonly
-                # link/property are eligible
-                pointers = t.get_pointers(self.edb_schema)
-                if any(not p.get_readonly(self.edb_schema)
-                       for _, p in pointers.items(self.edb_schema)):
-                    gqlupdatetype = GraphQLInputObjectType(
-                        name=self.get_input_name('Update', gql_name),
-                        fields=partial(self.get_update_fields, t_name),
-                    )
-                    self._gql_inobjtypes[f'Update{t_name}'] = gqlupdatetype
+        ancestors = t.get_ancestors(self.edb_schema)
+        for st in ancestors.objects(self.edb_schema):
+            st_name = st.get_name(self.edb_schema)
+            if st.is_object_type() and st_name in self._edb_objtypes:
+                interfaces.append(self._get_interface(st_name))
 
-        # object types
-        for t in obj_types:
-            interfaces = []
-            t_name = t.get_name(self.edb_schema)
+        gql_name = self.get_gql_name(t_name)
+        gqltype = GraphQLObjectType(
+            name=gql_name + '_Type',
+            fields=partial(self.get_fields, t_name),
+            interfaces=interfaces,
+            description=self._get_description(t),
+        )
+        self._gql_objtypes[t_name] = gqltype
 
-            if t_name in self._gql_interfaces:
-                interfaces.append(self._gql_interfaces[t_name])
+        return gqltype
 
-            ancestors = t.get_ancestors(self.edb_schema)
-            for st in ancestors.objects(self.edb_schema):
-                if (st.is_object_type() and
-                        st.get_name(self.edb_schema) in self._gql_interfaces):
-                    interfaces.append(
-                        self._gql_interfaces[st.get_name(self.edb_schema)])
+    def _define_types(self):
+        # Define all types, including the input types of mutations.
+        if self._all_types_defined:
+            return
 
+        for t_name, t in self._edb_objtypes.items():
             gql_name = self.get_gql_name(t_name)
-            gqltype = GraphQLObjectType(
-                name=gql_name + '_Type',
-                fields=partial(self.get_fields, t_name),
-                interfaces=interfaces,
-                description=self._get_description(t),
-            )
-            self._gql_objtypes[t_name] = gqltype
+            self._get_interface(t_name)
+            objtype = self._get_objtype(t_name)
+
+            if t.is_view(self.edb_schema):
+                continue
+
+            # update object types corresponding to this object (all
+            # non-views can appear as update types)
+            #
+            # only objects that have at least one non-readonly
+            # link/property are eligible
+            pointers = t.get_pointers(self.edb_schema)
+            if any(not p.get_readonly(self.edb_schema)
+                   for _, p in pointers.items(self.edb_schema)):
+                gqlupdatetype = GraphQLInputObjectType(
+                    name=self.get_input_name('Update', gql_name),
+                    fields=partial(self.get_update_fields, t_name),
+                )
+                self._gql_inobjtypes[f'Update{t_name}'] = gqlupdatetype
 
             # input object types corresponding to this object (only
             # real objects can appear as input objects)
-            if not t.is_view(self.edb_schema):
+            if objtype is not None:
                 gqlinserttype = GraphQLInputObjectType(
                     name=self.get_input_name('Insert', gql_name),
                     fields=partial(self.get_insert_fields, t_name),
                 )
                 self._gql_inobjtypes[f'Insert{t_name}'] = gqlinserttype
 
+        self._all_types_defined = True
+
     def get(self, name, *, dummy=False):
         '''Get a special GQL type either by name or based on EdgeDB type.'''
         # normalize name and possibly add 'edb_base' to kwargs
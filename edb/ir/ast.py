@@ -408,6 +408,10 @@ class Statement(Command):
     schema_refs: typing.FrozenSet[so.Object]
     new_coll_types: typing.FrozenSet[s_types.Collection]
     scope_tree: ScopeTreeNode
+    # Whether the implicit shape fields or the implicit LIMIT
+    # requested by the caller have affected this statement.
+    implicit_fields_used: bool = False
+    implicit_limit_used: bool = False
     source_map: typing.Dict[s_pointers.Pointer,
                             typing.Tuple[qlast.Expr,
                                          compiler.ContextLevel,
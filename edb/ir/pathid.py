@@ -63,7 +63,7 @@ class PathId:
     """
 
     __slots__ = ('_path', '_norm_path', '_namespace', '_prefix',
-                 '_is_ptr', '_is_linkprop')
+                 '_is_ptr', '_is_linkprop', '_hash', '_derived')
 
     #: Actual path information.
     _path: Tuple[
@@ -99,6 +99,14 @@ class PathId:
     #: True if this PathId represents a link property path.
     _is_linkprop: bool
 
+    #: Cached hash of this PathId, computed on first use.
+    _hash: Optional[int]
+
+    #: PathIds derived from this one with extend() and replace_namespace(),
+    #: memoized so that deriving the same path twice yields the same
+    #: (and thus cheaply comparable) object.
+    _derived: Optional[Dict[Tuple[Any, ...], PathId]]
+
     def __init__(
         self,
         initializer: Optional[PathId] = None,
@@ -106,6 +114,8 @@ class PathId:
         namespace: AbstractSet[str] = frozenset(),
         typename: Optional[str] = None,
     ) -> None:
+        self._hash = None
+        self._derived = None
         if isinstance(initializer, PathId):
             self._path = initializer._path
             self._norm_path = initializer._norm_path
@@ -207,21 +217,51 @@ class PathId:
         return pid
 
     def __hash__(self) -> int:
-        return hash((
-            self.__class__, self._norm_path,
-            self._namespace, self._prefix, self._is_ptr))
+        # PathIds are only mutated by the methods of this class
+        # right after being created and before being handed out,
+        # so the hash can be computed once.
+        if self._hash is None:
+            self._hash = hash((
+                self.__class__, self._norm_path,
+                self._namespace, self._prefix, self._is_ptr))
+        return self._hash
 
     def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+
         if not isinstance(other, PathId):
             return NotImplemented
 
         return (
+            hash(self) == hash(other) and
             self._norm_path == other._norm_path and
             self._namespace == other._namespace and
             self._prefix == other._prefix and
             self._is_ptr == other._is_ptr
         )
 
+    def __copy__(self) -> PathId:
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> PathId:
+        return self
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The memoized derived PathIds are keyed by object ids,
+        # which are meaningless outside of this process.
+        return {
+            attr: getattr(self, attr)
+            for attr in self.__slots__
+            if attr not in ('_hash', '_derived')
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._hash = None
+        self._derived = None
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
     def __len__(self) -> int:
         return len(self._path)
 
@@ -269,6 +309,17 @@ class PathId:
         if not self:
             raise ValueError('cannot extend empty PathId')
 
+        # The cached PathId keeps *ptrref* alive, so its id() is
+        # not going to be reused while the cache entry exists.
+        key = ('extend', id(ptrref), direction, frozenset(ns))
+        if self._derived is None:
+            self._derived = {}
+        else:
+            try:
+                return self._derived[key]
+            except KeyError:
+                pass
+
         if direction is s_pointers.PointerDirection.Outbound:
             target_ref = ptrref.out_target
         else:
@@ -305,6 +356,7 @@ class PathId:
         else:
             result._prefix = self._prefix
 
+        self._derived[key] = result
         return result
 
     def replace_namespace(
@@ -313,6 +365,26 @@ class PathId:
     ) -> PathId:
         """Return a copy of this ``PathId`` with namespace set to *namespace*.
         """
+        namespace = frozenset(namespace)
+        key = ('namespace', namespace)
+        if self._derived is None:
+            self._derived = {}
+        else:
+            try:
+                return self._derived[key]
+            except KeyError:
+                pass
+
+        result = self._replace_namespace(namespace)
+        self._derived[key] = result
+        return result
+
+    def _replace_namespace(
+        self,
+        namespace: AbstractSet[AnyNamespace],
+    ) -> PathId:
+        # Unlike replace_namespace(), always returns a new PathId,
+        # which the caller is free to modify further.
         result = self.__class__(self)
         result._namespace = frozenset(namespace)
         return result
@@ -340,7 +412,7 @@ class PathId:
         if self._namespace is not None:
             stripped_ns = {bit for bit in self._namespace
                            if not isinstance(bit, WeakNamespace)}
-            result = self.replace_namespace(stripped_ns)
+            result = self._replace_namespace(stripped_ns)
 
             if result._prefix is not None:
                 result._prefix = result._get_minimal_prefix(
@@ -356,7 +428,7 @@ class PathId:
            namespace id removed."""
         if self._namespace and namespace:
             stripped_ns = self._namespace - set(namespace)
-            result = self.replace_namespace(stripped_ns)
+            result = self._replace_namespace(stripped_ns)
 
             if result._prefix is not None:
                 result._prefix = result._get_minimal_prefix(
@@ -111,6 +111,215 @@ class OutputVar(ImmutableBaseExpr):
     pass
 
 
+_T = typing.TypeVar('_T')
+_PathAspect = typing.Tuple[irast.PathId, str]
+_NOTSET = object()
+
+
+class PathAspectMap(typing.Dict[_PathAspect, _T]):
+    """A dict of values keyed by (path_id, aspect).
+
+    The map keeps an index of aspects by path id, which is maintained
+    on every update, so that all aspects of a path can be listed
+    without scanning the entire map.
+    """
+
+    __slots__ = ('_aspects',)
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__()
+        self._aspects: typing.Dict[irast.PathId, typing.Dict[str, None]] = {}
+        self.update(*args, **kwargs)
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    def __setitem__(self, key: _PathAspect, value: _T) -> None:
+        old = dict.get(self, key, _NOTSET)
+        if old is _NOTSET:
+            self._add(key)
+        else:
+            self._unindex(key, old)
+        super().__setitem__(key, value)
+        self._index(key, value)
+
+    def __delitem__(self, key: _PathAspect) -> None:
+        value = self[key]
+        super().__delitem__(key)
+        self._unindex(key, value)
+        self._drop(key)
+
+    def pop(self, key: _PathAspect, *default):
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self) -> typing.Tuple[_PathAspect, _T]:
+        key, value = super().popitem()
+        self._unindex(key, value)
+        self._drop(key)
+        return key, value
+
+    def setdefault(self, key: _PathAspect, default: _T=None) -> _T:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        super().clear()
+        self._clear_index()
+
+    def copy(self) -> PathAspectMap[_T]:
+        return type(self)(self)
+
+    def get_aspects(self, path_id: irast.PathId) -> typing.AbstractSet[str]:
+        """Return the aspects present in the map for *path_id*."""
+        aspects = self._aspects.get(path_id)
+        if aspects is None:
+            return frozenset()
+        else:
+            return aspects.keys()
+
+    def _add(self, key: _PathAspect) -> None:
+        path_id, aspect = key
+        aspects = self._aspects.get(path_id)
+        if aspects is None:
+            aspects = self._aspects[path_id] = {}
+        aspects[aspect] = None
+
+    def _drop(self, key: _PathAspect) -> None:
+        path_id, aspect = key
+        aspects = self._aspects[path_id]
+        del aspects[aspect]
+        if not aspects:
+            del self._aspects[path_id]
+
+    def _index(self, key: _PathAspect, value: _T) -> None:
+        pass
+
+    def _unindex(self, key: _PathAspect, value: _T) -> None:
+        pass
+
+    def _clear_index(self) -> None:
+        self._aspects.clear()
+
+
+class PathOutputMap(PathAspectMap['OutputVar']):
+    """A map of relation outputs corresponding to paths."""
+
+    __slots__ = ()
+
+
+class PathNamespaceMap(PathAspectMap['BaseExpr']):
+    """A map of value expressions corresponding to paths.
+
+    In addition to the aspect index, the map indexes its keys by
+    value, so that the paths of a given expression can be found
+    without comparing it against every value in the map.  Column
+    references are considered the same if their names are equal,
+    other expressions must be the same object.
+    """
+
+    __slots__ = ('_by_expr', '_order', '_counter')
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._by_expr: typing.Dict[
+            typing.Tuple[bool, typing.Hashable],
+            typing.Dict[_PathAspect, None]] = {}
+        # Keys in the order of insertion, so that lookups by
+        # expression return keys in the order of the map itself.
+        self._order: typing.Dict[_PathAspect, int] = {}
+        self._counter = 0
+        super().__init__(*args, **kwargs)
+
+    def find_expr(self, expr: BaseExpr) -> typing.List[_PathAspect]:
+        """Return the keys of all values that are the same as *expr*."""
+        keys = self._by_expr.get(self._expr_key(expr))
+        if not keys:
+            return []
+        elif len(keys) == 1:
+            return list(keys)
+        else:
+            return sorted(keys, key=self._order.__getitem__)
+
+    @staticmethod
+    def _expr_key(
+        expr: BaseExpr,
+    ) -> typing.Tuple[bool, typing.Hashable]:
+        if isinstance(expr, ColumnRef):
+            return (True, tuple(expr.name))
+        else:
+            return (False, id(expr))
+
+    def _add(self, key: _PathAspect) -> None:
+        super()._add(key)
+        self._order[key] = self._counter
+        self._counter += 1
+
+    def _drop(self, key: _PathAspect) -> None:
+        super()._drop(key)
+        del self._order[key]
+
+    def _index(self, key: _PathAspect, value: BaseExpr) -> None:
+        expr_key = self._expr_key(value)
+        keys = self._by_expr.get(expr_key)
+        if keys is None:
+            keys = self._by_expr[expr_key] = {}
+        keys[key] = None
+
+    def _unindex(self, key: _PathAspect, value: BaseExpr) -> None:
+        expr_key = self._expr_key(value)
+        keys = self._by_expr[expr_key]
+        del keys[key]
+        if not keys:
+            del self._by_expr[expr_key]
+
+    def _clear_index(self) -> None:
+        super()._clear_index()
+        self._by_expr.clear()
+        self._order.clear()
+
+
+class PathRangeVarMap(PathAspectMap['PathRangeVar']):
+    """A map of range vars corresponding to paths.
+
+    In addition to the aspect index, the map counts the references
+    to every range var, so that membership of a range var can be
+    checked in constant time.
+    """
+
+    __slots__ = ('_refs',)
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._refs: typing.Dict[int, int] = {}
+        super().__init__(*args, **kwargs)
+
+    def has_rvar(self, rvar: PathRangeVar) -> bool:
+        return id(rvar) in self._refs
+
+    def _index(self, key: _PathAspect, value: PathRangeVar) -> None:
+        self._refs[id(value)] = self._refs.get(id(value), 0) + 1
+
+    def _unindex(self, key: _PathAspect, value: PathRangeVar) -> None:
+        refs = self._refs[id(value)] - 1
+        if refs:
+            self._refs[id(value)] = refs
+        else:
+            del self._refs[id(value)]
+
+    def _clear_index(self) -> None:
+        super()._clear_index()
+        self._refs.clear()
+
+
 class EdgeQLPathInfo(Base):
     """A general mixin providing EdgeQL-specific metadata on certain nodes."""
 
@@ -133,12 +342,12 @@ class EdgeQLPathInfo(Base):
     value_scope: typing.Set[irast.PathId]
 
     # Map of res target names corresponding to paths.
-    path_outputs: typing.Dict[typing.Tuple[irast.PathId, str], OutputVar]
+    path_outputs: PathOutputMap
 
     path_id_mask: typing.Set[irast.PathId]
 
     # Map of col refs corresponding to paths.
-    path_namespace: typing.Dict[typing.Tuple[irast.PathId, str], BaseExpr]
+    path_namespace: PathNamespaceMap
 
 
 class BaseRangeVar(ImmutableBaseExpr):
@@ -378,7 +587,7 @@ class Query(ReturningQuery):
     # Map of RangeVars corresponding to pointer relations.
     ptr_join_map: dict
     # Map of RangeVars corresponding to paths.
-    path_rvar_map: typing.Dict[typing.Tuple[irast.PathId, str], PathRangeVar]
+    path_rvar_map: PathRangeVarMap
 
     argnames: typing.Dict[str, int]
 
@@ -586,7 +586,7 @@ def put_path_source_rvar(
 def has_rvar(
         stmt: pgast.Query, rvar: pgast.PathRangeVar, *,
         env: context.Environment) -> bool:
-    return rvar in set(stmt.path_rvar_map.values())
+    return stmt.path_rvar_map.has_rvar(rvar)
 
 
 def put_path_rvar_if_not_exists(
@@ -622,19 +622,9 @@ def list_path_aspects(
         stmt: pgast.Query, path_id: irast.PathId, *,
         env: context.Environment) -> Set[str]:
 
-    aspects = set()
-
-    for rvar_path_id, aspect in stmt.path_rvar_map:
-        if path_id == rvar_path_id:
-            aspects.add(aspect)
-
-    for ns_path_id, aspect in stmt.path_namespace:
-        if path_id == ns_path_id:
-            aspects.add(aspect)
-
-    for ns_path_id, aspect in stmt.path_outputs:
-        if path_id == ns_path_id:
-            aspects.add(aspect)
+    aspects = set(stmt.path_rvar_map.get_aspects(path_id))
+    aspects.update(stmt.path_namespace.get_aspects(path_id))
+    aspects.update(stmt.path_outputs.get_aspects(path_id))
 
     return aspects
 
@@ -645,14 +635,6 @@ def maybe_get_path_value_rvar(
     return maybe_get_path_rvar(stmt, path_id, aspect='value', env=env)
 
 
-def _same_expr(expr1: pgast.BaseExpr, expr2: pgast.BaseExpr) -> bool:
-    if (isinstance(expr1, pgast.ColumnRef) and
-            isinstance(expr2, pgast.ColumnRef)):
-        return expr1.name == expr2.name
-    else:
-        return expr1 == expr2
-
-
 def _put_path_output_var(
         rel: pgast.BaseRelation, path_id: irast.PathId, aspect: str,
         var: pgast.OutputVar, *, env: context.Environment) -> None:
@@ -776,11 +758,14 @@ def find_path_output(
     if isinstance(ref, pgast.TupleVarBase):
         return None
 
-    for key, other_ref in rel.path_namespace.items():
-        if _same_expr(other_ref, ref) and key in rel.path_outputs:
-            return rel.path_outputs.get(key)
-    else:
-        return None
+    # path_namespace indexes its keys by expression, see
+    # pgast.PathNamespaceMap for how the expressions are matched.
+    for key in rel.path_namespace.find_expr(ref):
+        var = rel.path_outputs.get(key)
+        if var is not None:
+            return var
+
+    return None
 
 
 def get_path_output(
@@ -272,6 +272,31 @@ class Command(BaseCommand):
     def code(self, block: PLBlock) -> str:
         raise NotImplementedError
 
+    def merge(self, other: Command) -> Optional[Command]:
+        """Return a command doing the work of this command and *other*.
+
+        *other* is the command that immediately follows this one.
+        Return None if the two commands cannot be merged.
+        """
+        return None
+
+
+def coalesce_commands(commands: Iterable[Command]) -> List[Command]:
+    """Merge the adjacent commands in *commands* where possible."""
+    result: List[Command] = []
+
+    for cmd in commands:
+        if result:
+            merge = getattr(result[-1], 'merge', None)
+            merged = merge(cmd) if merge is not None else None
+            if merged is not None:
+                result[-1] = merged
+                continue
+
+        result.append(cmd)
+
+    return result
+
 
 class CommandGroup(Command):
     def __init__(self, *, conditions=None, neg_conditions=None, priority=0):
@@ -327,7 +352,7 @@ class CompositeCommandGroup(CommandGroup):
         actions = []
         dynamic_actions = []
 
-        for cmd in self.commands:
+        for cmd in self.get_subcommands():
             if isinstance(cmd, tuple) and (cmd[1] or cmd[2]):
                 action = cmd[0].code(block)
                 cmd[0].generate_extra(extra_block, self)
@@ -361,6 +386,9 @@ class CompositeCommandGroup(CommandGroup):
 
         return self_block
 
+    def get_subcommands(self) -> List[Any]:
+        return self.commands
+
     def prefix_code(self) -> str:
         raise NotImplementedError
 
@@ -388,6 +416,13 @@ class Query(Command):
         return f'<Query {self.text!r}>'
 
 
+class ConstExpr(Query):
+    """A constant SQL expression that does not read any tables."""
+
+    def __repr__(self):
+        return f'<ConstExpr {self.text!r}>'
+
+
 class DefaultMeta(type):
     def __bool__(cls):
         return False
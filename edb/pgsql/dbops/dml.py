@@ -28,6 +28,14 @@ from ..common import quote_type as qt
 from . import base
 
 
+def _is_query(val):
+    if isinstance(val, tuple):
+        return any(_is_query(el) for el in val)
+    else:
+        return (isinstance(val, base.Query)
+                and not isinstance(val, base.ConstExpr))
+
+
 class DMLOperation(base.Command):
     pass
 
@@ -80,6 +88,41 @@ class Insert(DMLOperation):
 
         return code
 
+    def merge(self, other):
+        # Rows are merged into a single multi-row INSERT only when none
+        # of the values is a query (other than a ConstExpr), as
+        # queries in the VALUES list do not see the rows inserted by
+        # the same statement.
+        if (type(self) is not Insert or type(other) is not Insert
+                or self.table.name != other.table.name
+                or self.priority != other.priority
+                or self.returning or other.returning
+                or self.conditions or self.neg_conditions
+                or other.conditions or other.neg_conditions
+                or self._get_column_names() != other._get_column_names()
+                or self._has_queries() or other._has_queries()):
+            return None
+
+        return Insert(
+            table=self.table,
+            records=list(self.records) + list(other.records),
+            priority=self.priority,
+        )
+
+    def _get_column_names(self):
+        return [c.name for c in self.table.iter_columns(writable_only=True)]
+
+    def _has_queries(self):
+        if isinstance(self.records, base.Query):
+            return True
+
+        cols = self._get_column_names()
+        return any(
+            _is_query(getattr(row, col, None))
+            for row in self.records
+            for col in cols
+        )
+
     def __repr__(self):
         if isinstance(self.records, base.Query):
             vals = self.records.text
@@ -151,17 +151,24 @@ class Index(tables.InheritableTableObject):
                 ;
         ''')
 
-    def creation_code(self, block: base.PLBlock) -> str:
+    def creation_code(
+        self,
+        block: base.PLBlock,
+        *,
+        concurrently: bool = False,
+    ) -> str:
         if self.expr:
             expr = self.expr
         else:
             expr = ', '.join(qi(c) for c in self.columns)
 
         code = '''
-            CREATE {unique} INDEX {name}
+            CREATE {unique} INDEX {concurrently} {name}
                 ON {table} ({expr}) {predicate}'''.format(
 
             unique='UNIQUE' if self.unique else '',
+            concurrently=(
+                'CONCURRENTLY IF NOT EXISTS' if concurrently else ''),
             name=qn(self.name_in_catalog),
             table=qn(*self.table_name),
             expr=expr,
@@ -276,6 +283,28 @@ class IndexExists(base.Condition):
         ''')
 
 
+class InvalidIndexExists(base.Condition):
+    def __init__(self, schema_name, index_name):
+        self.schema_name = schema_name
+        self.index_name = index_name
+
+    def code(self, block: base.PLBlock) -> str:
+        return textwrap.dedent(f'''\
+            SELECT
+                   i.indexrelid
+               FROM
+                   pg_catalog.pg_index i
+                   INNER JOIN pg_catalog.pg_class ic
+                        ON ic.oid = i.indexrelid
+                   INNER JOIN pg_catalog.pg_namespace icn
+                        ON icn.oid = ic.relnamespace
+               WHERE
+                   icn.nspname = {ql(self.schema_name)}
+                   AND ic.relname = {ql(self.index_name)}
+                   AND NOT i.indisvalid
+        ''')
+
+
 class CreateIndex(tables.CreateInheritableTableObject):
     def __init__(self, index, *, conditional=False, **kwargs):
         super().__init__(index, **kwargs)
@@ -292,6 +321,72 @@ class CreateIndex(tables.CreateInheritableTableObject):
         return Index.creation_pl_code(index_desc_var, block)
 
 
+class CreateIndexConcurrently(ddl.NonTransactionalDDLOperation):
+    """Build an index without blocking writes to its table.
+
+    The index is built outside of a transaction, so the command
+    must be generated into a SQLBlock.  An invalid index left behind
+    by an earlier failed build is dropped before the build starts.
+    The index is neither propagated to the descendant tables, nor
+    given its metadata, that is up to the caller.
+    """
+
+    def __init__(self, index, **kwargs):
+        super().__init__(**kwargs)
+        self.index = index
+
+    def generate_self_block(
+        self,
+        block: base.SQLBlock,
+    ) -> Optional[base.PLBlock]:
+        schema_name = self.index.table_name[0]
+        index_name = self.index.name_in_catalog
+
+        cleanup = block.add_block()
+        cleanup.add_command(
+            f'DROP INDEX {qn(schema_name, index_name)}',
+            conditions=[InvalidIndexExists(schema_name, index_name)])
+
+        block.add_command(self.code(block))
+        block.set_non_transactional()
+        return None
+
+    def code(self, block: base.PLBlock) -> str:
+        return self.index.creation_code(block, concurrently=True)
+
+    def __repr__(self):
+        return '<{mod}.{cls} {index!r}>'.format(
+            mod=self.__class__.__module__,
+            cls=self.__class__.__name__,
+            index=self.index)
+
+
+class DropIndexConcurrently(ddl.NonTransactionalDDLOperation):
+    """Drop an index, if it exists, without blocking its table."""
+
+    def __init__(self, index, **kwargs):
+        super().__init__(**kwargs)
+        self.index = index
+
+    def generate_self_block(
+        self,
+        block: base.SQLBlock,
+    ) -> Optional[base.PLBlock]:
+        block.add_command(self.code(block))
+        block.set_non_transactional()
+        return None
+
+    def code(self, block: base.PLBlock) -> str:
+        name = qn(self.index.table_name[0], self.index.name_in_catalog)
+        return f'DROP INDEX CONCURRENTLY IF EXISTS {name}'
+
+    def __repr__(self):
+        return '<{mod}.{cls} {index!r}>'.format(
+            mod=self.__class__.__module__,
+            cls=self.__class__.__name__,
+            index=self.index)
+
+
 class RenameIndex(tables.RenameInheritableTableObject):
     def __init__(self, index, *, new_name, conditional=False, **kwargs):
         super().__init__(index, new_name=new_name, **kwargs)
@@ -392,6 +392,10 @@ class AlterTableFragment(ddl.DDLOperation):
     def get_attribute_term(self):
         return 'COLUMN'
 
+    def get_column_name(self):
+        """Return the name of the column this fragment alters, if any."""
+        return None
+
     def generate_extra(self, block, parent_op) -> None:
         pass
 
@@ -409,6 +413,89 @@ class AlterTable(
 
     add_operation = base.CompositeCommandGroup.add_command
 
+    def get_subcommands(self):
+        # Conditional subcommands are run as separate statements ahead
+        # of the ALTER TABLE statement with all the other subcommands.
+        # Adding a column unless it already exists is done with
+        # ADD COLUMN IF NOT EXISTS instead, so that it goes into that
+        # single statement.  This moves the subcommand after the
+        # conditional subcommands that follow it, and Postgres does not
+        # run the subcommands of a statement in order, so this is only
+        # done if neither of those refers to the same column.
+        result = []
+        for i, cmd in enumerate(self.commands):
+            if self._is_add_missing_column(cmd):
+                column = _get_column_name(cmd)
+                if not any(
+                    _get_column_name(other) == column
+                    for j, other in enumerate(self.commands)
+                    if j > i or (j != i and not isinstance(other, tuple))
+                ):
+                    cmd = AlterTableAddColumn(
+                        cmd[0].attribute, if_not_exists=True)
+            result.append(cmd)
+
+        return result
+
+    def _is_add_missing_column(self, cmd):
+        if not isinstance(cmd, tuple):
+            return False
+
+        op, conditions, neg_conditions = cmd
+        if (type(op) is not AlterTableAddColumn or op.if_not_exists
+                or conditions or not neg_conditions
+                or len(neg_conditions) != 1):
+            return False
+
+        cond = next(iter(neg_conditions))
+        return (
+            isinstance(cond, ColumnExists)
+            and tuple(cond.table_name) == tuple(self.name)
+            and cond.column_name == op.get_column_name()
+        )
+
+    def merge(self, other):
+        if (type(self) is not AlterTable or type(other) is not AlterTable
+                or tuple(self.name) != tuple(other.name)
+                or self.contained != other.contained
+                or self.priority != other.priority
+                or self.conditions or self.neg_conditions
+                or other.conditions or other.neg_conditions):
+            return None
+
+        ours = self.get_subcommands()
+        theirs = other.get_subcommands()
+
+        # The conditional subcommands of a group run before the merged
+        # statement, so those of *other* would end up running before
+        # the unconditional subcommands of this group.
+        if any(isinstance(cmd, tuple) for cmd in theirs):
+            return None
+
+        # Only merge column changes, and only of different columns,
+        # since the subcommands of a statement are not run in order.
+        our_columns = [_get_column_name(cmd) for cmd in ours]
+        their_columns = [_get_column_name(cmd) for cmd in theirs]
+        if (None in our_columns or None in their_columns
+                or set(our_columns) & set(their_columns)):
+            return None
+
+        merged = AlterTable(
+            self.name, contained=self.contained, priority=self.priority)
+        for cmd in ours + theirs:
+            merged.add_operation(cmd)
+
+        return merged
+
+
+def _get_column_name(cmd):
+    if isinstance(cmd, tuple):
+        cmd = cmd[0]
+    if isinstance(cmd, AlterTableFragment):
+        return cmd.get_column_name()
+    else:
+        return None
+
 
 class AlterTableDDLTriggerMixin:
     """Utility mixin to provide functions to propagate inherited objects."""
@@ -497,17 +584,30 @@ class AlterTableDropParent(AlterTableFragment):
 
 class AlterTableAddColumn(
         composites.AlterCompositeAddAttribute, AlterTableFragment):
-    pass
+    def __init__(self, attribute, *, if_not_exists=False):
+        super().__init__(attribute)
+        self.if_not_exists = if_not_exists
+
+    def code(self, block: base.PLBlock) -> str:
+        if self.if_not_exists:
+            return f'ADD COLUMN IF NOT EXISTS {self.attribute.code(block)}'
+        else:
+            return super().code(block)
+
+    def get_column_name(self):
+        return self.attribute.name
 
 
 class AlterTableDropColumn(
         composites.AlterCompositeDropAttribute, AlterTableFragment):
-    pass
+    def get_column_name(self):
+        return self.attribute.name
 
 
 class AlterTableAlterColumnType(
         composites.AlterCompositeAlterAttributeType, AlterTableFragment):
-    pass
+    def get_column_name(self):
+        return self.attribute_name
 
 
 class AlterTableAlterColumnNull(AlterTableFragment):
@@ -519,6 +619,9 @@ class AlterTableAlterColumnNull(AlterTableFragment):
         action = 'DROP' if self.null else 'SET'
         return f'ALTER COLUMN {qi(self.column_name)} {action} NOT NULL'
 
+    def get_column_name(self):
+        return self.column_name
+
     def __repr__(self):
         return '<{}.{} "{}" {} NOT NULL>'.format(
             self.__class__.__module__, self.__class__.__name__,
@@ -537,6 +640,9 @@ class AlterTableAlterColumnDefault(AlterTableFragment):
             return (f'ALTER COLUMN {qi(self.column_name)} '
                     f'SET DEFAULT {self.default}')
 
+    def get_column_name(self):
+        return self.column_name
+
     def __repr__(self):
         return '<{}.{} "{}" {} DEFAULT{}>'.format(
             self.__class__.__module__, self.__class__.__name__,
@@ -58,7 +58,8 @@ class Trigger(tables.InheritableTableObject):
     def __init__(
             self, name, *, table_name, events, timing='after',
             granularity='row', procedure, condition=None, is_constraint=False,
-            deferred=False, inherit=False, metadata=None):
+            deferred=False, old_table=None, new_table=None, inherit=False,
+            metadata=None):
         super().__init__(inherit=inherit, metadata=metadata)
 
         self.name = name
@@ -70,6 +71,9 @@ class Trigger(tables.InheritableTableObject):
         self.condition = condition
         self.is_constraint = is_constraint
         self.deferred = deferred
+        # Names of the transition relations.
+        self.old_table = old_table
+        self.new_table = new_table
 
         if is_constraint and granularity != 'row':
             msg = 'invalid granularity for ' \
@@ -79,6 +83,11 @@ class Trigger(tables.InheritableTableObject):
         if deferred and not is_constraint:
             raise ValueError('only constraint triggers can be deferred')
 
+        if (old_table or new_table) and (is_constraint or timing != 'after'):
+            raise ValueError(
+                'transition tables can only be specified for '
+                'non-constraint AFTER triggers')
+
     def rename(self, new_name):
         self.name = new_name
 
@@ -123,6 +132,10 @@ class Trigger(tables.InheritableTableObject):
             {desc_var}.events := ARRAY[{events}]::text[];
             {desc_var}.condition := {ql(self.condition) if self.condition
                                      else 'NULL'};
+            {desc_var}.old_table := {ql(self.old_table) if self.old_table
+                                     else 'NULL'};
+            {desc_var}.new_table := {ql(self.new_table) if self.new_table
+                                     else 'NULL'};
             {desc_var}.metadata := {ql(json.dumps(self.metadata))};
         ''')
 
@@ -174,6 +187,7 @@ class Trigger(tables.InheritableTableObject):
             timing=self.timing, granularity=self.granularity,
             procedure=self.procedure, condition=self.condition,
             is_constraint=self.is_constraint, deferred=self.deferred,
+            old_table=self.old_table, new_table=self.new_table,
             metadata=self.metadata.copy())
 
     def __repr__(self):
@@ -200,6 +214,7 @@ class CreateTrigger(tables.CreateInheritableTableObject):
             CREATE {constr}TRIGGER {trigger_name} {timing} {events}
                    ON {table_name}
                    {deferred}
+                   {referencing}
                    FOR EACH {granularity} {condition}
                    EXECUTE PROCEDURE {procedure}
         ''').format(
@@ -210,15 +225,28 @@ class CreateTrigger(tables.CreateInheritableTableObject):
             table_name=qn(*self.trigger.table_name),
             deferred=('DEFERRABLE INITIALLY DEFERRED'
                       if self.trigger.deferred else ''),
+            referencing=self.referencing_clause(),
             granularity=self.trigger.granularity, condition=(
                 'WHEN ({})'.format(self.trigger.condition)
                 if self.trigger.condition else ''),
             procedure='{}()'.format(qn(*self.trigger.procedure)))
 
+    def referencing_clause(self) -> str:
+        tables = []
+        if self.trigger.old_table:
+            tables.append(f'OLD TABLE AS {qi(self.trigger.old_table)}')
+        if self.trigger.new_table:
+            tables.append(f'NEW TABLE AS {qi(self.trigger.new_table)}')
+
+        if tables:
+            return 'REFERENCING ' + ' '.join(tables)
+        else:
+            return ''
+
     @classmethod
     def pl_code(cls, desc_var: str, block: base.PLBlock) -> str:
         constr = (
-            f"(CASE WHEN {desc_var}.is_constraint IS NOT NULL"
+            f"(CASE WHEN {desc_var}.is_constraint"
             f" THEN 'CONSTRAINT ' ELSE '' END)"
         )
         table_name = (
@@ -244,6 +272,17 @@ class CreateTrigger(tables.CreateInheritableTableObject):
             f" THEN ' DEFERRABLE INITIALLY DEFERRED' ELSE '' END)"
         )
 
+        referencing = (
+            f"(CASE WHEN {desc_var}.old_table IS NOT NULL"
+            f" OR {desc_var}.new_table IS NOT NULL"
+            f" THEN ' REFERENCING'"
+            f" || COALESCE(' OLD TABLE AS '"
+            f" || quote_ident({desc_var}.old_table), '')"
+            f" || COALESCE(' NEW TABLE AS '"
+            f" || quote_ident({desc_var}.new_table), '')"
+            f" ELSE '' END)"
+        )
+
         condition = (
             f"(CASE WHEN {cond_var} IS NOT NULL "
             f"THEN 'WHEN (' || {cond_var} || ')' "
@@ -263,6 +302,7 @@ class CreateTrigger(tables.CreateInheritableTableObject):
                 || {events}
                 || ' ON ' || {table_name}
                 || {deferrability}
+                || {referencing}
                 || ' FOR EACH ' || upper({desc_var}.granularity) || ' '
                 || {condition}
                 || ' EXECUTE PROCEDURE ' || {procedure}
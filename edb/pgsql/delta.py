@@ -20,6 +20,7 @@
 from __future__ import annotations
 
 import collections.abc
+import hashlib
 import itertools
 import json
 import textwrap
@@ -179,7 +180,7 @@ class ObjectMetaCommand(MetaCommand, sd.ObjectCommand,
             result = tuple(self._get_id(schema, v)
                            for v in value.objects(schema))
             id_array = ', '.join(ql(str(v)) for v in result)
-            recvalue = dbops.Query(f'ARRAY[{id_array}]::uuid[]')
+            recvalue = dbops.ConstExpr(f'ARRAY[{id_array}]::uuid[]')
 
         elif isinstance(value, (s_obj.ObjectIndexBase, s_obj.ObjectDict)):
             result = s_types.Tuple.from_subtypes(
@@ -206,7 +207,7 @@ class ObjectMetaCommand(MetaCommand, sd.ObjectCommand,
             ref_ids = value.refs.ids(schema)
             ref_ids_expr = ', '.join(ql(str(i)) for i in ref_ids)
             recvalue = (value.text, value.origtext,
-                        dbops.Query(f'ARRAY[{ref_ids_expr}]::uuid[]'))
+                        dbops.ConstExpr(f'ARRAY[{ref_ids_expr}]::uuid[]'))
 
         if recvalue is None:
             if result is None and use_defaults:
@@ -214,7 +215,7 @@ class ObjectMetaCommand(MetaCommand, sd.ObjectCommand,
             else:
                 recvalue = result
         elif isinstance(recvalue, types.TypeDesc):
-            recvalue = dbops.Query(recvalue.to_sql_expr())
+            recvalue = dbops.ConstExpr(recvalue.to_sql_expr())
 
         return result, recvalue
 
@@ -1080,11 +1081,61 @@ class CreateConstraint(
             bconstr = schemac_to_backendc(subject, constraint, schema)
 
             op = dbops.CommandGroup(priority=1)
-            op.add_command(bconstr.create_ops())
+            pending_index = self._get_concurrent_index(
+                schema, context, subject, bconstr)
+            if pending_index is not None:
+                # Build the unique index enforcing the constraint ahead
+                # of the DDL transaction, so that the writes to the
+                # table are not blocked while the index is being built.
+                # The DDL transaction then turns the index into the
+                # constraint.  A failed build, e.g. on duplicate
+                # values, leaves no constraint behind.
+                delta = context.get(sd.DeltaRootContext).op
+                delta.online_ops.append(
+                    dbops.CreateIndexConcurrently(pending_index))
+                delta.online_cleanup_ops.append(
+                    dbops.DropIndexConcurrently(pending_index))
+                op.add_command(bconstr.create_ops(
+                    using_index=pending_index.name_in_catalog))
+            else:
+                op.add_command(bconstr.create_ops())
             self.pgops.add(op)
 
         return schema
 
+    def _get_concurrent_index(self, schema, context, subject, bconstr):
+        if (not context.concurrent_index_builds
+                or not isinstance(subject, s_pointers.Pointer)
+                or not isinstance(bconstr, schemamech.SchemaTableConstraint)):
+            return None
+
+        # The index is built before the DDL command is applied, so
+        # the column must exist and be stored the same way before
+        # and after the command, otherwise the index would be built
+        # on the wrong column, or rebuilt by the command anyway.
+        orig_schema = context.get(sd.DeltaRootContext).original_schema
+        orig_subject = orig_schema.get_by_id(subject.id, None)
+        if orig_subject is None:
+            return None
+
+        orig_info = types.get_pointer_storage_info(
+            orig_subject, schema=orig_schema)
+        info = types.get_pointer_storage_info(subject, schema=schema)
+        if (orig_info.table_name != info.table_name
+                or orig_info.column_name != info.column_name
+                or orig_info.column_type != info.column_type):
+            return None
+
+        column = qi(info.column_name)
+        expr_hash = hashlib.sha1(column.encode()).hexdigest()
+        index = bconstr.unique_index(f'pending_unique_{expr_hash}')
+        if (index is None
+                or index.table_name != info.table_name
+                or index.expr != column):
+            return None
+
+        return index
+
 
 class RenameConstraint(
         ConstraintCommand, RenameObject,
@@ -1810,14 +1861,62 @@ class CreateIndex(IndexCommand, CreateObject, adapts=s_indexes.CreateIndex):
         module = schema.get_global(s_mod.Module, index.get_name(schema).module)
         index_name = common.get_index_backend_name(
             index.id, module.id, catenate=False)
-        pg_index = dbops.Index(
-            name=index_name[1], table_name=table_name, expr=sql_expr,
-            unique=False, inherit=True,
-            metadata={'schemaname': index.get_name(schema)})
-        self.pgops.add(dbops.CreateIndex(pg_index, priority=3))
+        metadata = {'schemaname': index.get_name(schema)}
+
+        if self._can_build_concurrently(subject, parent_ctx.op, context):
+            # Build the index on the table and all of its descendants
+            # ahead of the DDL transaction, so that the writes to the
+            # tables are not blocked while the index is being built.
+            # The index is built under a name derived from its table
+            # and expression, so that a retried build can find what
+            # an earlier failed attempt left behind.  The DDL
+            # transaction then renames the index and attaches the
+            # metadata, which makes the index known to the schema.
+            delta = context.get(sd.DeltaRootContext).op
+            expr_hash = hashlib.sha1(sql_expr.encode()).hexdigest()
+            tables = [subject] + [
+                d for d in subject.ordered_descendants(schema)
+                if ObjectTypeMetaCommand.has_table(d, schema)
+            ]
+            for obj in tables:
+                obj_table_name = common.get_backend_name(
+                    schema, obj, catenate=False)
+                pending_index = dbops.Index(
+                    name=f'pending_{expr_hash}', table_name=obj_table_name,
+                    expr=sql_expr, unique=False)
+                delta.online_ops.append(
+                    dbops.CreateIndexConcurrently(pending_index))
+                delta.online_cleanup_ops.append(
+                    dbops.DropIndexConcurrently(pending_index))
+                self.pgops.add(dbops.RenameIndex(
+                    pending_index, new_name=index_name[1], priority=3))
+
+                pg_index = dbops.Index(
+                    name=index_name[1], table_name=obj_table_name,
+                    expr=sql_expr, unique=False, inherit=True,
+                    metadata=dict(metadata))
+                if obj is not subject:
+                    pg_index.add_metadata('ddl:inherited', True)
+                self.pgops.add(dbops.SetMetadata(
+                    pg_index, pg_index.metadata, priority=3))
+        else:
+            pg_index = dbops.Index(
+                name=index_name[1], table_name=table_name, expr=sql_expr,
+                unique=False, inherit=True, metadata=metadata)
+            self.pgops.add(dbops.CreateIndex(pg_index, priority=3))
 
         return schema
 
+    def _can_build_concurrently(self, subject, subject_op, context):
+        # A table created by the same DDL command is empty and
+        # invisible to other transactions, so there is nothing
+        # to gain from building its indexes concurrently.
+        return (
+            context.concurrent_index_builds
+            and isinstance(subject, s_objtypes.ObjectType)
+            and not isinstance(subject_op, sd.CreateObject)
+        )
+
 
 class RenameIndex(IndexCommand, RenameObject, adapts=s_indexes.RenameIndex):
 
@@ -3978,6 +4077,11 @@ class DeltaRoot(MetaCommand, adapts=sd.DeltaRoot):
         context: sd.CommandContext,
     ) -> s_schema.Schema:
         self.update_endpoint_delete_actions = UpdateEndpointDeleteActions()
+        # Commands that must run outside of the DDL transaction,
+        # ahead of it, and the commands undoing them should
+        # the DDL transaction fail.
+        self.online_ops = []
+        self.online_cleanup_ops = []
 
         schema = sd.DeltaRoot.apply(self, schema, context)
         schema = MetaCommand.apply(self, schema, context)
@@ -3992,7 +4096,7 @@ class DeltaRoot(MetaCommand, adapts=sd.DeltaRoot):
         return True
 
     def generate(self, block: dbops.PLBlock) -> None:
-        for op in self.serialize_ops():
+        for op in dbops.coalesce_commands(self.serialize_ops()):
             op.generate(block)
 
     def serialize_ops(self):
@@ -94,12 +94,16 @@ class SchemaConstraintDomainConstraint(
 
 class SchemaConstraintTableConstraint(ConstraintCommon, dbops.TableConstraint):
     def __init__(self, table_name, *,
-                 constraint, exprdata, scope, type, schema):
+                 constraint, exprdata, scope, type, schema,
+                 using_index=None):
         ConstraintCommon.__init__(self, constraint, schema)
         dbops.TableConstraint.__init__(self, table_name, None)
         self._exprdata = exprdata
         self._scope = scope
         self._type = type
+        # The name of an existing unique index to turn into
+        # the constraint instead of building a new one.
+        self._using_index = using_index
 
     def constraint_code(self, block: dbops.PLBlock) -> str:
         if self._scope == 'row':
@@ -116,6 +120,10 @@ class SchemaConstraintTableConstraint(ConstraintCommon, dbops.TableConstraint):
                 raise ValueError(
                     'unexpected constraint type: {}'.format(self._type))
 
+            if self._using_index is not None:
+                idx_name = common.quote_ident(self._using_index)
+                return [f'UNIQUE USING INDEX {idx_name}']
+
             constr_exprs = []
 
             for expr in self._exprdata:
@@ -164,7 +172,12 @@ class SchemaConstraintTableConstraint(ConstraintCommon, dbops.TableConstraint):
             return '(' + ') OR ('.join(chunks) + ')'
 
     def get_trigger_proc_text(self):
-        chunks = []
+        # The procedure serves both the statement-level triggers,
+        # which check all rows inserted by a statement at once
+        # through the "new_rows" transition table, and the row-level
+        # triggers, which check the rows changed by an update.
+        stmt_chunks = []
+        row_chunks = []
 
         constr_name = self.constraint_name()
         raw_constr_name = self.constraint_name(quote=False)
@@ -172,34 +185,68 @@ class SchemaConstraintTableConstraint(ConstraintCommon, dbops.TableConstraint):
         errmsg = 'duplicate key value violates unique ' \
                  'constraint {constr}'.format(constr=constr_name)
 
-        subject_table = self.get_subject_name()
+        schema_name, table_name = self.get_subject_name(quote=False)
+        subject_table = common.qname(schema_name, table_name)
 
         for expr in self._exprdata:
             exprdata = expr['exprdata']
 
-            text = '''
-                PERFORM
-                    TRUE
-                  FROM
-                    {table}
-                  WHERE
-                    {plain_expr} = {new_expr};
+            raise_text = '''
                 IF FOUND THEN
                   RAISE unique_violation
                       USING
-                          TABLE = '{table[1]}',
-                          SCHEMA = '{table[0]}',
+                          TABLE = '{table_name}',
+                          SCHEMA = '{schema_name}',
                           CONSTRAINT = '{constr}',
                           MESSAGE = '{errmsg}',
                           DETAIL = 'Key ({plain_expr}) already exists.';
                 END IF;
+            '''.format(
+                plain_expr=exprdata['plain'], table_name=table_name,
+                schema_name=schema_name, constr=raw_constr_name,
+                errmsg=errmsg)
+
+            stmt_text = '''
+                PERFORM
+                    TRUE
+                  FROM
+                    new_rows
+                  WHERE
+                    EXISTS (
+                      SELECT
+                        FROM
+                          {table}
+                        WHERE
+                          {plain_expr} = {new_rows_expr}
+                    )
+                  LIMIT 1;
+            '''.format(
+                plain_expr=exprdata['plain'],
+                new_rows_expr=exprdata['new_rows'],
+                table=subject_table)
+
+            row_text = '''
+                PERFORM
+                    TRUE
+                  FROM
+                    {table}
+                  WHERE
+                    {plain_expr} = {new_expr};
             '''.format(
                 plain_expr=exprdata['plain'], new_expr=exprdata['new'],
-                table=subject_table, constr=raw_constr_name, errmsg=errmsg)
+                table=subject_table)
 
-            chunks.append(text)
+            stmt_chunks.append(stmt_text + raise_text)
+            row_chunks.append(row_text + raise_text)
 
-        text = 'BEGIN\n' + '\n\n'.join(chunks) + '\nRETURN NEW;\nEND;'
+        text = (
+            'BEGIN\n'
+            "IF TG_LEVEL = 'STATEMENT' THEN\n"
+            + '\n\n'.join(stmt_chunks)
+            + '\nRETURN NULL;\nEND IF;\n'
+            + '\n\n'.join(row_chunks)
+            + '\nRETURN NEW;\nEND;'
+        )
 
         return text
 
@@ -381,10 +428,20 @@ class AlterTableInheritableConstraintBase(
 
         cname = constraint.raw_constraint_name()
 
+        # Inserted rows are checked once per statement.  Updated rows
+        # are still checked by a row-level trigger.  An update of a
+        # parent table fires only the statement-level triggers of the
+        # parent, so a statement-level trigger would have to be enabled
+        # on the parent as well, and would then run for every update of
+        # any column in the hierarchy: triggers with transition tables
+        # can have neither a column list nor a WHEN condition.  The
+        # row-level trigger only fires for the rows where the
+        # constrained value has changed.
         ins_trigger_name = common.edgedb_name_to_pg_name(cname + '_instrigger')
         ins_trigger = dbops.Trigger(
             name=ins_trigger_name, table_name=table_name, events=('insert', ),
-            procedure=proc_name, is_constraint=True, inherit=True)
+            granularity='statement', new_table='new_rows',
+            procedure=proc_name, inherit=True)
         cr_ins_trigger = dbops.CreateTrigger(ins_trigger)
         cmds.append(cr_ins_trigger)
 
@@ -419,7 +476,8 @@ class AlterTableInheritableConstraintBase(
 
         ins_trigger = dbops.Trigger(
             name=ins_trigger_name, table_name=table_name, events=('insert', ),
-            procedure='null', is_constraint=True, inherit=True)
+            granularity='statement', new_table='new_rows',
+            procedure='null', inherit=True)
 
         rn_ins_trigger = dbops.AlterTriggerRenameTo(
             ins_trigger, new_name=new_ins_trg_name)
@@ -443,7 +501,8 @@ class AlterTableInheritableConstraintBase(
         ins_trigger_name = common.edgedb_name_to_pg_name(cname + '_instrigger')
         ins_trigger = dbops.Trigger(
             name=ins_trigger_name, table_name=table_name, events=('insert', ),
-            procedure='null', is_constraint=True, inherit=True)
+            granularity='statement', new_table='new_rows',
+            procedure='null', inherit=True)
 
         drop_ins_trigger = dbops.DropTrigger(ins_trigger)
 
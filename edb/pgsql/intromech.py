@@ -252,9 +252,7 @@ class IntrospectionMech:
             if row['expr']:
                 exprmap[scalar]['expr'] = row['expr']
 
-        for scls, (basenames, ancestors) in basemap.items():
-            schema = self._set_reflist(schema, scls, 'bases', basenames)
-            schema = self._set_reflist(schema, scls, 'ancestors', ancestors)
+        schema = self._set_bases(schema, basemap)
 
         sequence = schema.get('std::sequence', None)
         for scalar in schema.get_objects(type=s_scalars.ScalarType):
@@ -287,12 +285,20 @@ class IntrospectionMech:
 
         return schema
 
-    def _set_reflist(self, schema, scls, field, namelist):
+    def _get_reflist(self, schema, namelist):
         if namelist is None:
-            objs = []
+            return []
         else:
-            objs = [schema.get(sn.Name(name)) for name in namelist]
-        return scls.set_field_value(schema, field, objs)
+            return [schema.get(sn.Name(name)) for name in namelist]
+
+    def _set_bases(self, schema, basemap):
+        mutation = schema.mutate()
+        for scls, (basenames, ancestors) in basemap.items():
+            mutation.update_obj(scls, {
+                'bases': self._get_reflist(schema, basenames),
+                'ancestors': self._get_reflist(schema, ancestors),
+            })
+        return mutation.finish()
 
     def _decode_func_params(self, schema, row, param_map):
         if row['params']:
@@ -500,9 +506,7 @@ class IntrospectionMech:
             if subject:
                 schema = subject.add_constraint(schema, constraint)
 
-        for scls, (basenames, ancestors) in basemap.items():
-            schema = self._set_reflist(schema, scls, 'bases', basenames)
-            schema = self._set_reflist(schema, scls, 'ancestors', ancestors)
+        schema = self._set_bases(schema, basemap)
 
         return schema, exprmap
 
@@ -647,9 +651,7 @@ class IntrospectionMech:
 
             basemap[index] = (index_data['bases'], index_data['ancestors'])
 
-        for scls, (basenames, ancestors) in basemap.items():
-            schema = self._set_reflist(schema, scls, 'bases', basenames)
-            schema = self._set_reflist(schema, scls, 'ancestors', ancestors)
+        schema = self._set_bases(schema, basemap)
 
         if pg_indexes and not only_modules and not exclude_modules:
             details = f'Extraneous PostgreSQL indexes found: {pg_indexes!r}'
@@ -728,9 +730,7 @@ class IntrospectionMech:
             if source:
                 schema = source.add_pointer(schema, link)
 
-        for scls, (basenames, ancestors) in basemap.items():
-            schema = self._set_reflist(schema, scls, 'bases', basenames)
-            schema = self._set_reflist(schema, scls, 'ancestors', ancestors)
+        schema = self._set_bases(schema, basemap)
 
         return schema, exprmap
 
@@ -804,9 +804,7 @@ class IntrospectionMech:
             if source:
                 schema = source.add_pointer(schema, prop)
 
-        for scls, (basenames, ancestors) in basemap.items():
-            schema = self._set_reflist(schema, scls, 'bases', basenames)
-            schema = self._set_reflist(schema, scls, 'ancestors', ancestors)
+        schema = self._set_bases(schema, basemap)
 
         return schema, exprmap
 
@@ -867,9 +865,7 @@ class IntrospectionMech:
 
             schema = subject.add_annotation(schema, anno)
 
-        for scls, (basenames, ancestors) in basemap.items():
-            schema = self._set_reflist(schema, scls, 'bases', basenames)
-            schema = self._set_reflist(schema, scls, 'ancestors', ancestors)
+        schema = self._set_bases(schema, basemap)
 
         return schema
 
@@ -922,9 +918,7 @@ class IntrospectionMech:
 
             basemap[objtype] = (row['bases'], row['ancestors'])
 
-        for scls, (basenames, ancestors) in basemap.items():
-            schema = self._set_reflist(schema, scls, 'bases', basenames)
-            schema = self._set_reflist(schema, scls, 'ancestors', ancestors)
+        schema = self._set_bases(schema, basemap)
 
         return schema, exprmap
 
@@ -807,6 +807,8 @@ class TriggerDescType(dbops.CompositeType):
             dbops.Column(name='events', type='text[]'),
             dbops.Column(name='definition', type='text'),
             dbops.Column(name='condition', type='text'),
+            dbops.Column(name='old_table', type='text'),
+            dbops.Column(name='new_table', type='text'),
             dbops.Column(name='metadata', type='jsonb'),
         ])
 
@@ -827,6 +829,8 @@ class IntrospectTriggersFunction(dbops.Function):
             trg_events,
             trg_definition,
             NULL::text,
+            trg_old_table,
+            trg_new_table,
             trg_metadata
         FROM
             (SELECT
@@ -877,6 +881,9 @@ class IntrospectTriggersFunction(dbops.Function):
 
                     pg_get_triggerdef(t.oid)::text          AS trg_definition,
 
+                    t.tgoldtable::text                      AS trg_old_table,
+                    t.tgnewtable::text                      AS trg_new_table,
+
                     edgedb.obj_metadata(t.oid, 'pg_trigger') AS trg_metadata
 
                  FROM
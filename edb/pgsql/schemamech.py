@@ -198,8 +198,15 @@ class ConstraintMech:
             ref.name[0] = 'OLD'
         old_expr = codegen.SQLSourceGenerator.to_source(sql_expr)
 
+        # The expression over the NEW transition table of
+        # a statement-level trigger.
+        for ref in refs:
+            ref.name[0] = 'new_rows'
+        new_rows_expr = codegen.SQLSourceGenerator.to_source(sql_expr)
+
         exprdata = dict(
-            plain=plain_expr, plain_chunks=chunks, new=new_expr, old=old_expr)
+            plain=plain_expr, plain_chunks=chunks, new=new_expr, old=old_expr,
+            new_rows=new_rows_expr)
 
         return dict(
             exprdata=exprdata, is_multicol=is_multicol, is_trivial=is_trivial)
@@ -334,7 +341,7 @@ class SchemaTableConstraint:
         self._pg_constr_data = pg_constr_data
         self._schema = schema
 
-    def _table_constraint(self, constr):
+    def _table_constraint(self, constr, *, using_index=None):
         pg_c = constr._pg_constr_data
 
         table_name = pg_c['subject_db_name']
@@ -343,14 +350,32 @@ class SchemaTableConstraint:
         constr = deltadbops.SchemaConstraintTableConstraint(
             table_name, constraint=constr._constraint, exprdata=expressions,
             scope=pg_c['scope'], type=pg_c['type'],
-            schema=constr._schema)
+            schema=constr._schema, using_index=using_index)
 
         return constr
 
-    def create_ops(self):
+    def unique_index(self, name):
+        """Return a unique index that can back the constraint.
+
+        Return None if the constraint is not enforced by a single
+        UNIQUE constraint on the columns of its table.
+        """
+        pg_c = self._pg_constr_data
+        expressions = pg_c['expressions']
+
+        if (pg_c['type'] != 'unique' or len(expressions) != 1
+                or not expressions[0]['is_trivial']):
+            return None
+
+        return dbops.Index(
+            name=name, table_name=pg_c['subject_db_name'],
+            expr=', '.join(expressions[0]['exprdata']['plain_chunks']),
+            unique=True)
+
+    def create_ops(self, *, using_index=None):
         ops = dbops.CommandGroup()
 
-        tabconstr = self._table_constraint(self)
+        tabconstr = self._table_constraint(self, using_index=using_index)
         add_constr = deltadbops.AlterTableAddInheritableConstraint(
             name=tabconstr.get_subject_name(quote=False), constraint=tabconstr)
 
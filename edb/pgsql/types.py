@@ -30,6 +30,7 @@ from edb.ir import ast as irast
 from edb.ir import typeutils as irtyputils
 
 from edb.schema import abc as s_abc
+from edb.schema import caches as s_caches
 from edb.schema import scalars as s_scalars
 from edb.schema import objtypes as s_objtypes
 from edb.schema import name as sn
@@ -351,18 +352,29 @@ class _PointerStorageInfo:
                 self.table_type, self.column_name, self.column_type, id(self))
 
 
-@functools.lru_cache()
+_POINTER_STORAGE_INFO_CACHE = s_caches.CacheKind(
+    'pointer_storage_info', maxsize=4096)
+
+
 def get_pointer_storage_info(
         pointer, *, schema, source=None, resolve_type=True,
         link_bias=False):
+    cache = schema.get_cache(_POINTER_STORAGE_INFO_CACHE)
+    key = (pointer, source, resolve_type, link_bias)
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+
     assert not pointer.generic(schema), \
         "only specialized pointers can be stored"
     material_ptrcls = pointer.material_type(schema)
     if material_ptrcls is not None:
         pointer = material_ptrcls
-    return _PointerStorageInfo(
+    info = cache[key] = _PointerStorageInfo(
         schema, pointer, source=source, resolve_type=resolve_type,
         link_bias=link_bias)
+    return info
 
 
 class PointerStorageInfo(NamedTuple):
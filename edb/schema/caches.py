@@ -0,0 +1,145 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Caches of schema lookups.
+
+A schema is immutable, so anything computed from it stays valid for
+as long as the schema itself is alive.  Every Schema carries a
+SchemaCaches instance holding a bounded cache for each kind of lookup
+(see CacheKind).  When a schema produces a new version of itself, the
+caches of the kinds that do not depend on the classes of the changed
+objects are passed on to the new version as they are, and all other
+caches start empty.  Changes of derived types, such as the views and
+collection types created while compiling a query, are tracked apart
+from other changes, so that kinds keyed on type ids can ignore them.
+"""
+
+
+from __future__ import annotations
+from typing import *
+
+from edb.common import lru
+
+
+class CacheKind:
+    """A kind of schema lookup results kept in a cache.
+
+    *depends_on* lists the classes of schema objects the results
+    are derived from, where None means the results can be affected
+    by a change of any object.  If *ignore_derived* is true, changes
+    of derived types do not affect the results.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        maxsize: int,
+        depends_on: Optional[Iterable[type]] = None,
+        ignore_derived: bool = False,
+    ) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.depends_on = (
+            tuple(depends_on) if depends_on is not None else None)
+        self.ignore_derived = ignore_derived
+
+    def is_affected_by(self, changed: type) -> bool:
+        return self.depends_on is None or issubclass(changed, self.depends_on)
+
+    def is_affected_by_derived(self, changed: type) -> bool:
+        return not self.ignore_derived and self.is_affected_by(changed)
+
+    def __repr__(self) -> str:
+        return f'<CacheKind {self.name!r}>'
+
+
+class CacheStats(NamedTuple):
+
+    hits: int
+    misses: int
+    size: int
+
+
+class Cache(lru.LRUMapping):
+    """A bounded LRU cache counting its hits and misses."""
+
+    def __init__(self, *, maxsize: int) -> None:
+        super().__init__(maxsize=maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    def __getitem__(self, key: Hashable) -> Any:
+        try:
+            value = super().__getitem__(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        else:
+            self.hits += 1
+            return value
+
+    def get_stats(self) -> CacheStats:
+        return CacheStats(hits=self.hits, misses=self.misses, size=len(self))
+
+
+class SchemaCaches:
+
+    __slots__ = ('_caches',)
+
+    def __init__(
+        self,
+        caches: Optional[Dict[CacheKind, Cache]] = None,
+    ) -> None:
+        self._caches = caches if caches is not None else {}
+
+    def get(self, kind: CacheKind) -> Cache:
+        try:
+            return self._caches[kind]
+        except KeyError:
+            cache = self._caches[kind] = Cache(maxsize=kind.maxsize)
+            return cache
+
+    def derive(
+        self,
+        changed: Optional[AbstractSet[type]],
+        changed_derived: AbstractSet[type] = frozenset(),
+    ) -> SchemaCaches:
+        """Return caches for a new schema version.
+
+        *changed* is the set of classes of the objects that were
+        changed to produce the new version, or None if unknown.
+        *changed_derived* is the set of classes of the derived types
+        that were changed.
+        """
+        if changed is None:
+            return SchemaCaches()
+        else:
+            return SchemaCaches({
+                kind: cache for kind, cache in self._caches.items()
+                if not any(kind.is_affected_by(c) for c in changed)
+                and not any(
+                    kind.is_affected_by_derived(c) for c in changed_derived)
+            })
+
+    def get_stats(self) -> Dict[str, CacheStats]:
+        return {
+            kind.name: cache.get_stats()
+            for kind, cache in self._caches.items()
+        }
@@ -19,7 +19,6 @@
 
 from __future__ import annotations
 
-import functools
 from typing import *
 
 from edb import errors
@@ -29,6 +28,7 @@ from edb.edgeql import qltypes
 
 from . import abc as s_abc
 from . import annos as s_anno
+from . import caches
 from . import delta as sd
 from . import functions as s_func
 from . import name as sn
@@ -36,40 +36,48 @@ from . import objects as so
 from . import types as s_types
 from . import utils
 
+if TYPE_CHECKING:
+    import uuid
 
-_NOT_REACHABLE = 10000000
+    from . import schema as s_schema
 
 
-def _is_reachable(schema, cast_kwargs, source: s_types.Type,
-                  target: s_types.Type, distance: int) -> int:
+def _get_implicit_cast_distances(
+        schema: s_schema.Schema,
+        target: s_types.Type) -> Dict[uuid.UUID, int]:
+    """Return the distances of implicit casts to *target*.
 
-    if source == target:
-        return distance
+    The result maps the id of every type that is implicitly castable
+    to *target* to the length of the shortest chain of implicit casts
+    from that type to *target*.
+    """
+    cache = schema.get_cache(_IMPLICIT_DISTANCES_CACHE)
+    distances = cache.get(target.id)
+    if distances is not None:
+        return distances
 
-    casts = schema.get_casts_to_type(target, **cast_kwargs)
-    if not casts:
-        return _NOT_REACHABLE
-
-    sources = {c.get_from_type(schema) for c in casts}
+    distances = {target.id: 0}
+    distance = 0
+    frontier = [target]
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for stype in frontier:
+            for c in schema.get_casts_to_type(stype, implicit=True):
+                source = c.get_from_type(schema)
+                if source.id not in distances:
+                    distances[source.id] = distance
+                    next_frontier.append(source)
+        frontier = next_frontier
 
-    distance += 1
-    if source in sources:
-        return distance
-    else:
-        return min(
-            _is_reachable(schema, cast_kwargs, source, s, distance)
-            for s in sources
-        )
+    cache[target.id] = distances
+    return distances
 
 
-@functools.lru_cache()
 def get_implicit_cast_distance(
         schema, source: s_types.Type, target: s_types.Type) -> int:
-    dist = _is_reachable(schema, {'implicit': True}, source, target, 0)
-    if dist == _NOT_REACHABLE:
-        return -1
-    else:
-        return dist
+    distances = _get_implicit_cast_distances(schema, target)
+    return distances.get(source.id, -1)
 
 
 def is_implicitly_castable(
@@ -77,11 +85,24 @@ def is_implicitly_castable(
     return get_implicit_cast_distance(schema, source, target) >= 0
 
 
-@functools.lru_cache()
 def find_common_castable_type(
         schema, source: s_types.Type,
         target: s_types.Type) -> Optional[s_types.Type]:
 
+    cache = schema.get_cache(_COMMON_TYPES_CACHE)
+    key = (source.id, target.id)
+    try:
+        return cache[key]
+    except KeyError:
+        result = cache[key] = _find_common_castable_type(
+            schema, source, target)
+        return result
+
+
+def _find_common_castable_type(
+        schema, source: s_types.Type,
+        target: s_types.Type) -> Optional[s_types.Type]:
+
     if get_implicit_cast_distance(schema, target, source) >= 0:
         return source
     if get_implicit_cast_distance(schema, source, target) >= 0:
@@ -109,10 +130,21 @@ def find_common_castable_type(
                 return target
 
 
-@functools.lru_cache()
 def is_assignment_castable(
         schema, source: s_types.Type, target: s_types.Type) -> bool:
 
+    cache = schema.get_cache(_ASSIGNMENT_CASTABLE_CACHE)
+    key = (source.id, target.id)
+    try:
+        return cache[key]
+    except KeyError:
+        result = cache[key] = _is_assignment_castable(schema, source, target)
+        return result
+
+
+def _is_assignment_castable(
+        schema, source: s_types.Type, target: s_types.Type) -> bool:
+
     # Implicitly castable implies assignment castable.
     if is_implicitly_castable(schema, source, target):
         return True
@@ -175,6 +207,15 @@ class Cast(s_anno.AnnotationSubject, s_func.VolatilitySubject, s_abc.Cast,
         str, default=None, compcoef=0.4, introspectable=False)
 
 
+# Target type id -> {source type id: implicit cast distance}.
+_IMPLICIT_DISTANCES_CACHE = caches.CacheKind(
+    'implicit_cast_distances', maxsize=1024, depends_on=[Cast])
+_COMMON_TYPES_CACHE = caches.CacheKind(
+    'common_castable_types', maxsize=4096, depends_on=[Cast])
+_ASSIGNMENT_CASTABLE_CACHE = caches.CacheKind(
+    'assignment_castable', maxsize=4096, depends_on=[Cast])
+
+
 class CastCommandContext(sd.ObjectCommandContext,
                          s_anno.AnnotationSubjectCommandContext):
     pass
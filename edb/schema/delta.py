@@ -630,6 +630,7 @@ class CommandContext:
         testmode: bool = False,
         disable_dep_verification: bool = False,
         descriptive_mode: bool = False,
+        concurrent_index_builds: bool = False,
         schema_object_ids: Optional[
             Mapping[Tuple[str, Optional[str]], uuid.UUID]
         ] = None
@@ -644,6 +645,7 @@ class CommandContext:
         self.testmode = testmode
         self.descriptive_mode = descriptive_mode
         self.disable_dep_verification = disable_dep_verification
+        self.concurrent_index_builds = concurrent_index_builds
         self.renames: Dict[str, str] = {}
         self.renamed_objs: Set[so.Object] = set()
         self.altered_targets: Set[so.Object] = set()
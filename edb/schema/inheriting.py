@@ -40,13 +40,17 @@ class InheritingObjectCommand(sd.ObjectCommand[so.InheritingObject]):
     def _create_begin(self,
                       schema: s_schema.Schema,
                       context: sd.CommandContext) -> s_schema.Schema:
-        schema = super()._create_begin(schema, context)
-
         if not context.canonical:
+            # The inherited fields only depend on the command, so they
+            # are set along with the other fields of the new object
+            # rather than by a separate schema update.
             inh_update = self.compute_inherited_fields(schema, context)
-            schema = self._update_inherited_fields(schema, context, inh_update)
+            self._compute_inherited_fields(
+                self.get_attribute_value('inherited_fields') or (),
+                inh_update,
+            )
 
-        return schema
+        return super()._create_begin(schema, context)
 
     def _alter_begin(self,
                      schema: s_schema.Schema,
@@ -66,17 +70,25 @@ class InheritingObjectCommand(sd.ObjectCommand[so.InheritingObject]):
         context: sd.CommandContext,
         update: Mapping[str, bool],
     ) -> s_schema.Schema:
-        inh_fields = set(self.scls.get_inherited_fields(schema))
+        inh_fields = self._compute_inherited_fields(
+            self.scls.get_inherited_fields(schema), update)
+        return self.scls.set_field_value(
+            schema, 'inherited_fields', inh_fields)
+
+    def _compute_inherited_fields(
+        self,
+        inherited_fields: Iterable[str],
+        update: Mapping[str, bool],
+    ) -> FrozenSet[str]:
+        inh_fields = set(inherited_fields)
         for fn, inherited in update.items():
             if inherited:
                 inh_fields.add(fn)
             else:
                 inh_fields.discard(fn)
-        self.set_attribute_value(
-            'inherited_fields', frozenset(inh_fields))
-        schema = self.scls.set_field_value(
-            schema, 'inherited_fields', inh_fields)
-        return schema
+        inh_fields = frozenset(inh_fields)
+        self.set_attribute_value('inherited_fields', inh_fields)
+        return inh_fields
 
     def inherit_fields(self,
                        schema: s_schema.Schema,
@@ -84,8 +96,14 @@ class InheritingObjectCommand(sd.ObjectCommand[so.InheritingObject]):
                        scls: so.InheritingObject,
                        bases: Tuple[so.Object, ...],
                        *,
-                       fields: Optional[Iterable[str]] = None
+                       fields: Optional[Iterable[str]] = None,
+                       updates: Optional[Mapping[str, Any]] = None,
                        ) -> s_schema.Schema:
+        """Merge the inheritable fields of *scls* from its *bases*.
+
+        The merged values are applied in a single schema update along
+        with *updates*, which must not affect the merge.
+        """
         mcls = self.get_schema_metaclass()
 
         if fields is not None:
@@ -96,6 +114,10 @@ class InheritingObjectCommand(sd.ObjectCommand[so.InheritingObject]):
 
         inherited_fields = scls.get_inherited_fields(schema)
         inherited_fields_update = {}
+        # The merged values only depend on the bases and on the
+        # previous value of the same field, so all of them are
+        # applied in a single schema update.
+        all_updates: Dict[str, Any] = dict(updates or {})
 
         for field_name in field_names:
             field = mcls.get_field(field_name)
@@ -111,14 +133,14 @@ class InheritingObjectCommand(sd.ObjectCommand[so.InheritingObject]):
 
             if ((result is not None or ours is not None)
                     and result != ours):
-                schema = scls.set_field_value(schema, field_name, result)
+                all_updates[field_name] = result
                 self.set_attribute_value(field_name, result,
                                          inherited=inherited)
 
-        schema = self._update_inherited_fields(
-            schema, context, inherited_fields_update)
+        all_updates['inherited_fields'] = self._compute_inherited_fields(
+            inherited_fields, inherited_fields_update)
 
-        return schema
+        return scls.update(schema, all_updates)
 
     def get_inherited_ref_layout(
         self,
@@ -547,13 +569,17 @@ class CreateInheritingObject(InheritingObjectCommand,
         schema: s_schema.Schema,
         context: sd.CommandContext
     ) -> s_schema.Schema:
+        if not context.canonical and context.mark_derived:
+            # is_derived is inheritable, so it must be in place before
+            # the fields are merged.
+            self.set_attribute_value('is_derived', True)
+
         schema = super()._create_begin(schema, context)
 
         if not context.canonical:
             ancestors = so.ObjectList[so.InheritingObject].create(
                 schema, so.compute_ancestors(schema, self.scls))
-            schema = self.scls.set_field_value(
-                schema, 'ancestors', ancestors)
+            updates: Dict[str, Any] = {'ancestors': ancestors}
             self.set_attribute_value('ancestors', ancestors)
 
             bases_coll = self.get_attribute_value('bases')
@@ -562,22 +588,19 @@ class CreateInheritingObject(InheritingObjectCommand,
             else:
                 bases = ()
 
-            if context.mark_derived:
-                schema = self.scls.update(schema, {
-                    'is_derived': True,
-                })
-
-                self.set_attribute_value('is_derived', True)
-
             if context.preserve_path_id and len(bases) == 1:
                 base_name = bases[0].get_name(schema)
-                schema = self.scls.set_field_value(
-                    schema, 'path_id_name', base_name)
+                updates['path_id_name'] = base_name
                 self.set_attribute_value(
                     'path_id_name', base_name)
 
+            # Neither the ancestors nor path_id_name are inheritable,
+            # so they are applied together with the merged fields.
             if context.inheritance_merge is None or context.inheritance_merge:
-                schema = self.inherit_fields(schema, context, self.scls, bases)
+                schema = self.inherit_fields(
+                    schema, context, self.scls, bases, updates=updates)
+            else:
+                schema = self.scls.update(schema, updates)
 
         return schema
 
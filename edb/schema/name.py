@@ -21,6 +21,7 @@ from __future__ import annotations
 from typing import *
 
 import functools
+import sys
 
 from edb import errors
 
@@ -64,7 +65,8 @@ class SchemaName(str):
         _fullname = f"{_module}::{_name}"
         result = super().__new__(cls, _fullname)  # type: ignore
         result.name = _name
-        result.module = _module
+        # Module names are shared by a lot of names.
+        result.module = sys.intern(_module)
 
         return cast(NameT, result)
 
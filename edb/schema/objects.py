@@ -29,6 +29,7 @@ import itertools
 import sys
 import types
 import uuid
+import weakref
 
 from edb import errors
 from edb.edgeql import qltypes
@@ -918,6 +919,68 @@ class Object(s_abc.Object, s_abc.ObjectContainer, metaclass=ObjectMeta):
 
         return frozenset(sig)
 
+    def structural_hash_criteria(
+        self: Object_T, schema: s_schema.Schema
+    ) -> FrozenSet[HashCriterion]:
+        """Return hash criteria that do not depend on object ids.
+
+        References to other objects are represented by their names,
+        and the local objects in ref dicts by their own structural
+        criteria, so objects that compare() finds identical have equal
+        criteria even if they come from independently built schemas.
+        """
+        cls = type(self)
+
+        sig: List[Union[Type[Object_T], Tuple[str, Any]]] = [cls]
+        for f in cls._hashable_fields:
+            if f.compcoef is None:
+                continue
+            fn = f.name
+            val = self.get_field_value(schema, fn)
+            if val is None:
+                continue
+            sig.append((fn, cls._structural_field_value(f, val, schema)))
+
+        return frozenset(sig)
+
+    @classmethod
+    def _structural_field_value(
+        cls,
+        field: SchemaField[Any],
+        value: Any,
+        schema: s_schema.Schema,
+    ) -> Any:
+        from edb.schema import expr as s_expr
+
+        comparator = getattr(field.type, 'compare_values', None)
+        # Only values compared by one of the known comparators are
+        # reduced, everything else is kept as is, which at worst makes
+        # equal objects look different.
+        impl = getattr(comparator, '__func__', None)
+        if impl is None:
+            return value
+        elif impl is Object.compare_values.__func__:
+            return (type(value), value.get_name(schema))
+        elif impl is ObjectCollection.compare_values.__func__:
+            return frozenset(value.names(schema, allow_unresolved=True))
+        elif impl is ObjectIndexBase.compare_values.__func__:
+            # Objects that are only inherited follow their ancestors,
+            # which are diffed on their own, so they are left out to
+            # keep a change of an ancestor from altering every object
+            # that inherits from it.
+            return frozenset(
+                (k, v.structural_hash_criteria(schema))
+                for k, v in value.items(schema)
+                if (type(v).get_field('is_local') is None
+                    or v.get_field_value(schema, 'is_local'))
+            )
+        elif impl is s_expr.Expression.compare_values.__func__:
+            return value.text
+        elif impl is s_expr.ExpressionList.compare_values.__func__:
+            return tuple(expr.text for expr in value)
+        else:
+            return value
+
     def compare(
         self,
         other: Object,
@@ -1338,9 +1401,10 @@ class Object(s_abc.Object, s_abc.ObjectContainer, metaclass=ObjectMeta):
             raise ValueError("`old` is present but `old_schema` is None")
 
         oldkeys = {
-            o.id: o.hash_criteria(old_schema) for o in old  # type: ignore
+            o.id: o.structural_hash_criteria(old_schema)  # type: ignore
+            for o in old
         }
-        newkeys = {o.id: o.hash_criteria(new_schema) for o in new}
+        newkeys = {o.id: o.structural_hash_criteria(new_schema) for o in new}
 
         unchanged = set(oldkeys.values()) & set(newkeys.values())
 
@@ -1352,7 +1416,36 @@ class Object(s_abc.Object, s_abc.ObjectContainer, metaclass=ObjectMeta):
             if newkeys[o.id] not in unchanged)
 
         comparison: List[Tuple[float, Object, Object]] = []
-        for x, y in itertools.product(new, old):
+
+        # Objects that kept their name are paired directly.  The
+        # similarity of objects with different names cannot exceed the
+        # coefficient of the name field, so when a same-name pair is
+        # more similar than that, no other pairing of either object
+        # would be picked below, and comparing them with the rest of
+        # the objects can be skipped.
+        old_by_name = {
+            o.get_name(old_schema): o for o in old  # type: ignore
+        }
+        matched_old: Set[Object] = set()
+        unmatched_new: List[Object] = []
+        for x in new:
+            y = old_by_name.get(x.get_name(new_schema))
+            if y is not None:
+                comp = x.compare(y, our_schema=new_schema,
+                                 their_schema=old_schema)  # type: ignore
+                namecoef = type(x).get_field('name').compcoef
+                if (
+                    comp is not NotImplemented
+                    and namecoef is not None
+                    and comp > namecoef
+                ):
+                    comparison.append((comp, x, y))
+                    matched_old.add(y)
+                    continue
+            unmatched_new.append(x)
+
+        unmatched_old = [o for o in old if o not in matched_old]
+        for x, y in itertools.product(unmatched_new, unmatched_old):
             comp = x.compare(y, our_schema=new_schema,
                              their_schema=old_schema)  # type: ignore
             comparison.append((comp, x, y))
@@ -1599,6 +1692,14 @@ class ObjectRef(Object, BaseObjectRef):
         )
 
 
+# Collections stored in schemas are never modified and many of them
+# are equal (e.g. the bases of all types extending the same type),
+# so the schema keeps a single shared copy of every distinct one (see
+# ObjectCollection.intern()).
+_interned_collections: weakref.WeakValueDictionary[
+    Hashable, ObjectCollection] = weakref.WeakValueDictionary()
+
+
 class ObjectCollectionDuplicateNameError(Exception):
     pass
 
@@ -1643,6 +1744,23 @@ class ObjectCollection(
     def __hash__(self) -> int:
         return hash(self._ids)
 
+    def _get_intern_key(self) -> Hashable:
+        return (type(self), self._ids)
+
+    def intern(self: ObjectCollection_T) -> ObjectCollection_T:
+        """Return the shared collection equal to this one."""
+        if any(isinstance(v, ObjectRef) for v in self._ids):
+            # References are resolved against a particular schema.
+            return self
+
+        key = self._get_intern_key()
+        interned = _interned_collections.get(key)
+        if interned is None:
+            _interned_collections[key] = self
+            return self
+        else:
+            return cast(ObjectCollection_T, interned)
+
     def __reduce__(self) -> Tuple[Any, ...]:
         assert type(self).is_fully_resolved(), \
             f'{type(self)} parameters are not resolved'
@@ -2002,6 +2120,9 @@ class ObjectDict(
     def __hash__(self) -> int:
         return hash((self._ids, self._keys))
 
+    def _get_intern_key(self) -> Hashable:
+        return (type(self), self._ids, self._keys)
+
     def dump(self, schema: s_schema.Schema) -> str:
         objs = ", ".join(f"{self._keys[i]}: {o.dump(schema)}"
                          for i, o in enumerate(self.objects(schema)))
@@ -2057,7 +2178,10 @@ class ObjectSet(ObjectCollection, Generic[Object_T], container=frozenset):
                 if result is None:
                     result = theirs
                 else:
-                    result._ids |= theirs._ids
+                    # Collections may be shared (see intern()), so
+                    # never update them in place.
+                    result = type(result)(
+                        result._ids | theirs._ids, _private_init=True)
 
         return result
 
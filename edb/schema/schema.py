@@ -21,7 +21,6 @@ from __future__ import annotations
 
 from typing import *
 
-import functools
 import itertools
 
 import immutables as immu
@@ -29,6 +28,7 @@ import immutables as immu
 from edb import errors
 
 from . import abc as s_abc
+from . import caches
 from . import casts as s_casts
 from . import expr as s_expr
 from . import functions as s_func
@@ -42,24 +42,46 @@ if TYPE_CHECKING:
     import uuid
     from edb.common import parsing
 
+    # Referrer ids are kept in a tuple while there are only a few
+    # of them, see _add_ref().
+    RefIds_T = Union[Tuple[uuid.UUID, ...], immu.Map[uuid.UUID, None]]
+
     Refs_T = immu.Map[
         uuid.UUID,
         immu.Map[
             Tuple[Type[so.Object], str],
-            immu.Map[uuid.UUID, None],
+            RefIds_T,
         ],
     ]
 
 STD_LIB = ('std', 'schema', 'math', 'sys', 'cfg', 'cal')
 STD_MODULES = frozenset(STD_LIB + ('stdgraphql',))
 
+_FUNCTIONS_CACHE = caches.CacheKind(
+    'functions', maxsize=4096, depends_on=[s_func.Function])
+_OPERATORS_CACHE = caches.CacheKind(
+    'operators', maxsize=1024, depends_on=[s_oper.Operator])
+_CASTS_CACHE = caches.CacheKind(
+    'casts', maxsize=1024, depends_on=[s_casts.Cast])
+# Referrers are looked up in the reference map entries they were
+# computed from (see get_referrers()), which are immutable, so the
+# results are valid in every schema version with the same entries.
+_REFERRERS_CACHE = caches.CacheKind(
+    'referrers', maxsize=8192, depends_on=())
+_REFERRERS_EX_CACHE = caches.CacheKind(
+    'referrers_ex', maxsize=4096, depends_on=())
+# Name resolution only depends on the name map, which is immutable,
+# so resolved names are keyed on its identity (see get()).
+_NAMES_CACHE = caches.CacheKind(
+    'names', maxsize=8192, depends_on=())
+
 
 _void = object()
 
 
 class Schema(s_abc.Schema):
 
-    _id_to_data: immu.Map[uuid.UUID, immu.Map[str, Any]]
+    _id_to_data: immu.Map[uuid.UUID, ObjectData]
     _id_to_type: immu.Map[uuid.UUID, so.Object]
     _name_to_id: immu.Map[str, uuid.UUID]
     _shortname_to_id: immu.Map[
@@ -67,8 +89,13 @@ class Schema(s_abc.Schema):
         FrozenSet[uuid.UUID]
     ]
     _globalname_to_id: immu.Map[Tuple[Type[so.Object], str], uuid.UUID]
+    # Secondary indexes used by get_objects(): object ids grouped
+    # by the exact object class and by the module of the object.
+    _type_to_ids: immu.Map[Type[so.Object], immu.Map[uuid.UUID, None]]
+    _module_to_ids: immu.Map[str, immu.Map[uuid.UUID, None]]
     _refs_to: Refs_T
     _generation: int
+    _caches: caches.SchemaCaches
 
     def __init__(self) -> None:
         self._id_to_data = immu.Map()
@@ -76,13 +103,34 @@ class Schema(s_abc.Schema):
         self._shortname_to_id = immu.Map()
         self._name_to_id = immu.Map()
         self._globalname_to_id = immu.Map()
+        self._type_to_ids = immu.Map()
+        self._module_to_ids = immu.Map()
         self._refs_to = immu.Map()
         self._generation = 0
+        self._caches = caches.SchemaCaches()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_caches']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._caches = caches.SchemaCaches()
+
+    def get_cache(self, kind: caches.CacheKind) -> caches.Cache:
+        """Return the cache of lookups of the given *kind*."""
+        return self._caches.get(kind)
+
+    def get_cache_stats(self) -> Dict[str, caches.CacheStats]:
+        return self._caches.get_stats()
 
     def _replace(
         self,
         *,
-        id_to_data: Optional[immu.Map[uuid.UUID, immu.Map[str, Any]]] = None,
+        changed: Optional[AbstractSet[Type[so.Object]]],
+        changed_derived: AbstractSet[Type[so.Object]] = frozenset(),
+        id_to_data: Optional[immu.Map[uuid.UUID, ObjectData]] = None,
         id_to_type: Optional[immu.Map[uuid.UUID, so.Object]] = None,
         name_to_id: Optional[immu.Map[str, uuid.UUID]] = None,
         shortname_to_id: Optional[
@@ -94,6 +142,12 @@ class Schema(s_abc.Schema):
         globalname_to_id: Optional[
             immu.Map[Tuple[Type[so.Object], str], uuid.UUID]
         ],
+        type_to_ids: Optional[
+            immu.Map[Type[so.Object], immu.Map[uuid.UUID, None]]
+        ] = None,
+        module_to_ids: Optional[
+            immu.Map[str, immu.Map[uuid.UUID, None]]
+        ] = None,
         refs_to: Optional[Refs_T] = None,
     ) -> Schema:
         new = Schema.__new__(Schema)
@@ -123,77 +177,32 @@ class Schema(s_abc.Schema):
         else:
             new._globalname_to_id = globalname_to_id
 
+        if type_to_ids is None:
+            new._type_to_ids = self._type_to_ids
+        else:
+            new._type_to_ids = type_to_ids
+
+        if module_to_ids is None:
+            new._module_to_ids = self._module_to_ids
+        else:
+            new._module_to_ids = module_to_ids
+
         if refs_to is None:
             new._refs_to = self._refs_to
         else:
             new._refs_to = refs_to
 
         new._generation = self._generation + 1
+        new._caches = self._caches.derive(changed, changed_derived)
 
         return new  # type: ignore
 
-    def _update_obj_name(
-        self,
-        obj_id: uuid.UUID,
-        scls: so.Object,
-        old_name: Optional[str],
-        new_name: Optional[str],
-    ) -> Tuple[
-        immu.Map[str, uuid.UUID],
-        immu.Map[Tuple[Type[so.Object], str], FrozenSet[uuid.UUID]],
-        immu.Map[Tuple[Type[so.Object], str], uuid.UUID],
-    ]:
-        name_to_id = self._name_to_id
-        shortname_to_id = self._shortname_to_id
-        globalname_to_id = self._globalname_to_id
-        stype = type(scls)
-        is_global = issubclass(stype, so.UnqualifiedObject)
-
-        has_sn_cache = issubclass(stype, (s_func.Function, s_oper.Operator))
+    def mutate(self) -> SchemaMutation:
+        """Return a mutation context for a batch of changes to the schema.
 
-        if old_name is not None:
-            if is_global:
-                globalname_to_id = globalname_to_id.delete((stype, old_name))
-            else:
-                name_to_id = name_to_id.delete(old_name)
-            if has_sn_cache:
-                old_shortname = sn.shortname_from_fullname(old_name)
-                sn_key = (stype, old_shortname)
-
-                new_ids = shortname_to_id[sn_key] - {obj_id}
-                if new_ids:
-                    shortname_to_id = shortname_to_id.set(
-                        sn_key, new_ids)
-                else:
-                    shortname_to_id = shortname_to_id.delete(sn_key)
-
-        if new_name is not None:
-            if is_global:
-                key = (stype, new_name)
-                if key in globalname_to_id:
-                    raise errors.SchemaError(
-                        f'{stype.__name__} {new_name!r} '
-                        f'is already present in the schema')
-                globalname_to_id = globalname_to_id.set(key, obj_id)
-            else:
-                if new_name in name_to_id:
-                    raise errors.SchemaError(
-                        f'name {new_name!r} is already in the schema')
-                name_to_id = name_to_id.set(new_name, obj_id)
-
-            if has_sn_cache:
-                new_shortname = sn.shortname_from_fullname(new_name)
-                sn_key = (stype, new_shortname)
-
-                try:
-                    ids = shortname_to_id[sn_key]
-                except KeyError:
-                    ids = frozenset()
-
-                shortname_to_id = shortname_to_id.set(
-                    sn_key, ids | {obj_id})
-
-        return name_to_id, shortname_to_id, globalname_to_id
+        See SchemaMutation for details.
+        """
+        return SchemaMutation(self)
 
     def _update_obj(
         self,
@@ -203,41 +212,9 @@ class Schema(s_abc.Schema):
         if not updates:
             return self
 
-        try:
-            data = self._id_to_data[obj_id]
-        except KeyError:
-            data = immu.Map()
-
-        name_to_id = None
-        shortname_to_id = None
-        globalname_to_id = None
-        with data.mutate() as mm:
-            for field, value in updates.items():
-                if field == 'name':
-                    name_to_id, shortname_to_id, globalname_to_id = (
-                        self._update_obj_name(
-                            obj_id,
-                            self._id_to_type[obj_id],
-                            mm.get('name'),
-                            value
-                        )
-                    )
-
-                if value is None:
-                    mm.pop(field, None)
-                else:
-                    mm[field] = value
-
-            new_data = mm.finish()
-
-        id_to_data = self._id_to_data.set(obj_id, new_data)
-        scls = self._id_to_type[obj_id]
-        refs_to = self._update_refs_to(scls, data, new_data)
-        return self._replace(name_to_id=name_to_id,
-                             shortname_to_id=shortname_to_id,
-                             globalname_to_id=globalname_to_id,
-                             id_to_data=id_to_data,
-                             refs_to=refs_to)
+        mutation = self.mutate()
+        mutation._update_obj(obj_id, updates)
+        return mutation.finish()
 
     def _get_obj_field(
         self,
@@ -251,7 +228,8 @@ class Schema(s_abc.Schema):
                    f'is not present in the schema {self!r}')
             raise errors.SchemaError(err) from None
 
-        return d.get(field)
+        i = d[0].get(field)
+        return d[i] if i is not None else None
 
     def _set_obj_field(
         self,
@@ -259,178 +237,18 @@ class Schema(s_abc.Schema):
         field: str,
         value: Any,
     ) -> Schema:
-        try:
-            data = self._id_to_data[obj_id]
-        except KeyError:
-            err = (f'cannot set {field!r} value: item {str(obj_id)!r} '
-                   f'is not present in the schema {self!r}')
-            raise errors.SchemaError(err) from None
-
-        name_to_id = None
-        shortname_to_id = None
-        globalname_to_id = None
-        if field == 'name':
-            old_name = data.get('name')
-            name_to_id, shortname_to_id, globalname_to_id = (
-                self._update_obj_name(
-                    obj_id,
-                    self._id_to_type[obj_id],
-                    old_name,
-                    value
-                )
-            )
-
-        new_data = data.set(field, value)
-        id_to_data = self._id_to_data.set(obj_id, new_data)
-        scls = self._id_to_type[obj_id]
-
-        if field in data:
-            orig_field_data = {field: data[field]}
-        else:
-            orig_field_data = {}
-
-        refs_to = self._update_refs_to(scls, orig_field_data, {field: value})
-
-        return self._replace(name_to_id=name_to_id,
-                             shortname_to_id=shortname_to_id,
-                             globalname_to_id=globalname_to_id,
-                             id_to_data=id_to_data,
-                             refs_to=refs_to)
+        mutation = self.mutate()
+        mutation._set_obj_field(obj_id, field, value)
+        return mutation.finish()
 
     def _unset_obj_field(
         self,
         obj_id: uuid.UUID,
         field: str,
     ) -> Schema:
-        try:
-            data = self._id_to_data[obj_id]
-        except KeyError:
-            return self
-
-        name_to_id = None
-        shortname_to_id = None
-        globalname_to_id = None
-        name = data.get('name')
-        if field == 'name' and name is not None:
-            name_to_id, shortname_to_id, globalname_to_id = (
-                self._update_obj_name(
-                    obj_id,
-                    self._id_to_type[obj_id],
-                    name,
-                    None
-                )
-            )
-            new_data = data.delete(field)
-        else:
-            try:
-                new_data = data.delete(field)
-            except KeyError:
-                return self
-
-        id_to_data = self._id_to_data.set(obj_id, new_data)
-        scls = self._id_to_type[obj_id]
-        refs_to = self._update_refs_to(scls, {field: data[field]}, None)
-
-        return self._replace(name_to_id=name_to_id,
-                             shortname_to_id=shortname_to_id,
-                             globalname_to_id=globalname_to_id,
-                             id_to_data=id_to_data,
-                             refs_to=refs_to)
-
-    def _update_refs_to(
-        self,
-        scls: so.Object,
-        orig_data: Optional[Mapping[str, Any]],
-        new_data: Optional[Mapping[str, Any]],
-    ) -> Refs_T:
-        scls_type = type(scls)
-        objfields = scls_type.get_object_fields()
-        if not objfields:
-            return self._refs_to
-
-        with self._refs_to.mutate() as mm:
-            for field in objfields:
-                if not new_data:
-                    ids = None
-                else:
-                    try:
-                        ref = new_data[field.name]
-                    except KeyError:
-                        ids = None
-                    else:
-                        if isinstance(ref, so.ObjectCollection):
-                            ids = frozenset(ref.ids(self))
-                        elif isinstance(ref, s_expr.Expression):
-                            if ref.refs:
-                                ids = frozenset(ref.refs.ids(self))
-                            else:
-                                ids = frozenset()
-                        else:
-                            ids = frozenset((ref.id,))
-
-                if not orig_data:
-                    orig_ids = None
-                else:
-                    try:
-                        ref = orig_data[field.name]
-                    except KeyError:
-                        orig_ids = None
-                    else:
-                        if isinstance(ref, so.ObjectCollection):
-                            orig_ids = frozenset(ref.ids(self))
-                        elif isinstance(ref, s_expr.Expression):
-                            if ref.refs:
-                                orig_ids = frozenset(ref.refs.ids(self))
-                            else:
-                                orig_ids = frozenset()
-                        else:
-                            orig_ids = frozenset((ref.id,))
-
-                if not ids and not orig_ids:
-                    continue
-
-                old_ids: Optional[FrozenSet[uuid.UUID]]
-                new_ids: Optional[FrozenSet[uuid.UUID]]
-
-                key = (scls_type, field.name)
-
-                if ids and orig_ids:
-                    new_ids = ids - orig_ids
-                    old_ids = orig_ids - ids
-                elif ids:
-                    new_ids = ids
-                    old_ids = None
-                else:
-                    new_ids = None
-                    old_ids = orig_ids
-
-                if new_ids:
-                    for ref_id in new_ids:
-                        try:
-                            refs = mm[ref_id]
-                        except KeyError:
-                            mm[ref_id] = immu.Map((
-                                (key, immu.Map(((scls.id, None),))),
-                            ))
-                        else:
-                            try:
-                                field_refs = refs[key]
-                            except KeyError:
-                                field_refs = immu.Map(((scls.id, None),))
-                            else:
-                                field_refs = field_refs.set(scls.id, None)
-                            mm[ref_id] = refs.set(key, field_refs)
-
-                if old_ids:
-                    for ref_id in old_ids:
-                        refs = mm[ref_id]
-                        field_refs = refs[key].delete(scls.id)
-                        if not field_refs:
-                            mm[ref_id] = refs.delete(key)
-                        else:
-                            mm[ref_id] = refs.set(key, field_refs)
-
-            return mm.finish()
+        mutation = self.mutate()
+        mutation._unset_obj_field(obj_id, field)
+        return mutation.finish()
 
     def _add(
         self,
@@ -438,59 +256,14 @@ class Schema(s_abc.Schema):
         scls: so.Object,
         data: Mapping[str, Any],
     ) -> Schema:
-        name = data['name']
-
-        if name in self._name_to_id:
-            raise errors.SchemaError(
-                f'{type(scls).__name__} {name!r} is already present '
-                f'in the schema {self!r}')
-
-        data = immu.Map(data)
-
-        name_to_id, shortname_to_id, globalname_to_id = self._update_obj_name(
-            id, scls, None, name)
-
-        updates = dict(
-            id_to_data=self._id_to_data.set(id, data),
-            id_to_type=self._id_to_type.set(id, scls),
-            name_to_id=name_to_id,
-            shortname_to_id=shortname_to_id,
-            globalname_to_id=globalname_to_id,
-            refs_to=self._update_refs_to(scls, None, data),
-        )
-
-        if (not isinstance(scls, so.UnqualifiedObject)
-                and not self.has_module(name.module)):
-            raise errors.UnknownModuleError(
-                f'module {name.module!r} is not in this schema')
-
-        return self._replace(**updates)  # type: ignore
+        mutation = self.mutate()
+        mutation._add(id, scls, data)
+        return mutation.finish()
 
     def _delete(self, obj: so.Object) -> Schema:
-        data = self._id_to_data.get(obj.id)
-        if data is None:
-            raise errors.InvalidReferenceError(
-                f'cannot delete {obj!r}: not in this schema')
-
-        name = data['name']
-
-        updates = {}
-
-        name_to_id, shortname_to_id, globalname_to_id = self._update_obj_name(
-            obj.id, self._id_to_type[obj.id], name, None)
-
-        refs_to = self._update_refs_to(obj, self._id_to_data[obj.id], None)
-
-        updates.update(dict(
-            name_to_id=name_to_id,
-            shortname_to_id=shortname_to_id,
-            globalname_to_id=globalname_to_id,
-            id_to_data=self._id_to_data.delete(obj.id),
-            id_to_type=self._id_to_type.delete(obj.id),
-            refs_to=refs_to,
-        ))
-
-        return self._replace(**updates)  # type: ignore
+        mutation = self.mutate()
+        mutation._delete(obj)
+        return mutation.finish()
 
     def discard(self, obj: so.Object) -> Schema:
         if obj.id in self._id_to_data:
@@ -577,7 +350,6 @@ class Schema(s_abc.Schema):
         raise errors.InvalidReferenceError(
             f'operator {name!r} does not exist')
 
-    @functools.lru_cache()
     def _get_casts(
         self,
         stype: s_types.Type,
@@ -587,6 +359,13 @@ class Schema(s_abc.Schema):
         assignment: bool = False,
     ) -> FrozenSet[s_casts.Cast]:
 
+        cache = self._caches.get(_CASTS_CACHE)
+        key = (stype, disposition, implicit, assignment)
+        try:
+            return cast(FrozenSet[s_casts.Cast], cache[key])
+        except KeyError:
+            pass
+
         all_casts = cast(
             FrozenSet[s_casts.Cast],
             self.get_referrers(
@@ -601,7 +380,8 @@ class Schema(s_abc.Schema):
                 continue
             casts.append(castobj)
 
-        return frozenset(casts)
+        result = cache[key] = frozenset(casts)
+        return result
 
     def get_casts_to_type(
         self,
@@ -623,7 +403,6 @@ class Schema(s_abc.Schema):
         return self._get_casts(from_type, disposition='from_type',
                                implicit=implicit, assignment=assignment)
 
-    @functools.lru_cache()
     def get_referrers(
         self,
         scls: so.Object,
@@ -632,35 +411,52 @@ class Schema(s_abc.Schema):
         field_name: Optional[str] = None,
     ) -> FrozenSet[so.Object]:
 
+        if scls_type is None and field_name is not None:
+            raise ValueError(
+                'get_referrers: field_name cannot be used '
+                'without scls_type')
+
+        refs = self._refs_to.get(scls.id)
+        if refs is None:
+            return frozenset()
+
+        source: Any
+        if field_name is not None:
+            source = refs.get((scls_type, field_name))
+            if source is None:
+                return frozenset()
+        else:
+            source = refs
+
+        # The cached entry holds on to the source, so its id cannot
+        # be reused while the entry is in the cache.
+        cache = self._caches.get(_REFERRERS_CACHE)
+        key = (id(source), scls_type, field_name)
         try:
-            refs = self._refs_to[scls.id]
+            cached_source, result = cache[key]
         except KeyError:
-            return frozenset()
+            pass
         else:
-            referrers: Set[so.Object] = set()
+            assert cached_source is source
+            return cast(FrozenSet[so.Object], result)
 
-            if scls_type is not None:
-                if field_name is not None:
-                    for (st, fn), ids in refs.items():
-                        if st is scls_type and fn == field_name:
-                            referrers.update(
-                                self._id_to_type[objid] for objid in ids)
-                else:
-                    for (st, _), ids in refs.items():
-                        if st is scls_type:
-                            referrers.update(
-                                self._id_to_type[objid] for objid in ids)
-            elif field_name is not None:
-                raise ValueError(
-                    'get_referrers: field_name cannot be used '
-                    'without scls_type')
-            else:
-                refids = itertools.chain.from_iterable(refs.values())
-                referrers.update(self._id_to_type[objid] for objid in refids)
+        id_to_type = self._id_to_type
+        if field_name is not None:
+            result = frozenset(id_to_type[objid] for objid in source)
+        elif scls_type is not None:
+            referrers: Set[so.Object] = set()
+            for field in scls_type.get_object_fields():
+                ids = refs.get((scls_type, field.name))
+                if ids is not None:
+                    referrers.update(id_to_type[objid] for objid in ids)
+            result = frozenset(referrers)
+        else:
+            refids = itertools.chain.from_iterable(refs.values())
+            result = frozenset(id_to_type[objid] for objid in refids)
 
-            return frozenset(referrers)
+        cache[key] = (source, result)
+        return result
 
-    @functools.lru_cache()
     def get_referrers_ex(
         self,
         scls: so.Object,
@@ -668,17 +464,28 @@ class Schema(s_abc.Schema):
         Tuple[Type[so.Object], str],
         Set[so.Object],
     ]:
+        refs = self._refs_to.get(scls.id)
+        if refs is None:
+            return {}
+
+        cache = self._caches.get(_REFERRERS_EX_CACHE)
         try:
-            refs = self._refs_to[scls.id]
+            cached_refs, result = cache[id(refs)]
         except KeyError:
-            return {}
+            pass
         else:
-            result = {}
+            assert cached_refs is refs
+            return cast(
+                Dict[Tuple[Type[so.Object], str], Set[so.Object]],
+                result,
+            )
 
-            for (st, fn), ids in refs.items():
-                result[st, fn] = {self._id_to_type[objid] for objid in ids}
+        result = {}
+        for (st, fn), ids in refs.items():
+            result[st, fn] = {self._id_to_type[objid] for objid in ids}
 
-            return result
+        cache[id(refs)] = (refs, result)
+        return result
 
     @overload
     def get_by_id(
@@ -811,13 +618,36 @@ class Schema(s_abc.Schema):
                     obj = None
             return obj
 
-        obj = self._get(name,
-                        getter=getter,
-                        module_aliases=module_aliases,
-                        default=default)
+        if condition is None:
+            # The cached entry holds on to the name map, so its id
+            # cannot be reused while the entry is in the cache.
+            cache = self._caches.get(_NAMES_CACHE)
+            key = (
+                name,
+                tuple(module_aliases.items()) if module_aliases else None,
+                type,
+                id(self._name_to_id),
+            )
+            try:
+                cached_map, obj = cache[key]
+            except KeyError:
+                obj = self._get(name,
+                                getter=getter,
+                                module_aliases=module_aliases,
+                                default=None)
+                cache[key] = (self._name_to_id, obj)
+            else:
+                assert cached_map is self._name_to_id
+        else:
+            obj = self._get(name,
+                            getter=getter,
+                            module_aliases=module_aliases,
+                            default=None)
 
-        if obj is not so.NoDefault:
+        if obj is not None:
             return cast(so.Object_T, obj)
+        elif default is not so.NoDefault:
+            return default
 
         if label is None:
             if type is not None:
@@ -884,6 +714,435 @@ class Schema(s_abc.Schema):
             f'<{type(self).__name__} gen:{self._generation} at {id(self):#x}>')
 
 
+class SchemaMutation:
+    """A batch of changes to a schema.
+
+    Every change made through the Schema API produces a new version of
+    the schema with fresh copies of the maps the schema is made of.
+    A SchemaMutation accumulates changes in mutation contexts of those
+    maps instead, and finish() returns a single new schema version
+    with all of them applied, e.g.::
+
+        mutation = schema.mutate()
+        for obj, value in updates:
+            mutation.set_field_value(obj, 'field', value)
+        schema = mutation.finish()
+
+    The objects and references touched by the changes are looked up
+    in the original schema, so the changes in a batch must not depend
+    on one another.
+    """
+
+    def __init__(self, schema: Schema) -> None:
+        self._schema = schema
+        self._id_to_data = schema._id_to_data.mutate()
+        self._id_to_type = schema._id_to_type.mutate()
+        self._refs_to = schema._refs_to.mutate()
+        # Name maps and secondary indexes only change when objects
+        # are added, deleted or renamed, see _get_indexes().
+        self._indexes: Optional[_IndexMutations] = None
+        self._changed: Set[Type[so.Object]] = set()
+        self._changed_derived: Set[Type[so.Object]] = set()
+
+    def set_field_value(
+        self,
+        obj: so.Object,
+        name: str,
+        value: Any,
+    ) -> None:
+        field = type(obj).get_field(name)
+        assert field.is_schema_field
+
+        if value is None:
+            self._unset_obj_field(obj.id, name)
+        else:
+            value = field.coerce_value(self._schema, value)
+            self._set_obj_field(obj.id, name, value)
+
+    def update_obj(
+        self,
+        obj: so.Object,
+        updates: Mapping[str, Any],
+    ) -> None:
+        mcls = type(obj)
+        coerced = {}
+        for field_name, value in updates.items():
+            field = mcls.get_field(field_name)
+            assert field.is_schema_field
+            if value is not None:
+                value = field.coerce_value(self._schema, value)
+            coerced[field_name] = value
+
+        if coerced:
+            self._update_obj(obj.id, coerced)
+
+    def delete(self, obj: so.Object) -> None:
+        self._delete(obj)
+
+    def finish(self) -> Schema:
+        """Return the schema with all changes in the batch applied."""
+        if not self._changed and not self._changed_derived:
+            return self._schema
+
+        indexes = self._indexes
+        if indexes is None:
+            return self._schema._replace(
+                changed=self._changed,
+                changed_derived=self._changed_derived,
+                id_to_data=self._id_to_data.finish(),
+                id_to_type=self._id_to_type.finish(),
+                name_to_id=None,
+                shortname_to_id=None,
+                globalname_to_id=None,
+                refs_to=self._refs_to.finish(),
+            )
+        else:
+            return self._schema._replace(
+                changed=self._changed,
+                changed_derived=self._changed_derived,
+                id_to_data=self._id_to_data.finish(),
+                id_to_type=self._id_to_type.finish(),
+                name_to_id=indexes.name_to_id.finish(),
+                shortname_to_id=indexes.shortname_to_id.finish(),
+                globalname_to_id=indexes.globalname_to_id.finish(),
+                type_to_ids=indexes.type_to_ids.finish(),
+                module_to_ids=indexes.module_to_ids.finish(),
+                refs_to=self._refs_to.finish(),
+            )
+
+    def _get_indexes(self) -> _IndexMutations:
+        if self._indexes is None:
+            schema = self._schema
+            self._indexes = _IndexMutations(
+                name_to_id=schema._name_to_id.mutate(),
+                shortname_to_id=schema._shortname_to_id.mutate(),
+                globalname_to_id=schema._globalname_to_id.mutate(),
+                type_to_ids=schema._type_to_ids.mutate(),
+                module_to_ids=schema._module_to_ids.mutate(),
+            )
+        return self._indexes
+
+    def _has_module(self, module: str) -> bool:
+        if self._indexes is None:
+            return self._schema.has_module(module)
+        else:
+            return (s_mod.Module, module) in self._indexes.globalname_to_id
+
+    def _update_obj_name(
+        self,
+        obj_id: uuid.UUID,
+        scls: so.Object,
+        old_name: Optional[str],
+        new_name: Optional[str],
+    ) -> None:
+        indexes = self._get_indexes()
+        name_to_id = indexes.name_to_id
+        shortname_to_id = indexes.shortname_to_id
+        globalname_to_id = indexes.globalname_to_id
+        module_to_ids = indexes.module_to_ids
+        stype = type(scls)
+        is_global = issubclass(stype, so.UnqualifiedObject)
+
+        has_sn_cache = issubclass(stype, (s_func.Function, s_oper.Operator))
+
+        if old_name is not None:
+            if is_global:
+                del globalname_to_id[(stype, old_name)]
+            else:
+                del name_to_id[old_name]
+                _index_discard(
+                    module_to_ids, sn.Name(old_name).module, obj_id)
+            if has_sn_cache:
+                old_shortname = sn.shortname_from_fullname(old_name)
+                sn_key = (stype, old_shortname)
+
+                new_ids = shortname_to_id[sn_key] - {obj_id}
+                if new_ids:
+                    shortname_to_id[sn_key] = new_ids
+                else:
+                    del shortname_to_id[sn_key]
+
+        if new_name is not None:
+            if is_global:
+                key = (stype, new_name)
+                if key in globalname_to_id:
+                    raise errors.SchemaError(
+                        f'{stype.__name__} {new_name!r} '
+                        f'is already present in the schema')
+                globalname_to_id[key] = obj_id
+            else:
+                if new_name in name_to_id:
+                    raise errors.SchemaError(
+                        f'name {new_name!r} is already in the schema')
+                name_to_id[new_name] = obj_id
+                _index_add(module_to_ids, sn.Name(new_name).module, obj_id)
+
+            if has_sn_cache:
+                new_shortname = sn.shortname_from_fullname(new_name)
+                sn_key = (stype, new_shortname)
+
+                try:
+                    ids = shortname_to_id[sn_key]
+                except KeyError:
+                    ids = frozenset()
+
+                shortname_to_id[sn_key] = ids | {obj_id}
+
+    def _update_obj(
+        self,
+        obj_id: uuid.UUID,
+        updates: Mapping[str, Any],
+    ) -> None:
+        try:
+            data = self._id_to_data[obj_id]
+        except KeyError:
+            data = _EMPTY_DATA
+
+        scls = self._id_to_type[obj_id]
+        fields = _data_to_dict(data)
+        # The references only change for the updated fields.
+        orig_fields = {}
+        new_fields = {}
+
+        for field, value in updates.items():
+            if field == 'name':
+                self._update_obj_name(
+                    obj_id,
+                    scls,
+                    fields.get('name'),
+                    value
+                )
+
+            if field in fields:
+                orig_fields[field] = fields[field]
+
+            if value is None:
+                fields.pop(field, None)
+            else:
+                fields[field] = new_fields[field] = _intern_value(value)
+
+        new_data = _make_data(fields)
+        self._id_to_data[obj_id] = new_data
+        self._update_refs_to(scls, orig_fields, new_fields)
+        self._note_changed(scls, new_data)
+
+    def _set_obj_field(
+        self,
+        obj_id: uuid.UUID,
+        field: str,
+        value: Any,
+    ) -> None:
+        try:
+            data = self._id_to_data[obj_id]
+        except KeyError:
+            err = (f'cannot set {field!r} value: item {str(obj_id)!r} '
+                   f'is not present in the schema {self._schema!r}')
+            raise errors.SchemaError(err) from None
+
+        scls = self._id_to_type[obj_id]
+        orig_value = _data_get(data, field)
+
+        if field == 'name':
+            self._update_obj_name(obj_id, scls, orig_value, value)
+
+        value = _intern_value(value)
+        self._id_to_data[obj_id] = _data_set(data, field, value)
+
+        if orig_value is not None:
+            orig_field_data = {field: orig_value}
+        else:
+            orig_field_data = {}
+
+        self._update_refs_to(scls, orig_field_data, {field: value})
+        self._note_changed(scls, data)
+
+    def _unset_obj_field(
+        self,
+        obj_id: uuid.UUID,
+        field: str,
+    ) -> None:
+        try:
+            data = self._id_to_data[obj_id]
+        except KeyError:
+            return
+
+        orig_value = _data_get(data, field)
+        if orig_value is None:
+            return
+
+        scls = self._id_to_type[obj_id]
+        if field == 'name':
+            self._update_obj_name(obj_id, scls, orig_value, None)
+
+        self._id_to_data[obj_id] = _data_delete(data, field)
+        self._update_refs_to(scls, {field: orig_value}, None)
+        self._note_changed(scls, data)
+
+    def _update_refs_to(
+        self,
+        scls: so.Object,
+        orig_data: Optional[Mapping[str, Any]],
+        new_data: Optional[Mapping[str, Any]],
+    ) -> None:
+        scls_type = type(scls)
+        objfields = scls_type.get_object_fields()
+        if not objfields:
+            return
+
+        schema = self._schema
+        mm = self._refs_to
+
+        for field in objfields:
+            if not new_data:
+                ids = None
+            else:
+                try:
+                    ref = new_data[field.name]
+                except KeyError:
+                    ids = None
+                else:
+                    if isinstance(ref, so.ObjectCollection):
+                        ids = frozenset(ref.ids(schema))
+                    elif isinstance(ref, s_expr.Expression):
+                        if ref.refs:
+                            ids = frozenset(ref.refs.ids(schema))
+                        else:
+                            ids = frozenset()
+                    else:
+                        ids = frozenset((ref.id,))
+
+            if not orig_data:
+                orig_ids = None
+            else:
+                try:
+                    ref = orig_data[field.name]
+                except KeyError:
+                    orig_ids = None
+                else:
+                    if isinstance(ref, so.ObjectCollection):
+                        orig_ids = frozenset(ref.ids(schema))
+                    elif isinstance(ref, s_expr.Expression):
+                        if ref.refs:
+                            orig_ids = frozenset(ref.refs.ids(schema))
+                        else:
+                            orig_ids = frozenset()
+                    else:
+                        orig_ids = frozenset((ref.id,))
+
+            if not ids and not orig_ids:
+                continue
+
+            old_ids: Optional[FrozenSet[uuid.UUID]]
+            new_ids: Optional[FrozenSet[uuid.UUID]]
+
+            key = (scls_type, field.name)
+            key = _ref_keys.setdefault(key, key)
+
+            if ids and orig_ids:
+                new_ids = ids - orig_ids
+                old_ids = orig_ids - ids
+            elif ids:
+                new_ids = ids
+                old_ids = None
+            else:
+                new_ids = None
+                old_ids = orig_ids
+
+            if new_ids:
+                for ref_id in new_ids:
+                    try:
+                        refs = mm[ref_id]
+                    except KeyError:
+                        mm[ref_id] = immu.Map(((key, (scls.id,)),))
+                    else:
+                        mm[ref_id] = refs.set(
+                            key, _add_ref(refs.get(key), scls.id))
+
+            if old_ids:
+                for ref_id in old_ids:
+                    refs = mm[ref_id]
+                    field_refs = _discard_ref(refs[key], scls.id)
+                    if field_refs is None:
+                        mm[ref_id] = refs.delete(key)
+                    else:
+                        mm[ref_id] = refs.set(key, field_refs)
+
+    def _add(
+        self,
+        id: uuid.UUID,
+        scls: so.Object,
+        data: Mapping[str, Any],
+    ) -> None:
+        name = data['name']
+        indexes = self._get_indexes()
+
+        if name in indexes.name_to_id:
+            raise errors.SchemaError(
+                f'{type(scls).__name__} {name!r} is already present '
+                f'in the schema {self._schema!r}')
+
+        fields = {k: _intern_value(v) for k, v in data.items()}
+        new_data = _make_data(fields)
+
+        self._update_obj_name(id, scls, None, name)
+
+        self._id_to_data[id] = new_data
+        self._id_to_type[id] = scls
+        _index_add(indexes.type_to_ids, type(scls), id)
+        self._update_refs_to(scls, None, fields)
+        self._note_changed(scls, new_data)
+
+        if (not isinstance(scls, so.UnqualifiedObject)
+                and not self._has_module(name.module)):
+            raise errors.UnknownModuleError(
+                f'module {name.module!r} is not in this schema')
+
+    def _delete(self, obj: so.Object) -> None:
+        data = self._id_to_data.get(obj.id)
+        if data is None:
+            raise errors.InvalidReferenceError(
+                f'cannot delete {obj!r}: not in this schema')
+
+        name = _data_get(data, 'name')
+        indexes = self._get_indexes()
+
+        self._update_obj_name(obj.id, self._id_to_type[obj.id], name, None)
+        self._update_refs_to(obj, _data_to_dict(data), None)
+
+        del self._id_to_data[obj.id]
+        del self._id_to_type[obj.id]
+        _index_discard(indexes.type_to_ids, type(obj), obj.id)
+        self._note_changed(obj, data)
+
+    def _note_changed(
+        self,
+        scls: so.Object,
+        data: ObjectData,
+    ) -> None:
+        if _is_derived_type(scls, data):
+            self._changed_derived.add(type(scls))
+        else:
+            self._changed.add(type(scls))
+
+
+class _IndexMutations(NamedTuple):
+
+    name_to_id: immu.MapMutation[str, uuid.UUID]
+    shortname_to_id: immu.MapMutation[
+        Tuple[Type[so.Object], str],
+        FrozenSet[uuid.UUID],
+    ]
+    globalname_to_id: immu.MapMutation[
+        Tuple[Type[so.Object], str],
+        uuid.UUID,
+    ]
+    type_to_ids: immu.MapMutation[
+        Type[so.Object],
+        immu.Map[uuid.UUID, None],
+    ]
+    module_to_ids: immu.MapMutation[str, immu.Map[uuid.UUID, None]]
+
+
 class SchemaIterator(Generic[so.Object_T]):
     def __init__(
         self,
@@ -934,39 +1193,266 @@ class SchemaIterator(Generic[so.Object_T]):
 
         self._filters = filters
         self._schema = schema
+        self._type = type
+        self._modules = frozenset(included_modules or ())
+
+    def _get_candidate_ids(self) -> Iterable[uuid.UUID]:
+        # Pick the smallest superset of the result available from
+        # the secondary indexes of the schema, falling back to
+        # the full scan.
+        schema = self._schema
+        candidates: Optional[List[immu.Map[uuid.UUID, None]]] = None
+        size = len(schema._id_to_type)
+
+        if self._type is not None:
+            by_type = [
+                ids for t, ids in schema._type_to_ids.items()
+                if issubclass(t, self._type)
+            ]
+            by_type_size = sum(len(ids) for ids in by_type)
+            if by_type_size < size:
+                candidates = by_type
+                size = by_type_size
+
+        if self._modules:
+            by_module = [
+                schema._module_to_ids[m] for m in self._modules
+                if m in schema._module_to_ids
+            ]
+            by_module_size = sum(len(ids) for ids in by_module)
+            if by_module_size < size:
+                candidates = by_module
+                size = by_module_size
+
+        if candidates is None:
+            return schema._id_to_type.keys()
+        else:
+            return itertools.chain.from_iterable(candidates)
 
     def __iter__(self) -> Iterator[so.Object_T]:
         filters = self._filters
         index = self._schema._id_to_type
 
-        for obj in index.values():
+        for obj_id in self._get_candidate_ids():
+            obj = index[obj_id]
             if all(f(self._schema, obj) for f in filters):
                 yield obj  # type: ignore
 
 
-@functools.lru_cache()
+# Keys of the reference map entries, shared by all schemas
+# (see SchemaMutation._update_refs_to()).
+_ref_keys: Dict[Tuple[Type[so.Object], str], Tuple[Type[so.Object], str]] = {}
+
+
+# The most referrers of an object to keep in a tuple rather than in
+# a map.  Most objects are only referred to by a few others, and
+# a tuple is several times smaller than a map.
+_MAX_REF_TUPLE = 8
+
+
+def _add_ref(
+    field_refs: Optional[RefIds_T],
+    obj_id: uuid.UUID,
+) -> RefIds_T:
+    if field_refs is None:
+        return (obj_id,)
+    elif isinstance(field_refs, tuple):
+        if obj_id in field_refs:
+            return field_refs
+        elif len(field_refs) < _MAX_REF_TUPLE:
+            return field_refs + (obj_id,)
+        else:
+            return immu.Map(
+                (ref_id, None) for ref_id in field_refs + (obj_id,))
+    else:
+        return field_refs.set(obj_id, None)
+
+
+def _discard_ref(
+    field_refs: RefIds_T,
+    obj_id: uuid.UUID,
+) -> Optional[RefIds_T]:
+    result: RefIds_T
+    if isinstance(field_refs, tuple):
+        result = tuple(ref_id for ref_id in field_refs if ref_id != obj_id)
+    else:
+        result = field_refs.delete(obj_id)
+    return result if result else None
+
+
+def _intern_value(value: Any) -> Any:
+    if isinstance(value, so.ObjectCollection):
+        return value.intern()
+    else:
+        return value
+
+
+def _is_derived_type(scls: so.Object, data: ObjectData) -> bool:
+    # Derived types are the ones made for the views of a query and
+    # the collection types.  Their bases never change once they are
+    # created, unlike those of the persistent aliases.
+    if isinstance(scls, s_types.SchemaCollection):
+        return True
+    elif isinstance(scls, s_types.Type):
+        return bool(_data_get(data, 'is_derived')) or (
+            _data_get(data, 'expr_type') is not None
+            and not _data_get(data, 'alias_is_persistent')
+        )
+    else:
+        return False
+
+
+class _Layout(dict):
+    """The names of the fields of object data.
+
+    The data of an object is a tuple of its layout followed by the
+    values of its fields, and the layout maps every field name to the
+    position of its value in the tuple.  Objects of the same class
+    mostly have the same fields, so layouts are interned and shared
+    by all objects with the same fields, and a tuple of values takes
+    a lot less memory than a map per object.
+    """
+
+    __slots__ = ('fields', '_added', '_removed')
+
+    def __init__(self, fields: Tuple[str, ...]) -> None:
+        super().__init__((field, i) for i, field in enumerate(fields, 1))
+        self.fields = fields
+        self._added: Dict[str, _Layout] = {}
+        self._removed: Dict[str, _Layout] = {}
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (_get_layout, (self.fields,))
+
+    def add(self, field: str) -> _Layout:
+        try:
+            return self._added[field]
+        except KeyError:
+            layout = _get_layout(self.fields + (field,))
+            self._added[field] = layout
+            return layout
+
+    def remove(self, field: str) -> _Layout:
+        try:
+            return self._removed[field]
+        except KeyError:
+            layout = _get_layout(
+                tuple(fn for fn in self.fields if fn != field))
+            self._removed[field] = layout
+            return layout
+
+
+# A tuple of a _Layout followed by the field values.
+ObjectData = Tuple[Any, ...]
+
+_layouts: Dict[Tuple[str, ...], _Layout] = {}
+
+
+def _get_layout(fields: Tuple[str, ...]) -> _Layout:
+    try:
+        return _layouts[fields]
+    except KeyError:
+        layout = _layouts[fields] = _Layout(fields)
+        return layout
+
+
+_EMPTY_DATA: ObjectData = (_get_layout(()),)
+
+
+def _make_data(fields: Mapping[str, Any]) -> ObjectData:
+    return (_get_layout(tuple(fields)),) + tuple(fields.values())
+
+
+def _data_to_dict(data: ObjectData) -> Dict[str, Any]:
+    return dict(zip(data[0].fields, data[1:]))
+
+
+def _data_get(data: ObjectData, field: str) -> Any:
+    i = data[0].get(field)
+    return data[i] if i is not None else None
+
+
+def _data_set(data: ObjectData, field: str, value: Any) -> ObjectData:
+    layout = data[0]
+    i = layout.get(field)
+    if i is None:
+        return (layout.add(field),) + data[1:] + (value,)
+    else:
+        return data[:i] + (value,) + data[i + 1:]
+
+
+def _data_delete(data: ObjectData, field: str) -> ObjectData:
+    layout = data[0]
+    i = layout[field]
+    return (layout.remove(field),) + data[1:i] + data[i + 1:]
+
+
+def _index_add(
+    index: immu.MapMutation[Any, immu.Map[uuid.UUID, None]],
+    key: Any,
+    obj_id: uuid.UUID,
+) -> None:
+    try:
+        ids = index[key]
+    except KeyError:
+        index[key] = immu.Map(((obj_id, None),))
+    else:
+        index[key] = ids.set(obj_id, None)
+
+
+def _index_discard(
+    index: immu.MapMutation[Any, immu.Map[uuid.UUID, None]],
+    key: Any,
+    obj_id: uuid.UUID,
+) -> None:
+    ids = index[key].delete(obj_id)
+    if ids:
+        index[key] = ids
+    else:
+        del index[key]
+
+
 def _get_functions(
     schema: Schema,
     name: str,
 ) -> Optional[Tuple[s_func.Function, ...]]:
+    cache = schema._caches.get(_FUNCTIONS_CACHE)
+    try:
+        return cast(Optional[Tuple[s_func.Function, ...]], cache[name])
+    except KeyError:
+        pass
+
     objids = schema._shortname_to_id.get((s_func.Function, name))
     if objids is None:
-        return None
-    return cast(
-        Tuple[s_func.Function, ...],
-        tuple(schema._id_to_type[oid] for oid in objids),
-    )
+        result = None
+    else:
+        result = cast(
+            Tuple[s_func.Function, ...],
+            tuple(schema._id_to_type[oid] for oid in objids),
+        )
+
+    cache[name] = result
+    return result
 
 
-@functools.lru_cache()
 def _get_operators(
     schema: Schema,
     name: str,
 ) -> Optional[Tuple[s_oper.Operator, ...]]:
+    cache = schema._caches.get(_OPERATORS_CACHE)
+    try:
+        return cast(Optional[Tuple[s_oper.Operator, ...]], cache[name])
+    except KeyError:
+        pass
+
     objids = schema._shortname_to_id.get((s_oper.Operator, name))
     if objids is None:
-        return
-    return cast(
-        Tuple[s_oper.Operator, ...],
-        tuple(schema._id_to_type[oid] for oid in objids),
-    )
+        result = None
+    else:
+        result = cast(
+            Tuple[s_oper.Operator, ...],
+            tuple(schema._id_to_type[oid] for oid in objids),
+        )
+
+    cache[name] = result
+    return result
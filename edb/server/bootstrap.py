@@ -381,9 +381,11 @@ async def _init_stdlib(cluster, conn, testmode):
         typemap = await conn.fetch('''
             SELECT id, backend_id FROM edgedb.type WHERE id = any($1::uuid[])
         ''', new_types)
+        mutation = schema.mutate()
         for tid, backend_tid in typemap:
             t = schema.get_by_id(tid)
-            schema = t.set_field_value(schema, 'backend_id', backend_tid)
+            mutation.set_field_value(t, 'backend_id', backend_tid)
+        schema = mutation.finish()
 
     if not cache_hit and in_dev_mode:
         devmode.write_dev_mode_cache(schema, src_hash, schema_cache)
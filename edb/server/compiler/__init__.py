@@ -23,13 +23,14 @@ from .compiler import Compiler, BaseCompiler, CompilerDatabaseState
 from .compiler import compile_edgeql_script, compile_bootstrap_script
 from .compiler import load_std_schema
 from .dbstate import QueryUnit
+from .stats import CompileStats, CompileStatsHistograms
 from .enums import Capability, CompileStatementMode, ResultCardinality
 from .enums import IoFormat
 
 
 __all__ = (
     'Compiler', 'BaseCompiler', 'CompilerDatabaseState',
-    'QueryUnit',
+    'QueryUnit', 'CompileStats', 'CompileStatsHistograms',
     'Capability', 'CompileStatementMode', 'ResultCardinality', 'IoFormat',
     'compile_edgeql_script',
     'compile_bootstrap_script',
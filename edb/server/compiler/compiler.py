@@ -21,6 +21,7 @@ from __future__ import annotations
 from typing import *
 
 import collections
+import copy
 import dataclasses
 import hashlib
 import pickle
@@ -37,12 +38,14 @@ from edb.pgsql import intromech
 
 from edb import edgeql
 from edb.common import debug
+from edb.common import lru
 from edb.common import uuidgen
 
 from edb.edgeql import ast as qlast
 from edb.edgeql import compiler as ql_compiler
 from edb.edgeql import qltypes
 
+from edb.ir import ast as irast
 from edb.ir import staeval as ireval
 
 from edb.schema import database as s_db
@@ -70,6 +73,7 @@ from . import dbstate
 from . import enums
 from . import errormech
 from . import sertypes
+from . import stats
 from . import status
 
 
@@ -90,6 +94,22 @@ class CompileContext:
     json_parameters: bool = False
     implicit_limit: int = 0
     schema_object_ids: Optional[Mapping[str, uuid.UUID]] = None
+    stats: stats.CompileStats = dataclasses.field(
+        default_factory=stats.CompileStats)
+    # The source text of the statement being compiled and its position
+    # in the block, set when the statement IR can be cached.
+    source: Optional[Tuple[str, int]] = None
+
+
+@dataclasses.dataclass(frozen=True)
+class IRCacheVariant:
+
+    schema: s_schema.Schema
+    ir: irast.Statement
+    # The values of the implicit settings the IR was compiled with,
+    # None if the IR does not depend on the setting.
+    implicit_fields: Optional[bool]
+    implicit_limit: Optional[int]
 
 
 EMPTY_MAP = immutables.Map()
@@ -279,6 +299,39 @@ class Compiler(BaseCompiler):
 
         self._current_db_state = None
         self._bootstrap_mode = False
+        self._parse_cache = lru.LRUMapping(
+            maxsize=defines._MAX_PARSED_QUERIES_CACHE)
+        self._ir_cache = lru.LRUMapping(
+            maxsize=defines._MAX_QUERY_IR_CACHE)
+        self._ir_cache_dbver = None
+
+    def _parse_block(
+            self, eql: str, *, copy_ast: bool=True) -> List[qlast.Base]:
+        # Clients routinely send the same text more than once:
+        # a "ROLLBACK" probe via try_compile_rollback() followed by
+        # the actual compilation, re-preparations after a schema
+        # change, etc.  Syntax errors are not cached.
+        #
+        # The compiler is free to mutate the AST it is given
+        # (including the parser contexts), so a tree handed out for
+        # compilation cannot be cached as is.  Copying a tree costs
+        # about as much as parsing it again, so the text is only
+        # remembered the first time it is seen, and a pristine tree
+        # is kept once it comes back.
+        try:
+            statements = self._parse_cache[eql]
+        except KeyError:
+            statements = edgeql.parse_block(eql)
+            self._parse_cache[eql] = None if copy_ast else statements
+            return statements
+
+        if statements is None:
+            statements = self._parse_cache[eql] = edgeql.parse_block(eql)
+
+        if copy_ast:
+            statements = copy.deepcopy(statements)
+
+        return statements
 
     def _in_testmode(self, ctx: CompileContext):
         current_tx = ctx.state.current_tx()
@@ -290,10 +343,22 @@ class Compiler(BaseCompiler):
             session_config,
             allow_unrecognized=True)
 
+    def _use_concurrent_index_builds(self, ctx: CompileContext):
+        current_tx = ctx.state.current_tx()
+        session_config = current_tx.get_session_config()
+
+        return config.lookup(
+            config.get_settings(),
+            'concurrent_index_builds',
+            session_config,
+            allow_unrecognized=True)
+
     def _new_delta_context(self, ctx: CompileContext):
         context = s_delta.CommandContext()
         context.testmode = self._in_testmode(ctx)
         context.stdmode = self._bootstrap_mode
+        context.concurrent_index_builds = (
+            self._use_concurrent_index_builds(ctx))
         context.schema_object_ids = ctx.schema_object_ids
         return context
 
@@ -342,16 +407,49 @@ class Compiler(BaseCompiler):
         # commands indicates that session mode is available
         session_mode = ctx.state.capability & (enums.Capability.TRANSACTION |
                                                enums.Capability.SESSION)
-        ir = ql_compiler.compile_ast_to_ir(
-            ql,
-            schema=current_tx.get_schema(),
-            modaliases=current_tx.get_modaliases(),
-            implicit_tid_in_shapes=implicit_fields,
-            implicit_id_in_shapes=implicit_fields,
-            disable_constant_folding=disable_constant_folding,
-            json_parameters=ctx.json_parameters,
-            implicit_limit=ctx.implicit_limit,
-            session_mode=session_mode)
+        schema = current_tx.get_schema()
+        modaliases = current_tx.get_modaliases()
+
+        # The IR does not depend on the output format, so the same
+        # query fetched in different formats or with a different
+        # expected cardinality is compiled to IR only once.
+        ir_key = None
+        if ctx.source is not None:
+            if self._ir_cache_dbver != ctx.state.dbver:
+                # Entries compiled for an older version of the database
+                # would keep its schema alive.
+                self._ir_cache.clear()
+                self._ir_cache_dbver = ctx.state.dbver
+
+            ir_key = (
+                ctx.source,
+                modaliases,
+                bool(disable_constant_folding),
+                ctx.json_parameters,
+                bool(session_mode),
+            )
+
+        ir = None
+        if ir_key is not None:
+            ir = self._lookup_ir(
+                ir_key, schema, implicit_fields, ctx.implicit_limit)
+
+        if ir is None:
+            with ctx.stats.measure(stats.PHASE_QL_COMPILE):
+                ir = ql_compiler.compile_ast_to_ir(
+                    ql,
+                    schema=schema,
+                    modaliases=modaliases,
+                    implicit_tid_in_shapes=implicit_fields,
+                    implicit_id_in_shapes=implicit_fields,
+                    disable_constant_folding=disable_constant_folding,
+                    json_parameters=ctx.json_parameters,
+                    implicit_limit=ctx.implicit_limit,
+                    session_mode=session_mode)
+
+            if ir_key is not None:
+                self._store_ir(
+                    ir_key, schema, ir, implicit_fields, ctx.implicit_limit)
 
         if ir.cardinality is qltypes.Cardinality.ONE:
             result_cardinality = enums.ResultCardinality.ONE
@@ -362,88 +460,19 @@ class Compiler(BaseCompiler):
                     f'the query has cardinality {result_cardinality} '
                     f'which does not match the expected cardinality ONE')
 
-        sql_text, argmap = pg_compiler.compile_ir_to_sql(
-            ir,
-            pretty=debug.flags.edgeql_compile,
-            expected_cardinality_one=ctx.expected_cardinality_one,
-            output_format=ctx.output_format)
+        with ctx.stats.measure(stats.PHASE_PG_COMPILE):
+            sql_text, argmap = pg_compiler.compile_ir_to_sql(
+                ir,
+                pretty=debug.flags.edgeql_compile,
+                expected_cardinality_one=ctx.expected_cardinality_one,
+                output_format=ctx.output_format)
 
         sql_bytes = sql_text.encode(defines.EDGEDB_ENCODING)
 
         if single_stmt_mode:
-            if native_out_format:
-                out_type_data, out_type_id = sertypes.TypeSerializer.describe(
-                    ir.schema, ir.stype,
-                    ir.view_shapes, ir.view_shapes_metadata)
-            else:
-                out_type_data, out_type_id = \
-                    sertypes.TypeSerializer.describe_json()
-
-            in_array_backend_tids: Optional[
-                Mapping[int, int]
-            ] = None
-
-            if ir.params:
-                array_params = []
-                subtypes = [None] * len(ir.params)
-                first_param_name = next(iter(ir.params))
-                if first_param_name.isdecimal():
-                    named = False
-                    for param_name, param_type in ir.params.items():
-                        idx = int(param_name)
-                        subtypes[idx] = (param_name, param_type)
-                        if param_type.is_array():
-                            el_type = param_type.get_element_type(ir.schema)
-                            array_params.append(
-                                (idx, el_type.get_backend_id(ir.schema)))
-                else:
-                    named = True
-                    for param_name, param_type in ir.params.items():
-                        idx = argmap[param_name] - 1
-                        subtypes[idx] = (
-                            param_name, param_type
-                        )
-                        if param_type.is_array():
-                            el_type = param_type.get_element_type(ir.schema)
-                            array_params.append(
-                                (idx, el_type.get_backend_id(ir.schema)))
-
-                params_type = s_types.Tuple.create(
-                    ir.schema,
-                    element_types=collections.OrderedDict(subtypes),
-                    named=named)
-                if array_params:
-                    in_array_backend_tids = {p[0]: p[1] for p in array_params}
-            else:
-                params_type = s_types.Tuple.create(
-                    ir.schema, element_types={}, named=False)
-
-            in_type_data, in_type_id = sertypes.TypeSerializer.describe(
-                ir.schema, params_type, {}, {})
-
-            in_type_args = None
-            if ctx.json_parameters:
-                in_type_args = [None] * len(argmap)
-                for argname, argpos in argmap.items():
-                    in_type_args[argpos - 1] = argname
-
-            sql_hash = self._hash_sql(
-                sql_bytes,
-                mode=str(ctx.output_format).encode(),
-                intype=in_type_id.bytes,
-                outtype=out_type_id.bytes)
-
-            return dbstate.Query(
-                sql=(sql_bytes,),
-                sql_hash=sql_hash,
-                cardinality=result_cardinality,
-                in_type_id=in_type_id.bytes,
-                in_type_data=in_type_data,
-                in_type_args=in_type_args,
-                in_array_backend_tids=in_array_backend_tids,
-                out_type_id=out_type_id.bytes,
-                out_type_data=out_type_data,
-            )
+            with ctx.stats.measure(stats.PHASE_DESCRIBE):
+                return self._describe_ql_query(
+                    ctx, ir, argmap, sql_bytes, result_cardinality)
 
         else:
             if ir.params:
@@ -452,6 +481,125 @@ class Compiler(BaseCompiler):
 
             return dbstate.SimpleQuery(sql=(sql_bytes,))
 
+    def _lookup_ir(self, ir_key, schema, implicit_fields, implicit_limit):
+        for variant in self._ir_cache.get(ir_key, ()):
+            # The schema may change within a transaction without
+            # a change of dbver.
+            if variant.schema is not schema:
+                continue
+            if (variant.implicit_fields is not None
+                    and variant.implicit_fields != implicit_fields):
+                continue
+            if (variant.implicit_limit is not None
+                    and variant.implicit_limit != implicit_limit):
+                continue
+            return variant.ir
+
+        return None
+
+    def _store_ir(self, ir_key, schema, ir, implicit_fields, implicit_limit):
+        # The implicit shape fields and the implicit LIMIT are only
+        # a part of the variant if they have affected the IR, or if
+        # they were off (then it is unknown whether they would).
+        if implicit_fields and not ir.implicit_fields_used:
+            implicit_fields = None
+        if implicit_limit and not ir.implicit_limit_used:
+            implicit_limit = None
+
+        variants = [
+            v for v in self._ir_cache.get(ir_key, ())
+            if v.schema is schema
+        ]
+        variants.append(IRCacheVariant(
+            schema=schema,
+            ir=ir,
+            implicit_fields=implicit_fields,
+            implicit_limit=implicit_limit,
+        ))
+        self._ir_cache[ir_key] = variants
+
+    def _describe_ql_query(
+            self, ctx: CompileContext, ir, argmap, sql_bytes: bytes,
+            result_cardinality: enums.ResultCardinality) -> dbstate.Query:
+
+        native_out_format = (
+            ctx.output_format is pg_compiler.OutputFormat.NATIVE
+        )
+
+        if native_out_format:
+            out_type_data, out_type_id = sertypes.TypeSerializer.describe(
+                ir.schema, ir.stype,
+                ir.view_shapes, ir.view_shapes_metadata)
+        else:
+            out_type_data, out_type_id = \
+                sertypes.TypeSerializer.describe_json()
+
+        in_array_backend_tids: Optional[
+            Mapping[int, int]
+        ] = None
+
+        if ir.params:
+            array_params = []
+            subtypes = [None] * len(ir.params)
+            first_param_name = next(iter(ir.params))
+            if first_param_name.isdecimal():
+                named = False
+                for param_name, param_type in ir.params.items():
+                    idx = int(param_name)
+                    subtypes[idx] = (param_name, param_type)
+                    if param_type.is_array():
+                        el_type = param_type.get_element_type(ir.schema)
+                        array_params.append(
+                            (idx, el_type.get_backend_id(ir.schema)))
+            else:
+                named = True
+                for param_name, param_type in ir.params.items():
+                    idx = argmap[param_name] - 1
+                    subtypes[idx] = (
+                        param_name, param_type
+                    )
+                    if param_type.is_array():
+                        el_type = param_type.get_element_type(ir.schema)
+                        array_params.append(
+                            (idx, el_type.get_backend_id(ir.schema)))
+
+            params_type = s_types.Tuple.create(
+                ir.schema,
+                element_types=collections.OrderedDict(subtypes),
+                named=named)
+            if array_params:
+                in_array_backend_tids = {p[0]: p[1] for p in array_params}
+        else:
+            params_type = s_types.Tuple.create(
+                ir.schema, element_types={}, named=False)
+
+        in_type_data, in_type_id = sertypes.TypeSerializer.describe(
+            ir.schema, params_type, {}, {})
+
+        in_type_args = None
+        if ctx.json_parameters:
+            in_type_args = [None] * len(argmap)
+            for argname, argpos in argmap.items():
+                in_type_args[argpos - 1] = argname
+
+        sql_hash = self._hash_sql(
+            sql_bytes,
+            mode=str(ctx.output_format).encode(),
+            intype=in_type_id.bytes,
+            outtype=out_type_id.bytes)
+
+        return dbstate.Query(
+            sql=(sql_bytes,),
+            sql_hash=sql_hash,
+            cardinality=result_cardinality,
+            in_type_id=in_type_id.bytes,
+            in_type_data=in_type_data,
+            in_type_args=in_type_args,
+            in_array_backend_tids=in_array_backend_tids,
+            out_type_id=out_type_id.bytes,
+            out_type_data=out_type_data,
+        )
+
     def _compile_and_apply_migration_command(
             self, ctx: CompileContext, cmd) -> dbstate.BaseQuery:
 
@@ -532,6 +680,28 @@ class Compiler(BaseCompiler):
         else:
             sql = (block.to_string().encode('utf-8'),)
 
+        cleanup_sql = ()
+        has_online_ops = (
+            isinstance(plan, pg_delta.DeltaRoot) and bool(plan.online_ops))
+        if has_online_ops:
+            # Some of the work must be done outside of the DDL
+            # transaction and before it, e.g. concurrent index builds,
+            # and must be undone if the DDL transaction fails.
+            online_block = pg_dbops.SQLBlock()
+            for op in plan.online_ops:
+                op.generate(online_block)
+            sql = tuple(
+                stmt.encode('utf-8')
+                for stmt in online_block.get_statements()) + sql
+            is_transactional = False
+
+            cleanup_block = pg_dbops.SQLBlock()
+            for op in plan.online_cleanup_ops:
+                op.generate(cleanup_block)
+            cleanup_sql = tuple(
+                stmt.encode('utf-8')
+                for stmt in cleanup_block.get_statements())
+
         current_tx.update_schema(schema)
 
         if debug.flags.delta_execute:
@@ -543,6 +713,8 @@ class Compiler(BaseCompiler):
             is_transactional=is_transactional,
             single_unit=not is_transactional,
             new_types=new_types,
+            cleanup_sql=cleanup_sql,
+            has_online_ops=has_online_ops,
         )
 
     def _compile_command(
@@ -867,13 +1039,15 @@ class Compiler(BaseCompiler):
             if not (ctx.state.capability & enums.Capability.DDL):
                 raise errors.ProtocolError(
                     f'cannot execute DDL commands for the current connection')
-            return self._compile_ql_migration(ctx, ql)
+            with ctx.stats.measure(stats.PHASE_DDL):
+                return self._compile_ql_migration(ctx, ql)
 
         elif isinstance(ql, qlast.DDL):
             if not (ctx.state.capability & enums.Capability.DDL):
                 raise errors.ProtocolError(
                     f'cannot execute DDL commands for the current connection')
-            return self._compile_ql_ddl(ctx, ql)
+            with ctx.stats.measure(stats.PHASE_DDL):
+                return self._compile_ql_ddl(ctx, ql)
 
         elif isinstance(ql, qlast.Transaction):
             if not (ctx.state.capability & enums.Capability.TRANSACTION):
@@ -915,7 +1089,9 @@ class Compiler(BaseCompiler):
 
         eql = eql.decode()
 
-        statements = edgeql.parse_block(eql)
+        parse_stats = stats.CompileStats()
+        with parse_stats.measure(stats.PHASE_PARSE):
+            statements = self._parse_block(eql)
         statements_len = len(statements)
 
         if ctx.stmt_mode is enums.CompileStatementMode.SKIP_FIRST:
@@ -936,8 +1112,12 @@ class Compiler(BaseCompiler):
         units = []
         unit = None
 
-        for stmt in statements:
-            comp: dbstate.BaseQuery = self._compile_dispatch_ql(ctx, stmt)
+        first = statements_len - len(statements)
+        for i, stmt in enumerate(statements, first):
+            stmt_ctx = dataclasses.replace(
+                ctx, stats=stats.CompileStats(), source=(eql, i))
+            comp: dbstate.BaseQuery = self._compile_dispatch_ql(
+                stmt_ctx, stmt)
 
             if unit is not None:
                 if comp.single_unit:
@@ -953,6 +1133,8 @@ class Compiler(BaseCompiler):
             else:
                 unit.status = status.get_status(stmt)
 
+            unit.compile_stats.merge(stmt_ctx.stats)
+
             if not comp.is_transactional:
                 if not comp.single_unit:
                     raise errors.InternalServerError(
@@ -985,9 +1167,29 @@ class Compiler(BaseCompiler):
                 unit.sql += comp.sql
 
             elif isinstance(comp, dbstate.DDLQuery):
+                if comp.has_online_ops:
+                    # The concurrent builds run outside of any
+                    # transaction, so the command cannot be a part
+                    # of a larger atomic unit.
+                    if not ctx.state.current_tx().is_implicit():
+                        raise errors.QueryError(
+                            'concurrent index builds cannot be executed '
+                            'in a transaction block',
+                            hint='reset the concurrent_index_builds '
+                                 'setting to build the index in the '
+                                 'transaction')
+                    elif statements_len > 1:
+                        raise errors.QueryError(
+                            'concurrent index builds cannot be executed '
+                            'in a multi-statement script',
+                            hint='execute the DDL command on its own, or '
+                                 'reset the concurrent_index_builds '
+                                 'setting')
+
                 unit.sql += comp.sql
                 unit.has_ddl = True
                 unit.new_types = comp.new_types
+                unit.cleanup_sql += comp.cleanup_sql
 
             elif isinstance(comp, dbstate.TxControlQuery):
                 unit.sql += comp.sql
@@ -1048,6 +1250,10 @@ class Compiler(BaseCompiler):
                 raise errors.InternalServerError(
                     f'expected 1 compiled unit; got {len(units)}')
 
+        # The source is parsed as a whole, attribute the parsing
+        # to the first unit.
+        units[0].compile_stats.merge(parse_stats)
+
         for unit in units:  # pragma: no cover
             # Sanity checks
             na_cardinality = (
@@ -1160,7 +1366,9 @@ class Compiler(BaseCompiler):
     # API
 
     async def try_compile_rollback(self, dbver: bytes, eql: bytes):
-        statements = edgeql.parse_block(eql.decode())
+        # The statements are only inspected here, so there is
+        # no need to copy them.
+        statements = self._parse_block(eql.decode(), copy_ast=False)
 
         stmt = statements[0]
         unit = None
@@ -1247,10 +1455,11 @@ class Compiler(BaseCompiler):
         state = self._load_state(txid)
         tx = state.current_tx()
         schema = tx.get_schema()
+        mutation = schema.mutate()
         for tid, backend_tid in typemap.items():
             t = schema.get_by_id(uuidgen.UUID(tid))
-            schema = t.set_field_value(schema, 'backend_id', backend_tid)
-        state.current_tx().update_schema(schema)
+            mutation.set_field_value(t, 'backend_id', backend_tid)
+        state.current_tx().update_schema(mutation.finish())
 
     async def _introspect_schema_in_snapshot(
         self,
@@ -33,6 +33,7 @@ from edb.server import config
 
 from . import enums
 from . import sertypes
+from . import stats
 
 
 class TxAction(enum.IntEnum):
@@ -97,6 +98,10 @@ class SessionStateQuery(BaseQuery):
 class DDLQuery(BaseQuery):
 
     new_types: FrozenSet[str] = frozenset()
+    cleanup_sql: Tuple[bytes, ...] = ()
+    # True if some of *sql* must run outside of a transaction
+    # and ahead of the rest, e.g. concurrent index builds.
+    has_online_ops: bool = False
     is_transactional: bool = True
     single_unit: bool = False
 
@@ -142,6 +147,10 @@ class QueryUnit:
     # A set of ids of types added by this unit.
     new_types: FrozenSet[str] = frozenset()
 
+    # SQL undoing the effects of the non-transactional statements
+    # in *sql*, to be executed if the unit fails.
+    cleanup_sql: Tuple[bytes, ...] = ()
+
     # True if this unit contains SET commands.
     has_set: bool = False
 
@@ -193,6 +202,11 @@ class QueryUnit:
         dataclasses.field(default_factory=list))
     modaliases: Optional[immutables.Map] = None
 
+    # Per-phase timings and allocations of the compilation
+    # of this unit.
+    compile_stats: stats.CompileStats = (
+        dataclasses.field(default_factory=stats.CompileStats))
+
 
 #############################
 
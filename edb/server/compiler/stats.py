@@ -0,0 +1,134 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from __future__ import annotations
+from typing import *
+
+import contextlib
+import dataclasses
+import sys
+import time
+
+
+# Compilation phases, in the order they happen.
+PHASE_PARSE = 'parse'
+PHASE_QL_COMPILE = 'ql_compile'
+PHASE_PG_COMPILE = 'pg_compile'
+PHASE_DESCRIBE = 'describe'
+PHASE_DDL = 'ddl'
+
+PHASES = (
+    PHASE_PARSE,
+    PHASE_QL_COMPILE,
+    PHASE_PG_COMPILE,
+    PHASE_DESCRIBE,
+    PHASE_DDL,
+)
+
+
+@dataclasses.dataclass
+class CompileStats:
+    """Per-phase compilation statistics of a QueryUnit."""
+
+    # Wall-clock time spent in each phase, in seconds.
+    timings: Dict[str, float] = dataclasses.field(default_factory=dict)
+
+    # The net number of memory blocks allocated by each phase
+    # (see sys.getallocatedblocks()).
+    allocations: Dict[str, int] = dataclasses.field(default_factory=dict)
+
+    @contextlib.contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        blocks = sys.getallocatedblocks()
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started_at
+            allocated = sys.getallocatedblocks() - blocks
+            self.timings[phase] = self.timings.get(phase, 0.0) + elapsed
+            self.allocations[phase] = (
+                self.allocations.get(phase, 0) + allocated)
+
+    def merge(self, other: CompileStats) -> None:
+        for phase, elapsed in other.timings.items():
+            self.timings[phase] = self.timings.get(phase, 0.0) + elapsed
+        for phase, allocated in other.allocations.items():
+            self.allocations[phase] = (
+                self.allocations.get(phase, 0) + allocated)
+
+    def as_dict(self) -> Dict[str, Dict[str, Union[float, int]]]:
+        return {
+            phase: {
+                'time': self.timings[phase],
+                'allocations': self.allocations.get(phase, 0),
+            }
+            for phase in PHASES
+            if phase in self.timings
+        }
+
+
+class CompileStatsHistograms:
+    """Per-phase histograms of compilation times.
+
+    Bucket N counts the compilations for which the phase took less
+    than 2**N microseconds (and no less than 2**(N-1) microseconds).
+    The last bucket also counts all the slower compilations.
+    """
+
+    NUM_BUCKETS = 32
+
+    def __init__(self) -> None:
+        self._buckets: Dict[str, List[int]] = {}
+        self._totals: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+
+    def record(self, stats: CompileStats) -> None:
+        for phase, elapsed in stats.timings.items():
+            buckets = self._buckets.get(phase)
+            if buckets is None:
+                buckets = self._buckets[phase] = [0] * self.NUM_BUCKETS
+                self._totals[phase] = 0.0
+                self._counts[phase] = 0
+
+            bucket = min(int(elapsed * 1_000_000).bit_length(),
+                         self.NUM_BUCKETS - 1)
+            buckets[bucket] += 1
+            self._totals[phase] += elapsed
+            self._counts[phase] += 1
+
+    def get_buckets(self, phase: str) -> List[int]:
+        return list(self._buckets.get(phase, [0] * self.NUM_BUCKETS))
+
+    def get_total_time(self, phase: str) -> float:
+        return self._totals.get(phase, 0.0)
+
+    def get_count(self, phase: str) -> int:
+        return self._counts.get(phase, 0)
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            phase: {
+                'count': self._counts[phase],
+                'time': self._totals[phase],
+                'buckets': list(self._buckets[phase]),
+            }
+            for phase in PHASES
+            if phase in self._buckets
+        }
@@ -27,7 +27,7 @@ EDGEDB_ENCODING = 'utf-8'
 EDGEDB_VISIBLE_METADATA_PREFIX = r'EdgeDB metadata follows, do not modify.\n'
 
 # Increment this whenever the database layout or stdlib changes.
-EDGEDB_CATALOG_VERSION = 2020_02_15_00_00
+EDGEDB_CATALOG_VERSION = 2020_02_23_00_00
 
 # Resource limit on open FDs for the server process.
 # By default, at least on macOS, the max number of open FDs
@@ -38,6 +38,13 @@ EDGEDB_MIN_RLIMIT_NOFILE = 2048
 
 _MAX_QUERIES_CACHE = 1000
 
+# The number of parsed EdgeQL blocks kept by each compiler worker.
+_MAX_PARSED_QUERIES_CACHE = 1000
+
+# The number of compiled EdgeQL queries (IR) kept by each compiler
+# worker, shared by all output formats.
+_MAX_QUERY_IR_CACHE = 1000
+
 _QUERY_ROLLING_AVG_LEN = 10
 _QUERIES_ROLLING_AVG_LEN = 300
 
@@ -45,4 +52,8 @@ DEFAULT_MODULE_ALIAS = 'default'
 
 
 HTTP_PORT_QUERY_CACHE_SIZE = 500
+HTTP_PORT_PERSISTED_QUERY_CACHE_SIZE = 1000
+HTTP_PORT_QUERY_VARIANTS_CACHE_SIZE = 1000
+HTTP_PORT_GRAPHQL_MAX_QUERY_COST = 1_000_000
+HTTP_PORT_GRAPHQL_MAX_BATCH_SIZE = 100
 HTTP_PORT_MAX_CONCURRENCY = 250
@@ -48,6 +48,7 @@ class CompiledOperation:
     cacheable: bool
     cache_deps_vars: Dict
     variables: Dict
+    cost: int
 
 
 class Compiler(compiler.BaseCompiler):
@@ -64,7 +65,8 @@ class Compiler(compiler.BaseCompiler):
             dbver: int,
             gql: str,
             operation_name: str=None,
-            variables: Optional[Mapping[str, object]]=None):
+            variables: Optional[Mapping[str, object]]=None,
+            max_cost: Optional[int]=None):
 
         db = await self._get_database(dbver)
 
@@ -72,7 +74,8 @@ class Compiler(compiler.BaseCompiler):
             db.gqlcore,
             gql,
             variables=variables,
-            operation_name=operation_name)
+            operation_name=operation_name,
+            max_cost=max_cost)
 
         ir = ql_compiler.compile_ast_to_ir(
             op.edgeql_ast,
@@ -105,4 +108,5 @@ class Compiler(compiler.BaseCompiler):
             cacheable=op.cacheable,
             cache_deps_vars=op.cache_deps_vars,
             variables=op.variables_desc,
+            cost=op.cost,
         )
@@ -19,6 +19,8 @@
 
 from __future__ import annotations
 
+from edb.common import lru
+from edb.server import defines
 from edb.server import http
 
 from . import compiler
@@ -27,8 +29,25 @@ from . import protocol
 
 class HttpGraphQLPort(http.BaseHttpPort):
 
+    def __init__(self, *args,
+                 max_query_cost=defines.HTTP_PORT_GRAPHQL_MAX_QUERY_COST,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        # Operations with a greater estimated cost are rejected,
+        # None means no limit.
+        self.max_query_cost = max_query_cost
+        # Maps SHA-256 hashes of "persisted" (APQ) queries to their text.
+        self._persisted_queries = lru.LRUMapping(
+            maxsize=defines.HTTP_PORT_PERSISTED_QUERY_CACHE_SIZE)
+        # Operations whose compilation depends on the values of some
+        # variables, keyed on the values of those variables.
+        self._query_variants_cache = lru.LRUMapping(
+            maxsize=defines.HTTP_PORT_QUERY_VARIANTS_CACHE_SIZE)
+
     def build_protocol(self):
-        return protocol.Protocol(self._loop, self, self._query_cache)
+        return protocol.Protocol(
+            self._loop, self, self._query_cache, self._persisted_queries,
+            self._query_variants_cache)
 
     def get_compiler_worker_cls(self):
         return compiler.Compiler
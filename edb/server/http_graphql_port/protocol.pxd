@@ -25,3 +25,5 @@ cdef class Protocol(http.HttpProtocol):
     cdef:
         object server
         stmt_cache.StatementsCache query_cache
+        object persisted_queries
+        object query_variants_cache
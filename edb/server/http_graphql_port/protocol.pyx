@@ -17,11 +17,14 @@
 #
 
 
+import asyncio
+import hashlib
 import json
 import urllib.parse
 
 from edb import errors
 from edb.graphql import errors as gql_errors
+from edb.server import defines
 from edb.server.pgcon import errors as pgerrors
 
 from edb.common import debug
@@ -34,12 +37,19 @@ from . import explore
 from . import compiler
 
 
+class PersistedQueryNotFound(Exception):
+    pass
+
+
 cdef class Protocol(http.HttpProtocol):
 
-    def __init__(self, loop, server, query_cache):
+    def __init__(self, loop, server, query_cache, persisted_queries,
+                 query_variants_cache):
         http.HttpProtocol.__init__(self, loop)
         self.server = server
         self.query_cache = query_cache
+        self.persisted_queries = persisted_queries
+        self.query_variants_cache = query_variants_cache
 
     async def handle_request(self, http.HttpRequest request,
                              http.HttpResponse response):
@@ -58,18 +68,41 @@ cdef class Protocol(http.HttpProtocol):
 
         operation_name = None
         variables = None
+        extensions = None
         query = None
+        batch = None
+        consistent = False
+        report_cost = False
 
         try:
             if request.method == b'POST':
                 if request.content_type and b'json' in request.content_type:
                     body = json.loads(request.body)
-                    if not isinstance(body, dict):
+                    if isinstance(body, list):
+                        if not body:
+                            raise TypeError(
+                                'the batch of operations must not be empty')
+                        max_batch = defines.HTTP_PORT_GRAPHQL_MAX_BATCH_SIZE
+                        if len(body) > max_batch:
+                            raise TypeError(
+                                f'the batch of operations must not contain '
+                                f'more than {max_batch} operations')
+                        for item in body:
+                            if not isinstance(item, dict):
+                                raise TypeError(
+                                    'each operation in a batch must be '
+                                    'a JSON object')
+                        batch = body
+                        consistent = self.get_flag(request, 'consistent')
+                    elif not isinstance(body, dict):
                         raise TypeError(
-                            'the body of the request must be a JSON object')
-                    query = body.get('query')
-                    operation_name = body.get('operationName')
-                    variables = body.get('variables')
+                            'the body of the request must be a JSON object '
+                            'or a JSON array')
+                    else:
+                        query = body.get('query')
+                        operation_name = body.get('operationName')
+                        variables = body.get('variables')
+                        extensions = body.get('extensions')
                 elif request.content_type == 'application/graphql':
                     query = request.body.decode('utf-8')
                 else:
@@ -97,18 +130,28 @@ cdef class Protocol(http.HttpProtocol):
                             raise TypeError(
                                 '"variables" must be a JSON object')
 
+                    extensions = qs.get('extensions')
+                    if extensions is not None:
+                        try:
+                            extensions = json.loads(extensions[0])
+                        except Exception:
+                            raise TypeError(
+                                '"extensions" must be a JSON object')
+
             else:
                 raise TypeError('expected a GET or a POST request')
 
-            if not query:
-                raise TypeError('invalid GraphQL request: query is missing')
+            report_cost = self.get_flag(request, 'cost')
 
-            if (operation_name is not None and
-                    not isinstance(operation_name, str)):
-                raise TypeError('operationName must be a string')
+            if batch is None:
+                query, operation_name, variables = self.parse_operation(
+                    query, operation_name, variables, extensions)
 
-            if variables is not None and not isinstance(variables, dict):
-                raise TypeError('"variables" must be a JSON object')
+        except PersistedQueryNotFound as ex:
+            response.status = http.HTTPStatus.OK
+            response.content_type = b'application/json'
+            response.body = self.format_error_result(ex)
+            return
 
         except Exception as ex:
             if debug.flags.server:
@@ -121,30 +164,191 @@ cdef class Protocol(http.HttpProtocol):
 
         response.status = http.HTTPStatus.OK
         response.content_type = b'application/json'
+
+        if batch is not None:
+            if consistent:
+                results = await self.execute_batch_consistent(
+                    batch, report_cost)
+            else:
+                results = await asyncio.gather(
+                    *[self.execute_batch_item(item, report_cost)
+                      for item in batch])
+            response.body = b'[' + b','.join(results) + b']'
+            return
+
         try:
-            result = await self.execute(query, operation_name, variables)
+            response.body = await self.execute(
+                query, operation_name, variables, report_cost)
         except Exception as ex:
-            if debug.flags.server:
-                markup.dump(ex)
+            response.body = self.format_error_result(ex)
+
+    def get_flag(self, http.HttpRequest request, name):
+        if not request.url.query:
+            return False
+        qs = urllib.parse.parse_qs(
+            request.url.query.decode('ascii'), keep_blank_values=True)
+        value = qs.get(name)
+        if value is None:
+            return False
+        return value[0].lower() in ('', '1', 'true', 'on')
+
+    def parse_operation(self, query, operation_name, variables, extensions):
+        if extensions is not None:
+            if not isinstance(extensions, dict):
+                raise TypeError('"extensions" must be a JSON object')
+
+            persisted_query = extensions.get('persistedQuery')
+            if persisted_query is not None:
+                query = self.resolve_persisted_query(persisted_query, query)
+                if query is None:
+                    raise PersistedQueryNotFound()
+
+        if not query:
+            raise TypeError('invalid GraphQL request: query is missing')
+
+        if not isinstance(query, str):
+            raise TypeError('"query" must be a string')
+
+        if (operation_name is not None and
+                not isinstance(operation_name, str)):
+            raise TypeError('operationName must be a string')
+
+        if variables is not None and not isinstance(variables, dict):
+            raise TypeError('"variables" must be a JSON object')
+
+        return query, operation_name, variables
+
+    def format_error_result(self, ex):
+        if isinstance(ex, PersistedQueryNotFound):
+            # The client is expected to retry the request
+            # with the full query text to register it.
+            return json.dumps({'errors': [{
+                'message': 'PersistedQueryNotFound',
+                'extensions': {
+                    'code': 'PERSISTED_QUERY_NOT_FOUND',
+                },
+            }]}).encode()
+
+        if debug.flags.server:
+            markup.dump(ex)
+
+        ex_type = type(ex)
+        if issubclass(ex_type, (gql_errors.GraphQLError,
+                                pgerrors.BackendError)):
+            # XXX Fix this when LSP "location" objects are implemented
+            ex_type = errors.QueryError
+
+        err_dct = {
+            'message': f'{ex_type.__name__}: {ex}',
+        }
+
+        if (isinstance(ex, errors.EdgeDBError) and
+                hasattr(ex, 'line') and
+                hasattr(ex, 'col')):
+            err_dct['locations'] = [{'line': ex.line, 'column': ex.col}]
+
+        return json.dumps({'errors': [err_dct]}).encode()
+
+    async def execute_batch_item(self, item, report_cost):
+        try:
+            query, operation_name, variables = self.parse_operation(
+                item.get('query'),
+                item.get('operationName'),
+                item.get('variables'),
+                item.get('extensions'))
+            return await self.execute(
+                query, operation_name, variables, report_cost)
+        except Exception as ex:
+            return self.format_error_result(ex)
+
+    async def prepare_batch_item(self, item):
+        try:
+            query, operation_name, variables = self.parse_operation(
+                item.get('query'),
+                item.get('operationName'),
+                item.get('variables'),
+                item.get('extensions'))
+            return await self.prepare(query, operation_name, variables)
+        except Exception as ex:
+            return ex
+
+    async def execute_batch_consistent(self, batch, report_cost):
+        # Compile all operations concurrently, but execute them
+        # sequentially on a single connection within one read-only
+        # transaction, so that they all observe the same snapshot.
+        # Each operation runs under its own savepoint, so that a runtime
+        # error in one of them does not abort the rest of the batch.
+        prepared = await asyncio.gather(
+            *[self.prepare_batch_item(item) for item in batch])
+
+        results = []
+        pgcon = await self.server.pgcons.get()
+        try:
+            await pgcon.simple_query(
+                b'START TRANSACTION ISOLATION LEVEL REPEATABLE READ, '
+                b'READ ONLY;',
+                True)
+            try:
+                for item in prepared:
+                    if isinstance(item, Exception):
+                        results.append(self.format_error_result(item))
+                        continue
+
+                    op, use_prep_stmt, args = item
+                    await pgcon.simple_query(b'SAVEPOINT batch_item;', True)
+                    try:
+                        result = await self.execute_compiled(
+                            pgcon, op, use_prep_stmt, args, report_cost)
+                    except Exception as ex:
+                        await pgcon.simple_query(
+                            b'ROLLBACK TO SAVEPOINT batch_item;', True)
+                        results.append(self.format_error_result(ex))
+                    else:
+                        await pgcon.simple_query(
+                            b'RELEASE SAVEPOINT batch_item;', True)
+                        results.append(result)
+            finally:
+                await pgcon.simple_query(b'ROLLBACK;', True)
+        finally:
+            self.server.pgcons.put_nowait(pgcon)
 
-            ex_type = type(ex)
-            if issubclass(ex_type, (gql_errors.GraphQLError,
-                                    pgerrors.BackendError)):
-                # XXX Fix this when LSP "location" objects are implemented
-                ex_type = errors.QueryError
+        return results
 
-            err_dct = {
-                'message': f'{ex_type.__name__}: {ex}',
-            }
+    def resolve_persisted_query(self, persisted_query, query):
+        # Implements the "Automatic Persisted Queries" protocol:
+        # the client sends a SHA-256 hash of the query instead of
+        # its text, and if the hash is unknown to the server, re-sends
+        # the request with both the hash and the text to register it.
+        if not isinstance(persisted_query, dict):
+            raise TypeError('"persistedQuery" must be a JSON object')
 
-            if (isinstance(ex, errors.EdgeDBError) and
-                    hasattr(ex, 'line') and
-                    hasattr(ex, 'col')):
-                err_dct['locations'] = [{'line': ex.line, 'column': ex.col}]
+        if persisted_query.get('version') != 1:
+            raise TypeError('unsupported "persistedQuery" version')
 
-            response.body = json.dumps({'errors': [err_dct]}).encode()
-        else:
-            response.body = b'{"data":' + result + b'}'
+        query_hash = persisted_query.get('sha256Hash')
+        if not isinstance(query_hash, str):
+            raise TypeError('"sha256Hash" must be a string')
+        query_hash = query_hash.lower()
+
+        if query is None:
+            return self.persisted_queries.get(query_hash)
+
+        if not isinstance(query, str):
+            raise TypeError('"query" must be a string')
+
+        if hashlib.sha256(query.encode()).hexdigest() != query_hash:
+            raise TypeError('"sha256Hash" does not match the query')
+
+        self.persisted_queries[query_hash] = query
+        return query
+
+    def get_variant_key(self, op, variables):
+        if variables is None:
+            variables = {}
+        return tuple(
+            (name, json.dumps(variables.get(name), sort_keys=True))
+            for name in sorted(op.cache_deps_vars)
+        )
 
     async def compile(self, dbver, query, operation_name, variables):
         compiler = await self.server.compilers.get()
@@ -154,11 +358,12 @@ cdef class Protocol(http.HttpProtocol):
                 dbver,
                 query,
                 operation_name,
-                variables)
+                variables,
+                self.server.max_query_cost)
         finally:
             self.server.compilers.put_nowait(compiler)
 
-    async def execute(self, query, operation_name, variables):
+    async def prepare(self, query, operation_name, variables):
         dbver = self.server.get_dbver()
         cache_key = (query, operation_name, dbver)
         use_prep_stmt = False
@@ -170,14 +375,27 @@ cdef class Protocol(http.HttpProtocol):
             op = await self.compile(
                 dbver, query, operation_name, variables)
             self.query_cache[cache_key] = op
-        else:
             if op.cache_deps_vars:
+                variant_key = (
+                    cache_key, self.get_variant_key(op, variables))
+                self.query_variants_cache[variant_key] = op
+        elif op.cache_deps_vars:
+            # The compiled query depends on the values of some of
+            # the variables, so look up the variant compiled for
+            # these particular values.
+            variant_key = (cache_key, self.get_variant_key(op, variables))
+            variant_op = self.query_variants_cache.get(variant_key)
+            if variant_op is None:
                 op = await self.compile(
                     dbver, query, operation_name, variables)
+                self.query_variants_cache[variant_key] = op
             else:
-                # This is at least the second time this query is used
-                # and it's safe to cache.
+                op = variant_op
                 use_prep_stmt = True
+        else:
+            # This is at least the second time this query is used
+            # and it's safe to cache.
+            use_prep_stmt = True
 
         args = []
         if op.sql_args:
@@ -191,16 +409,35 @@ cdef class Protocol(http.HttpProtocol):
                 else:
                     args.append(variables[name])
 
-        pgcon = await self.server.pgcons.get()
-        try:
-            data = await pgcon.parse_execute_json(
-                op.sql, op.sql_hash, op.dbver,
-                use_prep_stmt, args)
-        finally:
-            self.server.pgcons.put_nowait(pgcon)
+        return op, use_prep_stmt, args
+
+    async def execute_compiled(self, pgcon, op, use_prep_stmt, args,
+                               report_cost):
+        data = await pgcon.parse_execute_json(
+            op.sql, op.sql_hash, op.dbver,
+            use_prep_stmt, args)
 
         if data is None:
             raise errors.InternalServerError(
                 f'no data received for a JSON query {op.sql!r}')
 
-        return data
+        if report_cost:
+            # The estimated cost of the operation is reported
+            # on request, for monitoring purposes.
+            return (
+                b'{"data":' + data +
+                b',"extensions":{"cost":' + str(op.cost).encode() + b'}}'
+            )
+        else:
+            return b'{"data":' + data + b'}'
+
+    async def execute(self, query, operation_name, variables, report_cost):
+        op, use_prep_stmt, args = await self.prepare(
+            query, operation_name, variables)
+
+        pgcon = await self.server.pgcons.get()
+        try:
+            return await self.execute_compiled(
+                pgcon, op, use_prep_stmt, args, report_cost)
+        finally:
+            self.server.pgcons.put_nowait(pgcon)
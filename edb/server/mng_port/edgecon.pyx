@@ -90,6 +90,7 @@ cdef tuple DUMP_VER_MAX = (0, 8)
 cdef object logger = logging.getLogger('edb.server')
 
 DEF QUERY_OPT_IMPLICIT_LIMIT = 0xFF01
+DEF QUERY_OPT_COMPILE_STATS = 0xFF02
 
 
 @cython.final
@@ -547,6 +548,19 @@ cdef class EdgeConnection:
 
         return verifier, is_mock
 
+    async def cleanup_failed_unit(self, query_unit):
+        # Undo the non-transactional effects of a failed unit, e.g.
+        # drop the indexes built ahead of a failed DDL transaction.
+        # A failure here must not mask the error of the unit itself.
+        for sql in query_unit.cleanup_sql:
+            try:
+                await self.get_backend().pgcon.simple_query(
+                    sql, ignore_data=True)
+            except ConnectionAbortedError:
+                raise
+            except Exception:
+                logger.exception('failed to clean up after a failed query')
+
     async def recover_current_tx_info(self):
         ret = await self.get_backend().pgcon.simple_query(b'''
             SELECT s1.name AS n, s1.value AS v, s1.type AS t
@@ -600,7 +614,7 @@ cdef class EdgeConnection:
             self.dbview.raise_in_tx_error()
 
         if self.dbview.in_tx():
-            return await self.get_backend().compiler.call(
+            units = await self.get_backend().compiler.call(
                 'compile_eql_in_tx',
                 self.dbview.txid,
                 eql,
@@ -610,7 +624,7 @@ cdef class EdgeConnection:
                 stmt_mode,
             )
         else:
-            return await self.get_backend().compiler.call(
+            units = await self.get_backend().compiler.call(
                 'compile_eql',
                 self.dbview.dbver,
                 eql,
@@ -623,6 +637,11 @@ cdef class EdgeConnection:
                 CAP_ALL,
             )
 
+        for unit in units:
+            self.port.record_compile_stats(unit.compile_stats)
+
+        return units
+
     async def _compile_rollback(self, bytes eql):
         assert self.dbview.in_tx_error()
         try:
@@ -711,6 +730,9 @@ cdef class EdgeConnection:
                     # that (until a better solution is found.)
                     self.dbview.abort_tx()
                     await self.recover_current_tx_info()
+                if (query_unit.cleanup_sql and
+                        not self.get_backend().pgcon.in_tx()):
+                    await self.cleanup_failed_unit(query_unit)
                 raise
             else:
                 if self.dbview.on_success(query_unit):
@@ -872,6 +894,7 @@ cdef class EdgeConnection:
             bytes eql
             dict headers
             uint64_t implicit_limit = 0
+            bint report_compile_stats = False
 
         self._last_anon_compiled = None
 
@@ -880,6 +903,8 @@ cdef class EdgeConnection:
             for k, v in headers.items():
                 if k == QUERY_OPT_IMPLICIT_LIMIT:
                     implicit_limit = self._parse_implicit_limit(v)
+                elif k == QUERY_OPT_COMPILE_STATS:
+                    report_compile_stats = True
                 else:
                     raise errors.BinaryProtocolError(
                         f'unexpected message header: {k}'
@@ -903,7 +928,15 @@ cdef class EdgeConnection:
             eql, io_format, expect_one, implicit_limit)
 
         buf = WriteBuffer.new_message(b'1')  # ParseComplete
-        buf.write_int16(0)  # no headers
+        if report_compile_stats:
+            # The breakdown of the compilation of the query (which
+            # might have happened earlier, if it was cached).
+            self.write_headers(buf, {
+                QUERY_OPT_COMPILE_STATS: json.dumps(
+                    query_unit.compile_stats.as_dict()),
+            })
+        else:
+            buf.write_int16(0)  # no headers
         buf.write_byte(self.render_cardinality(query_unit))
         buf.write_bytes(query_unit.in_type_id)
         buf.write_bytes(query_unit.out_type_id)
@@ -27,6 +27,7 @@ import os.path
 import stat
 import weakref
 
+from edb.common import debug
 from edb.common import taskgroup
 from edb.server import baseport
 from edb.server import compiler
@@ -77,6 +78,15 @@ class ManagementPort(baseport.Port):
         self._accepting = False
         self._max_protocol = max_protocol
 
+        self._compile_stats = compiler.CompileStatsHistograms()
+
+    @property
+    def compile_stats(self) -> compiler.CompileStatsHistograms:
+        return self._compile_stats
+
+    def record_compile_stats(self, stats: compiler.CompileStats) -> None:
+        self._compile_stats.record(stats)
+
     def new_view(self, *, dbname, user, query_cache):
         return self._dbindex.new_view(
             dbname, user=user, query_cache=query_cache)
@@ -184,3 +194,9 @@ class ManagementPort(baseport.Port):
                     self._backends.clear()
             finally:
                 await super().stop()
+
+                if debug.flags.compile_stats:
+                    debug.header(
+                        f'Compilation Time Histograms: {self._nethost}:'
+                        f'{self._netport}')
+                    debug.dump(self._compile_stats.as_dict())
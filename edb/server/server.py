@@ -173,8 +173,13 @@ class Server:
                          portconf)
             return
 
+        port_kwargs = {}
         if portconf.protocol == 'graphql+http':
             port_cls = http_graphql_port.HttpGraphQLPort
+            max_query_cost = portconf.graphql_max_query_cost
+            if max_query_cost is not None:
+                # Zero disables the limit.
+                port_kwargs['max_query_cost'] = max_query_cost or None
         elif portconf.protocol == 'edgeql+http':
             port_cls = http_edgeql_port.HttpEdgeQLPort
         else:
@@ -188,7 +193,8 @@ class Server:
             database=portconf.database,
             user=portconf.user,
             protocol=portconf.protocol,
-            concurrency=portconf.concurrency)
+            concurrency=portconf.concurrency,
+            **port_kwargs)
 
         try:
             await port.start()
@@ -0,0 +1,36 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Micro-benchmarks of the compiler pipeline components."""
+
+from __future__ import annotations
+
+from edb.tools.edb import edbcommands
+
+
+@edbcommands.group()
+def bench():
+    pass
+
+
+# Import at the end of the file so that "bench" is defined for all
+# of the below modules when they try to import it.
+from . import parser  # noqa
+from . import schema  # noqa
+from . import scopetree  # noqa
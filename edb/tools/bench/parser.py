@@ -0,0 +1,127 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Parser throughput benchmark.
+
+The inputs are the sources of the "good" syntax tests
+in tests/test_edgeql_syntax.py.
+"""
+
+from __future__ import annotations
+from typing import *
+
+import ast
+import gc
+import pathlib
+import time
+
+import click
+
+import edb
+from edb.common import lrtables
+from edb.edgeql.parser import parser as ql_parser
+
+from . import bench
+
+
+DEFAULT_SOURCE = (
+    pathlib.Path(edb.__file__).parent.parent
+    / 'tests' / 'test_edgeql_syntax.py'
+)
+
+
+class SpecBlockParser(ql_parser.EdgeQLBlockParser):
+    """A block parser running on the reference parsing.Lr driver."""
+
+    def get_lr_parser(self):
+        import parsing
+        return parsing.Lr(self.get_parser_spec())
+
+
+def load_inputs(path: pathlib.Path) -> List[str]:
+    tree = ast.parse(path.read_text(), str(path))
+    inputs = []
+    for node in ast.walk(tree):
+        if (not isinstance(node, ast.FunctionDef)
+                or not node.name.startswith('test_')
+                # Decorated tests are expected to fail to parse.
+                or node.decorator_list):
+            continue
+        doc = ast.get_docstring(node, clean=False)
+        if doc:
+            source, _, _ = doc.partition('\n% OK %')
+            inputs.append(source)
+    return inputs
+
+
+def run(parser, inputs: List[str], rounds: int) -> float:
+    # Warm up: load the tables and the lexer.
+    for source in inputs:
+        parser.parse(source)
+
+    gc.collect()
+    started_at = time.monotonic()
+    for _ in range(rounds):
+        for source in inputs:
+            parser.parse(source)
+    return time.monotonic() - started_at
+
+
+@bench.command()
+@click.option(
+    '--source', type=click.Path(exists=True, dir_okay=False),
+    default=str(DEFAULT_SOURCE), show_default=True,
+    help='test module to take the inputs from')
+@click.option(
+    '--rounds', type=int, default=5, show_default=True,
+    help='how many times to parse every input')
+def parser(*, source, rounds):
+    """Measure parser table load time and parse throughput."""
+    inputs = load_inputs(pathlib.Path(source))
+    nbytes = sum(len(s.encode()) for s in inputs) * rounds
+
+    tables_parser = ql_parser.EdgeQLBlockParser()
+    spec_parser = SpecBlockParser()
+    mod = tables_parser.get_parser_spec_module()
+
+    # Make sure the tables file is there and up to date.
+    tables_parser.get_parser_tables()
+
+    started_at = time.monotonic()
+    fingerprint = lrtables.grammar_fingerprint(mod)
+    lrtables.Tables.load(
+        tables_parser.localpath(mod, 'tables'), fingerprint=fingerprint)
+    tables_load = time.monotonic() - started_at
+
+    spec_parser.cleanup()
+    started_at = time.monotonic()
+    spec_parser.get_parser_spec()
+    spec_load = time.monotonic() - started_at
+
+    click.echo(f'{len(inputs)} inputs, {rounds} rounds')
+    click.echo(f'{"driver":<10} {"load, ms":>10} {"stmts/s":>10} '
+               f'{"MiB/s":>8}')
+
+    for name, parser, load in [('tables', tables_parser, tables_load),
+                               ('spec', spec_parser, spec_load)]:
+        elapsed = run(parser, inputs, rounds)
+        click.echo(
+            f'{name:<10} {load * 1000:>10.1f} '
+            f'{len(inputs) * rounds / elapsed:>10.0f} '
+            f'{nbytes / elapsed / 2 ** 20:>8.2f}')
@@ -0,0 +1,117 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Schema benchmarks on synthetic schemas of a given size."""
+
+from __future__ import annotations
+
+from typing import *
+
+import gc
+import time
+import tracemalloc
+
+import click
+
+from edb.schema import ddl as s_ddl
+from edb.testbase import lang as tb
+
+from . import bench
+
+
+def make_schema(ntypes: int, *, altered: Container[int] = ()) -> str:
+    """Return SDL declaring *ntypes* object types.
+
+    Every type has a few properties, and links to the previous type.
+    Types with numbers in *altered* get an extra property.
+    """
+    decls = [
+        '''
+        abstract type Named {
+            required property name -> str;
+        }
+        '''
+    ]
+
+    for i in range(ntypes):
+        link = f'link prev -> Type{i - 1};' if i else ''
+        extra = 'property note -> str;' if i in altered else ''
+        decls.append(f'''
+            type Type{i} extending Named {{
+                property value -> int64;
+                property tags -> array<str>;
+                {link}
+                {extra}
+            }}
+        ''')
+
+    return ''.join(decls)
+
+
+@bench.command(name='schema-memory')
+@click.option(
+    '--types', 'ntypes', type=int, default=5000, show_default=True,
+    help='the number of object types in the schema')
+def schema_memory(*, ntypes):
+    """Measure the memory taken by the objects of a schema."""
+    source = make_schema(ntypes)
+
+    # Load the standard library beforehand, so that only the objects
+    # of the user schema are measured.
+    tb.BaseSchemaTest.load_schema('')
+
+    gc.collect()
+    tracemalloc.start()
+    schema = tb.BaseSchemaTest.load_schema(source)
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nobjects = sum(1 for _ in schema.get_objects(included_modules=['test']))
+
+    click.echo(f'{"types":>8} {"objects":>8} {"KiB":>10} {"bytes/object":>13}')
+    click.echo(
+        f'{ntypes:>8} {nobjects:>8} {allocated // 1024:>10} '
+        f'{allocated // nobjects:>13}')
+
+
+@bench.command(name='schema-diff')
+@click.option(
+    '--types', 'sizes', type=int, multiple=True,
+    default=(500, 1000, 2000, 4000), show_default=True,
+    help='the number of object types in the schema (can be repeated)')
+@click.option(
+    '--changes', 'nchanges', type=int, default=3, show_default=True,
+    help='the number of types altered in the new schema')
+def schema_diff(*, sizes, nchanges):
+    """Measure the time to diff schemas that differ in a few types."""
+    click.echo(f'{"types":>8} {"changes":>8} {"seconds":>10}')
+
+    for ntypes in sizes:
+        step = max(ntypes // max(nchanges, 1), 1)
+        altered = range(0, ntypes, step)[:nchanges]
+        old_schema = tb.BaseSchemaTest.load_schema(make_schema(ntypes))
+        new_schema = tb.BaseSchemaTest.load_schema(
+            make_schema(ntypes, altered=altered))
+
+        started_at = time.monotonic()
+        s_ddl.delta_schemas(old_schema, new_schema)
+        elapsed = time.monotonic() - started_at
+
+        click.echo(f'{ntypes:>8} {len(altered):>8} {elapsed:>10.3f}')
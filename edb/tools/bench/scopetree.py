@@ -0,0 +1,115 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Scope tree scaling benchmark.
+
+Compiles queries of increasing nesting depth to IR and reports
+the compilation time for every depth.  The time spent per nesting
+level should stay roughly flat as the depth grows.
+"""
+
+from __future__ import annotations
+from typing import *
+
+import time
+
+import click
+
+from edb.edgeql import compiler as ql_compiler
+from edb.edgeql import parser as ql_parser
+from edb.testbase import lang as tb
+
+from . import bench
+
+
+SCHEMA = '''
+    type Node {
+        property name -> str;
+        multi link next -> Node;
+    }
+'''
+
+
+def nested_shape(depth: int) -> str:
+    shape = 'name'
+    for _ in range(depth):
+        shape = f'name, next: {{ {shape} }}'
+    return f'SELECT Node {{ {shape} }}'
+
+
+def nested_for(depth: int) -> str:
+    query = f'SELECT x{depth} {{ name }}'
+    for i in range(depth, 0, -1):
+        query = f'FOR x{i} IN {{x{i - 1}.next}} UNION ({query})'
+    return f'FOR x0 IN {{Node}} UNION ({query})'
+
+
+def nested_with(depth: int) -> str:
+    aliases = ['a0 := Node']
+    for i in range(1, depth + 1):
+        aliases.append(
+            f"a{i} := (SELECT a{i - 1}.next FILTER .name != '{i}')")
+    return f'WITH {", ".join(aliases)} SELECT a{depth} {{ name }}'
+
+
+QUERIES: Dict[str, Callable[[int], str]] = {
+    'shape': nested_shape,
+    'for': nested_for,
+    'with': nested_with,
+}
+
+
+@bench.command()
+@click.option(
+    '--max-depth', type=int, default=32, show_default=True,
+    help='the deepest nesting to compile (depths double from 1)')
+@click.option(
+    '--rounds', type=int, default=3, show_default=True,
+    help='how many times to compile every query (the best time is shown)')
+def scopetree(*, max_depth, rounds):
+    """Measure IR compilation time against query nesting depth."""
+    schema = tb.BaseSchemaTest.load_schema(SCHEMA)
+
+    depths = []
+    depth = 1
+    while depth <= max_depth:
+        depths.append(depth)
+        depth *= 2
+
+    click.echo(f'{"query":<8} {"depth":>6} {"ms":>10} {"ms/level":>10}')
+
+    for name, make_query in QUERIES.items():
+        for depth in depths:
+            source = make_query(depth)
+            best = None
+            for _ in range(rounds):
+                # The compiler may annotate the AST, so start
+                # from a fresh one every time.
+                qltree = ql_parser.parse(source)
+                started_at = time.monotonic()
+                ql_compiler.compile_ast_to_ir(
+                    qltree, schema, modaliases={None: 'test'})
+                elapsed = time.monotonic() - started_at
+                if best is None or elapsed < best:
+                    best = elapsed
+
+            assert best is not None
+            click.echo(
+                f'{name:<8} {depth:>6} {best * 1000:>10.1f} '
+                f'{best * 1000 / depth:>10.2f}')
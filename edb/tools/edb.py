@@ -49,6 +49,7 @@ def server(**kwargs):
 
 # Import at the end of the file so that "edb.tools.edb.edbcommands"
 # is defined for all of the below modules when they try to import it.
+from . import bench  # noqa
 from . import dflags  # noqa
 from . import gen_errors  # noqa
 from . import gen_types  # noqa
@@ -111,6 +111,8 @@ if platform.uname().system != 'Windows':
 def _compile_parsers(build_lib, inplace=False):
     import parsing
 
+    from edb.common import lrtables
+
     import edb.edgeql.parser.grammar.single as edgeql_spec
     import edb.edgeql.parser.grammar.block as edgeql_spec2
     import edb.edgeql.parser.grammar.sdldocument as schema_spec
@@ -118,13 +120,19 @@ def _compile_parsers(build_lib, inplace=False):
     for spec in (edgeql_spec, edgeql_spec2, schema_spec):
         spec_path = pathlib.Path(spec.__file__).parent
         subpath = pathlib.Path(str(spec_path)[len(str(ROOT_PATH)) + 1:])
-        pickle_name = spec.__name__.rpartition('.')[2] + '.pickle'
-        pickle_path = subpath / pickle_name
+        spec_name = spec.__name__.rpartition('.')[2]
+        pickle_path = subpath / (spec_name + '.pickle')
+        tables_path = subpath / (spec_name + '.tables')
         cache = build_lib / pickle_path
+        tables_cache = build_lib / tables_path
         cache.parent.mkdir(parents=True, exist_ok=True)
-        parsing.Spec(spec, pickleFile=str(cache), verbose=True)
+        parser_spec = parsing.Spec(spec, pickleFile=str(cache), verbose=True)
+        tables = lrtables.Tables.from_spec(
+            parser_spec, fingerprint=lrtables.grammar_fingerprint(spec))
+        tables.dump(str(tables_cache))
         if inplace:
             shutil.copy2(cache, ROOT_PATH / pickle_path)
+            shutil.copy2(tables_cache, ROOT_PATH / tables_path)
 
 
 def _compile_build_meta(build_lib, version, pg_config, runstatedir,
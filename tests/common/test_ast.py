@@ -167,6 +167,24 @@ class ASTBaseTests(unittest.TestCase):
         self.assertEqual(Node().field1, None)
         self.assertEqual(Node().field3, 123)
 
+    @unittest.mock.patch(
+        'edb.common.ast.base._check_type',
+        ast.base._check_type_real,
+    )
+    def test_common_ast_typing_container_subclass(self):
+        class IntMap(typing.Dict[int, str]):
+            pass
+
+        class Node(ast.AST):
+            field_map: IntMap
+
+        self.assertIsInstance(Node().field_map, IntMap)
+        self.assertIsNot(Node().field_map, Node().field_map)
+
+        Node().field_map = IntMap({1: 'a'})
+        with self.assertRaises(TypeError):
+            Node().field_map = {1: 'a'}
+
     def test_common_ast_type_anno(self):
         with self.assertRaisesRegex(RuntimeError, r"1 is not a type"):
             class Node1(ast.AST):
@@ -0,0 +1,176 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os
+import tempfile
+import types
+import unittest
+
+import parsing
+
+from edb.common import lrtables
+
+
+class Token(parsing.Token):
+    def __init__(self, parser, val=None):
+        super().__init__(parser)
+        self.val = val
+
+
+class P_ADD(parsing.Precedence):
+    '%left'
+
+
+class P_MUL(parsing.Precedence):
+    '%left >P_ADD'
+
+
+class T_PLUS(Token):
+    '%token PLUS [P_ADD]'
+
+
+class T_STAR(Token):
+    '%token STAR [P_MUL]'
+
+
+class T_LPAREN(Token):
+    '%token LPAREN'
+
+
+class T_RPAREN(Token):
+    '%token RPAREN'
+
+
+class T_IDENT(Token):
+    '%token IDENT'
+
+
+class Result(parsing.Nonterm):
+    '%start'
+
+    def reduce_Expr(self, expr):
+        '%reduce Expr'
+        self.val = expr.val
+
+    def reduce_empty(self):
+        '%reduce'
+        self.val = None
+
+
+class Expr(parsing.Nonterm):
+    '%nonterm'
+
+    def reduce_Expr_PLUS_Expr(self, left, op, right):
+        '%reduce Expr PLUS Expr'
+        self.val = ('+', left.val, right.val)
+
+    def reduce_Expr_STAR_Expr(self, left, op, right):
+        '%reduce Expr STAR Expr'
+        self.val = ('*', left.val, right.val)
+
+    def reduce_LPAREN_Expr_RPAREN(self, lparen, expr, rparen):
+        '%reduce LPAREN Expr RPAREN'
+        self.val = expr.val
+
+    def reduce_IDENT(self, ident):
+        '%reduce IDENT'
+        self.val = ident.val
+
+
+grammar = types.ModuleType('grammar')
+for cls in (P_ADD, P_MUL, T_PLUS, T_STAR, T_LPAREN, T_RPAREN, T_IDENT,
+            Result, Expr):
+    setattr(grammar, cls.__name__, cls)
+
+
+TOKENS = {
+    '+': T_PLUS,
+    '*': T_STAR,
+    '(': T_LPAREN,
+    ')': T_RPAREN,
+}
+
+
+class TestLRTables(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.spec = parsing.Spec(grammar, pickleFile=None, skinny=True,
+                                logFile=None, verbose=False)
+        cls.fingerprint = lrtables.grammar_fingerprint(grammar)
+        cls.tables = lrtables.Tables.from_spec(
+            cls.spec, fingerprint=cls.fingerprint)
+
+    def parse(self, parser, source):
+        parser.reset()
+        for char in source:
+            cls = TOKENS.get(char)
+            if cls is None:
+                parser.token(T_IDENT(parser, char))
+            else:
+                parser.token(cls(parser))
+        parser.eoi()
+        return parser.start[0].val
+
+    def assert_parses_like_spec(self, tables):
+        for source in ['', 'a', 'a+b*c', 'a*b+c', '(a+b)*c', 'a+(b+c)']:
+            self.assertEqual(
+                self.parse(lrtables.Lr(tables), source),
+                self.parse(parsing.Lr(self.spec), source),
+                source)
+
+        for source in ['+', 'a+', '(a', 'a)', 'ab']:
+            with self.assertRaisesRegex(parsing.UnexpectedToken,
+                                        '^Unexpected token: '):
+                self.parse(lrtables.Lr(tables), source)
+
+    def test_lrtables_parse_01(self):
+        self.assert_parses_like_spec(self.tables)
+
+    def test_lrtables_dump_load_01(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, 'grammar.tables')
+            self.tables.dump(path)
+
+            tables = lrtables.Tables.load(path, fingerprint=self.fingerprint)
+            self.assertIsNotNone(tables)
+            self.assertEqual(list(tables.action), list(self.tables.action))
+            self.assertEqual(list(tables.goto), list(self.tables.goto))
+            self.assert_parses_like_spec(tables)
+
+            self.assertIsNone(
+                lrtables.Tables.load(path, fingerprint=b'\x00' * 20))
+            self.assertIsNone(
+                lrtables.Tables.load(path + '.missing',
+                                     fingerprint=self.fingerprint))
+
+    def test_lrtables_fingerprint_01(self):
+        changed = types.ModuleType('grammar')
+        changed.__dict__.update(grammar.__dict__)
+
+        class Expr2(Expr):
+            '%nonterm Expr'
+
+            def reduce_IDENT(self, ident):
+                '%reduce IDENT IDENT'
+
+        changed.Expr = Expr2
+
+        self.assertNotEqual(lrtables.grammar_fingerprint(changed),
+                            self.fingerprint)
@@ -206,6 +206,29 @@ class TestConstraintsSchema(tb.QueryTestCase):
                     };
                 """)
 
+    async def test_constraints_exclusive_across_ancestry_bulk(self):
+        async with self._run_and_rollback():
+            await self.con.execute("""
+                INSERT test::UniqueName {
+                    name := 'exclusive_bulk_03'
+                };
+
+                FOR x IN {'exclusive_bulk_01', 'exclusive_bulk_02'}
+                UNION (INSERT test::UniqueNameInherited {
+                    name := x
+                });
+            """)
+
+            with self.assertRaisesRegex(
+                    edgedb.ConstraintViolationError,
+                    'name violates exclusivity constraint'):
+                await self.con.execute("""
+                    FOR x IN {'exclusive_bulk_03', 'exclusive_bulk_04'}
+                    UNION (INSERT test::UniqueNameInherited {
+                        name := x
+                    });
+                """)
+
     async def test_constraints_exclusive_case_insensitive(self):
         async with self._run_and_rollback():
             with self.assertRaisesRegex(
@@ -5100,3 +5100,42 @@ class TestEdgeQLDDL(tb.DDLTestCase):
             ''',
             [1],
         )
+
+    async def test_edgeql_ddl_add_many_columns_01(self):
+        # Columns added by one command are added by a single
+        # ALTER TABLE, including the columns that already exist in
+        # the table as inherited from the parent.
+        await self.con.execute("""
+            SET MODULE test;
+
+            CREATE TYPE Base;
+            CREATE TYPE Derived EXTENDING Base;
+
+            ALTER TYPE Base {
+                CREATE PROPERTY a -> str;
+                CREATE REQUIRED PROPERTY b -> str {
+                    SET default := 'b';
+                };
+                CREATE PROPERTY c -> int64;
+                CREATE LINK d -> Base;
+            };
+
+            ALTER TYPE Derived {
+                CREATE PROPERTY e -> str;
+                CREATE PROPERTY f -> str;
+            };
+
+            INSERT Derived {
+                a := 'a',
+                c := 1,
+                e := 'e',
+                f := 'f',
+            };
+        """)
+
+        await self.assert_query_result(
+            r'''
+                SELECT Derived {a, b, c, e, f};
+            ''',
+            [{'a': 'a', 'b': 'b', 'c': 1, 'e': 'e', 'f': 'f'}],
+        )
@@ -197,3 +197,38 @@ class TestEdgeQLIRPathID(tb.BaseEdgeQLCompilerTest):
                 '.>deck[IS test::Card]',
             ]
         )
+
+    def test_edgeql_ir_pathid_memoized_01(self):
+        User = self.schema.get('test::User')
+        deck_ptr = User.getptr(self.schema, 'deck')
+        deck_ptr_ref = irtyputils.ptrref_from_ptrcls(
+            schema=self.schema,
+            ptrcls=deck_ptr,
+        )
+
+        ns = frozenset(('foo',))
+        pid_1 = pathid.PathId.from_type(self.schema, User)
+        pid_2 = pid_1.extend(ptrref=deck_ptr_ref, schema=self.schema)
+
+        # Deriving the same path again yields the very same object.
+        self.assertIs(
+            pid_1.extend(ptrref=deck_ptr_ref, schema=self.schema), pid_2)
+        self.assertIs(pid_2.replace_namespace(ns),
+                      pid_2.replace_namespace(set(ns)))
+        self.assertIsNot(
+            pid_1.extend(ptrref=deck_ptr_ref, ns=ns, schema=self.schema),
+            pid_2)
+
+        # Independently constructed PathIds still compare equal.
+        pid_1_copy = pathid.PathId.from_type(self.schema, User)
+        self.assertIsNot(pid_1_copy, pid_1)
+        self.assertEqual(pid_1_copy, pid_1)
+        self.assertEqual(hash(pid_1_copy), hash(pid_1))
+        self.assertEqual(
+            pid_1_copy.extend(ptrref=deck_ptr_ref, schema=self.schema),
+            pid_2)
+
+        # strip_namespace() must not affect the memoized PathIds.
+        pid_3 = pid_2.replace_namespace(ns)
+        self.assertEqual(pid_3.strip_namespace(ns).namespace, frozenset())
+        self.assertEqual(pid_2.replace_namespace(ns).namespace, ns)
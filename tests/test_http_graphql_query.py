@@ -17,12 +17,16 @@
 #
 
 
+import hashlib
 import json
 import os
+import urllib.error
+import urllib.request
 import uuid
 
 import edgedb
 
+from edb.server import cluster
 from edb.testbase import http as tb
 from edb.tools import test
 
@@ -129,6 +133,255 @@ class TestGraphQLFunctional(tb.GraphQLTestCase):
             with self.assertRaises(OSError):
                 self.http_con_request(con, {}, path='non-existant')
 
+    def test_graphql_http_persisted_query_01(self):
+        query = '''
+            {
+                Setting(order: {value: {dir: ASC}}) {
+                    value
+                    # test_graphql_http_persisted_query_01
+                }
+            }
+        '''
+        ext = json.dumps({
+            'persistedQuery': {
+                'version': 1,
+                'sha256Hash': hashlib.sha256(query.encode()).hexdigest(),
+            }
+        })
+
+        with self.http_con() as con:
+            data, headers, status = self.http_con_request(
+                con, {'extensions': ext})
+            self.assertEqual(status, 200)
+            self.assertEqual(
+                json.loads(data)['errors'][0]['extensions']['code'],
+                'PERSISTED_QUERY_NOT_FOUND')
+
+            data, headers, status = self.http_con_request(
+                con, {'query': query, 'extensions': ext})
+            self.assertEqual(status, 200)
+            self.assertEqual(
+                json.loads(data)['data'],
+                {'Setting': [{'value': 'blue'}, {'value': 'full'}]})
+
+            data, headers, status = self.http_con_request(
+                con, {'extensions': ext})
+            self.assertEqual(status, 200)
+            self.assertEqual(
+                json.loads(data)['data'],
+                {'Setting': [{'value': 'blue'}, {'value': 'full'}]})
+
+    def test_graphql_http_persisted_query_02(self):
+        ext = json.dumps({
+            'persistedQuery': {
+                'version': 1,
+                'sha256Hash': hashlib.sha256(b'blah').hexdigest(),
+            }
+        })
+
+        with self.http_con() as con:
+            data, headers, status = self.http_con_request(
+                con, {'query': '{ Setting { value } }', 'extensions': ext})
+
+            self.assertEqual(status, 400)
+            self.assertEqual(headers['connection'], 'close')
+            self.assertIn(b'does not match the query', data)
+
+    def _graphql_batch(self, batch, *, path=''):
+        req = urllib.request.Request(f'{self.http_addr}/{path}',
+                                     method='POST')
+        req.add_header('Content-Type', 'application/json')
+        response = urllib.request.urlopen(req, json.dumps(batch).encode())
+        return json.loads(response.read())
+
+    def test_graphql_http_batch_01(self):
+        for path in ('', '?consistent=true'):
+            res = self._graphql_batch([
+                {
+                    'query': """
+                        query {
+                            Setting(order: {value: {dir: ASC}}) {
+                                value
+                            }
+                        }
+                    """,
+                },
+                {
+                    'query': """
+                        query($name: String!) {
+                            UserGroup(filter: {name: {eq: $name}}) {
+                                name
+                            }
+                        }
+                    """,
+                    'variables': {'name': 'basic'},
+                },
+                {
+                    'query': """
+                        query {
+                            NON_EXISTING_TYPE {
+                                name
+                            }
+                        }
+                    """,
+                },
+            ], path=path)
+
+            self.assertEqual(len(res), 3)
+            self.assertEqual(
+                res[0]['data'],
+                {'Setting': [{'value': 'blue'}, {'value': 'full'}]})
+            self.assertEqual(
+                res[1]['data'],
+                {'UserGroup': [{'name': 'basic'}]})
+            self.assertIn('QueryError:', res[2]['errors'][0]['message'])
+
+    def test_graphql_http_batch_02(self):
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            self._graphql_batch([])
+        self.assertEqual(cm.exception.code, 400)
+
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            self._graphql_batch([{'query': '{ Setting { value } }'}, 1])
+        self.assertEqual(cm.exception.code, 400)
+
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            self._graphql_batch(
+                [{'query': '{ Setting { value } }'}] * 101)
+        self.assertEqual(cm.exception.code, 400)
+
+    def test_graphql_http_batch_03(self):
+        # A runtime error in the middle of a consistent batch must
+        # not abort the transaction for the operations after it.
+        for path in ('?consistent', '?consistent=true'):
+            res = self._graphql_batch([
+                {
+                    'query': '{ Setting(first: 1) { value } }',
+                },
+                {
+                    'query': """
+                        query($after: String!) {
+                            Setting(after: $after) {
+                                value
+                            }
+                        }
+                    """,
+                    'variables': {'after': 'not a number'},
+                },
+                {
+                    'query': """
+                        query($name: String!) {
+                            UserGroup(filter: {name: {eq: $name}}) {
+                                name
+                            }
+                        }
+                    """,
+                    'variables': {'name': 'basic'},
+                },
+            ], path=path)
+
+            self.assertEqual(len(res), 3)
+            self.assertIn('data', res[0])
+            self.assertNotIn('data', res[1])
+            self.assertIn('errors', res[1])
+            self.assertEqual(
+                res[2]['data'],
+                {'UserGroup': [{'name': 'basic'}]})
+
+    def test_graphql_http_cost_01(self):
+        query = '''
+            {
+                User(first: 2) {
+                    name
+                    profile {
+                        name
+                    }
+                    groups(first: 3) {
+                        name
+                    }
+                }
+            }
+        '''
+
+        with self.http_con() as con:
+            data, headers, status = self.http_con_request(con, {
+                'query': query,
+                'cost': 'true',
+            })
+
+            self.assertEqual(status, 200)
+            # 2 users, each with a profile and at most 3 groups
+            self.assertEqual(json.loads(data)['extensions'], {'cost': 10})
+
+            # The cost is only reported on request.
+            data, headers, status = self.http_con_request(con, {
+                'query': query,
+            })
+
+            self.assertEqual(status, 200)
+            self.assertNotIn('extensions', json.loads(data))
+
+    def test_graphql_http_cost_02(self):
+        with self.assertRaisesRegex(
+                edgedb.QueryError,
+                r'exceeds the maximum allowed cost'):
+            self.graphql_query(r"""
+                query {
+                    User(first: 1000) {
+                        groups(first: 1000) {
+                            settings(first: 1000) {
+                                name
+                            }
+                        }
+                    }
+                }
+            """)
+
+    def test_graphql_http_cost_03(self):
+        # Ordinary nested queries are well within the default limit.
+        self.graphql_query(r"""
+            query {
+                User {
+                    groups {
+                        settings {
+                            name
+                        }
+                    }
+                }
+            }
+        """)
+
+    def test_graphql_http_cost_04(self):
+        port = cluster.find_available_port()
+        self.loop.run_until_complete(self.con.execute(f'''
+            CONFIGURE SYSTEM INSERT Port {{
+                protocol := "graphql+http",
+                database := "{self.get_database_name()}",
+                address := "{self.http_host}",
+                port := {port},
+                user := "http",
+                concurrency := 1,
+                graphql_max_query_cost := 5,
+            }};
+        '''))
+
+        try:
+            req = urllib.request.Request(
+                f'http://{self.http_host}:{port}', method='POST')
+            req.add_header('Content-Type', 'application/json')
+            response = urllib.request.urlopen(req, json.dumps({
+                'query': '{ User(first: 10) { name } }',
+            }).encode())
+            res = json.loads(response.read())
+
+            self.assertIn(
+                'exceeds the maximum allowed cost (5)',
+                res['errors'][0]['message'])
+        finally:
+            self.loop.run_until_complete(self.con.execute(f'''
+                CONFIGURE SYSTEM RESET Port FILTER .port = {port};
+            '''))
+
     def test_graphql_functional_query_01(self):
         for _ in range(10):  # repeat to test prepared pgcon statements
             self.assert_graphql_query_result(r"""
@@ -1838,6 +2091,39 @@ class TestGraphQLFunctional(tb.GraphQLTestCase):
                 }
             """)
 
+    def test_graphql_functional_directives_08(self):
+        query = r"""
+            query ($inc: Boolean!) {
+                User(order: {name: {dir: ASC}}) {
+                    name @include(if: $inc)
+                    groups {
+                        name
+                    }
+                }
+            }
+        """
+
+        # Alternate the values of the variable the compiled query
+        # depends on, so that cached variants are reused.
+        for _ in range(3):
+            self.assert_graphql_query_result(query, {
+                "User": [
+                    {"name": "Alice", "groups": []},
+                    {"name": "Bob", "groups": []},
+                    {"name": "Jane", "groups": [{"name": "upgraded"}]},
+                    {"name": "John", "groups": [{"name": "basic"}]},
+                ]
+            }, variables={'inc': True})
+
+            self.assert_graphql_query_result(query, {
+                "User": [
+                    {"groups": []},
+                    {"groups": []},
+                    {"groups": [{"name": "upgraded"}]},
+                    {"groups": [{"name": "basic"}]},
+                ]
+            }, variables={'inc': False})
+
     def test_graphql_functional_typename_01(self):
         self.assert_graphql_query_result(r"""
             query {
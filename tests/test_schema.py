@@ -17,7 +17,9 @@
 #
 
 
+import gc
 import re
+import weakref
 
 from edb import errors
 
@@ -29,9 +31,11 @@ from edb.edgeql import compiler as qlcompiler
 from edb.edgeql import parser as qlparser
 from edb.edgeql import qltypes
 
+from edb.schema import casts as s_casts
 from edb.schema import delta as s_delta
 from edb.schema import ddl as s_ddl
 from edb.schema import links as s_links
+from edb.schema import name as s_name
 from edb.schema import objtypes as s_objtypes
 
 from edb.tools import test
@@ -849,6 +853,347 @@ _123456789_123456789_123456789 -> str
             )
         )
 
+    def test_schema_implicit_cast_distance_01(self):
+        schema = self.load_schema('')
+
+        int16 = schema.get('std::int16')
+        int32 = schema.get('std::int32')
+        int64 = schema.get('std::int64')
+        str_t = schema.get('std::str')
+
+        dist = s_casts.get_implicit_cast_distance
+        self.assertEqual(dist(schema, int16, int16), 0)
+        self.assertEqual(dist(schema, int16, int32), 1)
+        self.assertEqual(dist(schema, int16, int64), 2)
+        self.assertEqual(dist(schema, int64, int16), -1)
+        self.assertEqual(dist(schema, str_t, int64), -1)
+
+        self.assertEqual(
+            s_casts.find_common_castable_type(schema, int16, int64),
+            int64)
+        self.assertTrue(
+            s_casts.is_assignment_castable(schema, int64, int16))
+        self.assertFalse(
+            s_casts.is_assignment_castable(schema, str_t, int16))
+
+    def test_schema_caches_01(self):
+        schema = self.load_schema('')
+
+        # The std schema is shared by the tests, so the first lookup
+        # may already be cached; only look at the changes after it.
+        schema.get_functions('std::len')
+        orig = schema.get_cache_stats()['functions']
+        schema.get_functions('std::len')
+        stats = schema.get_cache_stats()['functions']
+        self.assertEqual(stats.misses, orig.misses)
+        self.assertEqual(stats.hits, orig.hits + 1)
+
+        # Creating a type does not affect function lookups, so
+        # the new schema keeps the cache of its predecessor.
+        schema = self.run_ddl(schema, '''
+            CREATE TYPE test::Foo;
+        ''')
+        stats = schema.get_cache_stats()['functions']
+
+        schema.get_functions('std::len')
+        new_stats = schema.get_cache_stats()['functions']
+        self.assertEqual(new_stats.hits, stats.hits + 1)
+        self.assertEqual(new_stats.misses, stats.misses)
+
+    def test_schema_resolutions_cache_01(self):
+        schema = self.load_schema('''
+            type Foo {
+                property n -> int64;
+            };
+        ''')
+
+        # Each view below is derived while compiling the query, which
+        # must not flush the call resolutions cached for the previous
+        # operands, as the views are new types.
+        ir = qlcompiler.compile_ast_to_ir(
+            qlparser.parse('''
+                SELECT (
+                    Foo { a := 1 }.n + 1,
+                    Foo { b := 2 }.n + 1,
+                    Foo { c := 3 }.n + 1,
+                )
+            '''),
+            schema,
+            modaliases={None: 'test'},
+        )
+        stats = ir.schema.get_cache_stats()['call_resolutions']
+        self.assertEqual(stats.misses, 1)
+        self.assertEqual(stats.hits, 2)
+
+    def test_schema_mutation_01(self):
+        schema = self.load_schema('''
+            type Foo;
+            type Bar extending Foo;
+        ''')
+
+        Foo = schema.get('test::Foo')
+        Bar = schema.get('test::Bar')
+
+        mutation = schema.mutate()
+        mutation.set_field_value(Foo, 'is_abstract', True)
+        mutation.update_obj(Bar, {'bases': [], 'ancestors': []})
+        new_schema = mutation.finish()
+
+        self.assertTrue(Foo.get_is_abstract(new_schema))
+        self.assertFalse(Foo.get_is_abstract(schema))
+        self.assertEqual(Bar.get_bases(new_schema).objects(new_schema), ())
+        self.assertEqual(
+            new_schema.get_referrers(Foo, scls_type=s_objtypes.ObjectType),
+            frozenset())
+        self.assertEqual(
+            schema.get_referrers(Foo, scls_type=s_objtypes.ObjectType),
+            frozenset({Bar}))
+        self.assertIs(schema.mutate().finish(), schema)
+
+    def test_schema_referrers_cache_01(self):
+        schema = self.load_schema('''
+            type Foo;
+            type Bar extending Foo;
+        ''')
+
+        Foo = schema.get('test::Foo')
+        Bar = schema.get('test::Bar')
+        children = schema.get_children(Foo)
+        self.assertEqual(children, frozenset({Bar}))
+
+        # Unrelated changes keep the computed referrers.
+        new_schema = self.run_ddl(schema, '''
+            CREATE TYPE test::Baz;
+        ''')
+        self.assertIs(new_schema.get_children(Foo), children)
+
+        new_schema = self.run_ddl(new_schema, '''
+            CREATE TYPE test::Spam EXTENDING test::Foo;
+        ''')
+        self.assertEqual(
+            new_schema.get_children(Foo),
+            frozenset({Bar, new_schema.get('test::Spam')}))
+        self.assertIs(schema.get_children(Foo), children)
+
+    def test_schema_names_cache_01(self):
+        schema = self.load_schema('''
+            type Foo;
+        ''')
+
+        aliases = {None: 'test'}
+        Foo = schema.get('test::Foo')
+        self.assertIs(schema.get('Foo', module_aliases=aliases), Foo)
+        self.assertIsNone(schema.get('Bar', None, module_aliases=aliases))
+        self.assertEqual(
+            schema.get('Object', module_aliases=aliases).get_name(schema),
+            'std::Object')
+
+        hits = schema.get_cache_stats()['names'].hits
+        self.assertIs(schema.get('Foo', module_aliases=aliases), Foo)
+        self.assertIsNone(schema.get('Bar', None, module_aliases=aliases))
+        self.assertEqual(schema.get_cache_stats()['names'].hits, hits + 2)
+
+        # A negative result must not survive the creation of the object.
+        schema = self.run_ddl(schema, '''
+            CREATE TYPE test::Bar;
+        ''')
+        self.assertEqual(
+            schema.get('Bar', module_aliases=aliases).get_name(schema),
+            'test::Bar')
+
+        with self.assertRaisesRegex(errors.InvalidReferenceError,
+                                    "'Baz' does not exist"):
+            schema.get('Baz', module_aliases=aliases)
+
+    def test_schema_names_cache_02(self):
+        schema = self.load_schema('''
+            type Foo;
+        ''')
+
+        aliases = {None: 'test'}
+        Foo = schema.get('test::Foo')
+        self.assertIsNone(schema.get('Bar', None, module_aliases=aliases))
+        old_map = weakref.ref(schema._name_to_id)
+
+        # Drop the schema the negative result was cached for.  The
+        # entry is keyed on the id of the name map, so the cache must
+        # keep the map alive, or a later version could get a name map
+        # with the same id and hit the stale entry.
+        schema = self.run_ddl(schema, '''
+            CREATE TYPE test::Bar;
+        ''')
+        gc.collect()
+        self.assertIsNotNone(old_map())
+
+        for i in range(20):
+            mutation = schema.mutate()
+            mutation.set_field_value(
+                Foo, 'name', s_name.Name(module='test', name=f'Foo{i}'))
+            new_schema = mutation.finish()
+            self.assertIsNot(new_schema._name_to_id, old_map())
+            self.assertEqual(
+                new_schema.get('Bar', module_aliases=aliases)
+                .get_name(new_schema),
+                'test::Bar')
+            self.assertEqual(
+                new_schema.get(f'Foo{i}', module_aliases=aliases), Foo)
+            del new_schema
+            gc.collect()
+
+    def test_schema_shared_collections_01(self):
+        schema = self.load_schema('''
+            type Foo;
+            type Bar;
+        ''')
+
+        Foo = schema.get('test::Foo')
+        Bar = schema.get('test::Bar')
+
+        # Equal collections are stored once.
+        self.assertIs(Foo.get_bases(schema), Bar.get_bases(schema))
+        self.assertIs(Foo.get_ancestors(schema), Bar.get_ancestors(schema))
+
+    def test_schema_structural_hash_01(self):
+        source = '''
+            type Foo {
+                property name -> str;
+            };
+            type Bar {
+                link foo -> Foo;
+            };
+        '''
+        schema1 = self.load_schema(source)
+        schema2 = self.load_schema(source)
+
+        Bar1 = schema1.get('test::Bar')
+        Bar2 = schema2.get('test::Bar')
+
+        # Independently built schemas have different ids, but the
+        # same structure.
+        self.assertNotEqual(Bar1.id, Bar2.id)
+        self.assertEqual(
+            Bar1.structural_hash_criteria(schema1),
+            Bar2.structural_hash_criteria(schema2),
+        )
+        self.assertEqual(
+            list(s_ddl.delta_schemas(schema1, schema2).get_subcommands()),
+            [],
+        )
+
+        # A change of a pointer is a change of the type it belongs to.
+        schema3 = self.run_ddl(schema1, '''
+            ALTER TYPE test::Foo {
+                ALTER PROPERTY name SET REQUIRED;
+            };
+        ''')
+        Foo1 = schema1.get('test::Foo')
+        Foo3 = schema3.get('test::Foo')
+        self.assertNotEqual(
+            Foo1.structural_hash_criteria(schema1),
+            Foo3.structural_hash_criteria(schema3),
+        )
+
+        diff = s_ddl.delta_schemas(schema1, schema3)
+        self.assertEqual(
+            [cmd.classname for cmd in diff.get_subcommands(
+                type=s_objtypes.AlterObjectType)],
+            ['test::Foo'],
+        )
+
+    def test_schema_structural_hash_02(self):
+        source = '''
+            abstract type Named {{
+                {name_qual} property name -> str;
+            }};
+            type Foo extending Named {{
+                property a -> str;
+                {b_qual} property b -> int64;
+            }};
+            type Bar {{
+                link foo -> Foo;
+                property c -> str;
+            }};
+        '''
+
+        def get_diff(schema1, schema2):
+            def walk(cmd):
+                for sub in cmd.get_subcommands():
+                    if isinstance(sub, s_delta.AlterObjectProperty):
+                        yield cmd.classname, sub.property, sub.new_value
+                    else:
+                        yield from walk(sub)
+
+            diff = s_ddl.delta_schemas(schema1, schema2)
+            return (
+                [cmd.classname for cmd in diff.get_subcommands()],
+                list(walk(diff)),
+            )
+
+        schema1 = self.load_schema(source.format(name_qual='', b_qual=''))
+
+        # A change of a pointer alters only that pointer, and neither
+        # the other fields of the type that owns it, nor the types
+        # that link to it.
+        schema2 = self.load_schema(
+            source.format(name_qual='', b_qual='required'))
+        types, changes = get_diff(schema1, schema2)
+        self.assertEqual(types, ['test::Foo'])
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0][1:], ('required', True))
+        self.assertEqual(
+            s_name.shortname_from_fullname(changes[0][0]).name, 'b')
+
+        # A change of an inherited pointer is propagated by altering the
+        # ancestor, so the type that inherits the pointer is not altered.
+        schema3 = self.load_schema(
+            source.format(name_qual='required', b_qual=''))
+        types, changes = get_diff(schema1, schema3)
+        self.assertEqual(types, ['test::Named'])
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0][1:], ('required', True))
+
+    def test_schema_get_objects_01(self):
+        schema = self.load_schema('''
+            type Foo;
+            type Bar;
+        ''')
+
+        def get_names(schema, **kwargs):
+            return {
+                obj.get_name(schema)
+                for obj in schema.get_objects(**kwargs)
+            }
+
+        self.assertEqual(
+            get_names(schema, type=s_objtypes.ObjectType,
+                      included_modules=['test']),
+            {'test::Foo', 'test::Bar'},
+        )
+
+        schema = self.run_ddl(schema, '''
+            ALTER TYPE test::Foo {
+                RENAME TO test::Baz;
+            };
+            DROP TYPE test::Bar;
+        ''')
+
+        self.assertEqual(
+            get_names(schema, type=s_objtypes.ObjectType,
+                      included_modules=['test']),
+            {'test::Baz'},
+        )
+
+        names = get_names(schema, included_modules=['test'])
+        self.assertIn('test::Baz', names)
+        self.assertNotIn('test::Foo', names)
+        self.assertNotIn('test::Bar', names)
+
+        self.assertIn(
+            'std::Object',
+            get_names(schema, type=s_objtypes.ObjectType,
+                      excluded_modules=['test']),
+        )
+
 
 class TestGetMigration(tb.BaseSchemaLoadTest):
     """Test migration deparse consistency.
@@ -17,8 +17,15 @@
 #
 
 
+import unittest
+
+import immutables
+
 from edb.testbase import lang as tb
+from edb.pgsql import compiler as pg_compiler
 from edb.server import compiler
+from edb.server.compiler import compiler as compiler_mod
+from edb.server.compiler import dbstate
 
 
 class TestServerCompiler(tb.BaseSchemaLoadTest):
@@ -46,3 +53,200 @@ class TestServerCompiler(tb.BaseSchemaLoadTest):
                 }
             ''',
         )
+
+    def test_server_compiler_ir_cache_01(self):
+        comp = compiler.Compiler(None)
+        comp._std_schema = self._std_schema
+
+        state = dbstate.CompilerConnectionState(
+            1,
+            self.schema,
+            immutables.Map({None: 'test'}),
+            immutables.Map(),
+            compiler.Capability.ALL)
+
+        eql = b'SELECT Foo { bar }'
+        sql = set()
+        for output_format in (pg_compiler.OutputFormat.JSON,
+                              pg_compiler.OutputFormat.JSON_ELEMENTS):
+            ctx = compiler_mod.CompileContext(
+                state=state,
+                output_format=output_format,
+                expected_cardinality_one=False,
+                stmt_mode=compiler.CompileStatementMode.SINGLE,
+            )
+            units = comp._compile(ctx=ctx, eql=eql)
+            sql.add(units[0].sql)
+
+        # Every format gets its own SQL, but the query is compiled
+        # to IR only once.
+        self.assertEqual(len(sql), 2)
+        self.assertEqual(len(comp._ir_cache), 1)
+        [variants] = comp._ir_cache.values()
+        self.assertEqual(len(variants), 1)
+
+        # The binary format has implicit fields in shapes.
+        ctx = compiler_mod.CompileContext(
+            state=state,
+            output_format=pg_compiler.OutputFormat.NATIVE,
+            expected_cardinality_one=False,
+            stmt_mode=compiler.CompileStatementMode.SINGLE,
+        )
+        comp._compile(ctx=ctx, eql=eql)
+        self.assertEqual(len(comp._ir_cache), 1)
+        [variants] = comp._ir_cache.values()
+        self.assertEqual(len(variants), 2)
+
+    def test_server_compiler_ir_cache_02(self):
+        comp = compiler.Compiler(None)
+        comp._std_schema = self._std_schema
+
+        def compile(dbver, output_format, implicit_limit):
+            state = dbstate.CompilerConnectionState(
+                dbver,
+                self.schema,
+                immutables.Map({None: 'test'}),
+                immutables.Map(),
+                compiler.Capability.ALL)
+            ctx = compiler_mod.CompileContext(
+                state=state,
+                output_format=output_format,
+                expected_cardinality_one=False,
+                implicit_limit=implicit_limit,
+                stmt_mode=compiler.CompileStatementMode.SINGLE,
+            )
+            comp._compile(ctx=ctx, eql=b'SELECT 1 + 1')
+
+        # Implicit fields do not change the IR of a scalar query.
+        compile(1, pg_compiler.OutputFormat.NATIVE, 0)
+        compile(1, pg_compiler.OutputFormat.JSON, 0)
+        self.assertEqual(len(comp._ir_cache), 1)
+        [variants] = comp._ir_cache.values()
+        self.assertEqual(len(variants), 1)
+
+        # The implicit LIMIT does.
+        compile(1, pg_compiler.OutputFormat.JSON, 10)
+        [variants] = comp._ir_cache.values()
+        self.assertEqual(len(variants), 2)
+
+        # Entries for the previous database version are dropped.
+        compile(2, pg_compiler.OutputFormat.JSON, 0)
+        self.assertEqual(len(comp._ir_cache), 1)
+        [variants] = comp._ir_cache.values()
+        self.assertEqual(len(variants), 1)
+
+    def test_server_compiler_ddl_coalesce_01(self):
+        comp = compiler.Compiler(None)
+        comp._std_schema = self._std_schema
+
+        state = dbstate.CompilerConnectionState(
+            1,
+            self.schema,
+            immutables.Map({None: 'test'}),
+            immutables.Map(),
+            compiler.Capability.ALL)
+
+        ctx = compiler_mod.CompileContext(
+            state=state,
+            output_format=pg_compiler.OutputFormat.JSON,
+            expected_cardinality_one=False,
+            stmt_mode=compiler.CompileStatementMode.SINGLE,
+        )
+        units = comp._compile(ctx=ctx, eql=b'''
+            ALTER TYPE Foo {
+                CREATE PROPERTY a -> str;
+                CREATE PROPERTY b -> int64;
+                CREATE PROPERTY c -> bool;
+            };
+        ''')
+
+        sql = b'\n'.join(units[0].sql).decode()
+        # The new columns are added by a single ALTER TABLE, and
+        # the metadata of the new properties is recorded by a single
+        # multi-row INSERT.
+        self.assertEqual(sql.count('ALTER TABLE'), 1)
+        self.assertEqual(sql.count('INSERT INTO'), 1)
+
+
+class TestServerCompileStats(unittest.TestCase):
+
+    def test_server_compile_stats_01(self):
+        stats = compiler.CompileStats()
+        with stats.measure('parse'):
+            pass
+        with stats.measure('ql_compile'):
+            pass
+        with stats.measure('ql_compile'):
+            pass
+
+        other = compiler.CompileStats()
+        with other.measure('pg_compile'):
+            pass
+        stats.merge(other)
+
+        self.assertEqual(
+            list(stats.as_dict()),
+            ['parse', 'ql_compile', 'pg_compile'])
+
+        hist = compiler.CompileStatsHistograms()
+        hist.record(stats)
+        hist.record(other)
+
+        self.assertEqual(hist.get_count('parse'), 1)
+        self.assertEqual(hist.get_count('pg_compile'), 2)
+        self.assertEqual(sum(hist.get_buckets('pg_compile')), 2)
+        self.assertEqual(sum(hist.get_buckets('describe')), 0)
+
+        hist_dict = hist.as_dict()
+        self.assertEqual(
+            list(hist_dict),
+            ['parse', 'ql_compile', 'pg_compile'])
+        self.assertEqual(hist_dict['pg_compile']['count'], 2)
+        self.assertEqual(
+            hist_dict['pg_compile']['buckets'],
+            hist.get_buckets('pg_compile'))
+        self.assertEqual(
+            hist_dict['ql_compile']['time'],
+            hist.get_total_time('ql_compile'))
+
+
+class TestServerParseCache(unittest.TestCase):
+
+    def test_server_parse_cache_01(self):
+        comp = compiler.Compiler({})
+        eql = 'SELECT 1; SELECT {2, 3};'
+
+        first = comp._parse_block(eql)
+        # The first tree is handed out without being cached.
+        self.assertIsNone(comp._parse_cache[eql])
+
+        second = comp._parse_block(eql)
+        cached = comp._parse_cache[eql]
+        self.assertIsNotNone(cached)
+
+        third = comp._parse_block(eql)
+
+        self.assertEqual(len(comp._parse_cache), 1)
+        for statements in (first, second, third):
+            self.assertEqual(len(statements), 2)
+            # Every caller gets its own tree.
+            self.assertIsNot(statements[0], cached[0])
+            self.assertIsNot(statements[0].context, cached[0].context)
+            self.assertEqual(statements[0].context.start.pointer,
+                             cached[0].context.start.pointer)
+
+        self.assertIsNot(first[0], second[0])
+        self.assertIsNot(second[0], third[0])
+
+    def test_server_parse_cache_02(self):
+        comp = compiler.Compiler({})
+        eql = 'ROLLBACK;'
+
+        # Trees that are only inspected are cached right away...
+        probe = comp._parse_block(eql, copy_ast=False)
+        self.assertIs(comp._parse_cache[eql], probe)
+        self.assertIs(comp._parse_block(eql, copy_ast=False), probe)
+
+        # ...and copied for the compilation that follows.
+        compiled = comp._parse_block(eql)
+        self.assertIsNot(compiled[0], probe[0])
@@ -18,6 +18,7 @@
 
 import asyncio
 import json
+import struct
 import uuid
 import subprocess
 import sys
@@ -25,10 +26,12 @@ import tempfile
 import unittest
 
 import edgedb
+from edgedb import scram
 
 from edb.common import devmode
 from edb.common import taskgroup as tg
 from edb.server import main as server_main
+from edb.server import mng_port
 from edb.testbase import server as tb
 from edb.tools import test
 
@@ -2515,6 +2518,268 @@ class TestServerProtoDDL(tb.NonIsolatedDDLTestCase):
                 DROP SCALAR TYPE tid_prop_02;
             ''')
 
+    async def _get_backend_index_metadata(self, typename):
+        # Metadata of the valid backend indexes defined by the schema
+        # on the table of the given type.
+        result = await self.con.fetchall('''
+            WITH T := (
+                SELECT schema::ObjectType FILTER .name = <str>$typename
+            )
+            SELECT std::_get_valid_index_metadata(T.id)
+        ''', typename=typename)
+
+        return [
+            md for md in map(json.loads, result) if 'schemaname' in md
+        ]
+
+    async def test_server_proto_concurrent_index_build_01(self):
+        await self.con.execute('''
+            CONFIGURE SESSION SET concurrent_index_builds := true;
+
+            CREATE TYPE test::ConcIdx01 {
+                CREATE PROPERTY name -> str;
+            };
+            CREATE TYPE test::ConcIdx01Child EXTENDING test::ConcIdx01;
+
+            INSERT test::ConcIdx01 { name := 'a' };
+            INSERT test::ConcIdx01Child { name := 'b' };
+        ''')
+
+        try:
+            await self.con.execute('''
+                ALTER TYPE test::ConcIdx01 {
+                    CREATE INDEX ON (.name);
+                };
+            ''')
+
+            # The index is built on the tables of the type and of
+            # its subtypes, and there are no leftovers of the build.
+            parent_indexes = await self._get_backend_index_metadata(
+                'test::ConcIdx01')
+            self.assertEqual(len(parent_indexes), 1)
+            self.assertTrue(parent_indexes[0].get('ddl:inherit'))
+            self.assertFalse(parent_indexes[0].get('ddl:inherited'))
+            index_name = parent_indexes[0]['schemaname']
+
+            child_indexes = await self._get_backend_index_metadata(
+                'test::ConcIdx01Child')
+            self.assertEqual(len(child_indexes), 1)
+            self.assertEqual(child_indexes[0]['schemaname'], index_name)
+            self.assertTrue(child_indexes[0].get('ddl:inherited'))
+
+            # Subtypes created after the build inherit the index.
+            await self.con.execute('''
+                CREATE TYPE test::ConcIdx01Child2 EXTENDING test::ConcIdx01;
+            ''')
+            child2_indexes = await self._get_backend_index_metadata(
+                'test::ConcIdx01Child2')
+            self.assertEqual(len(child2_indexes), 1)
+            self.assertEqual(child2_indexes[0]['schemaname'], index_name)
+
+            await self.assert_query_result(
+                r'''
+                    WITH MODULE schema
+                    SELECT ObjectType {
+                        indexes: { expr }
+                    }
+                    FILTER .name = 'test::ConcIdx01Child';
+                ''',
+                [{
+                    'indexes': [{'expr': '.name'}],
+                }],
+            )
+
+            await self.assert_query_result(
+                r'''
+                    SELECT test::ConcIdx01.name ORDER BY test::ConcIdx01.name
+                ''',
+                ['a', 'b'],
+            )
+
+            # The index is dropped as usual.
+            await self.con.execute('''
+                ALTER TYPE test::ConcIdx01 {
+                    DROP INDEX ON (.name);
+                };
+            ''')
+            self.assertEqual(
+                await self._get_backend_index_metadata('test::ConcIdx01'),
+                [])
+
+        finally:
+            await self.con.execute('''
+                CONFIGURE SESSION RESET concurrent_index_builds;
+                DROP TYPE test::ConcIdx01Child2;
+                DROP TYPE test::ConcIdx01Child;
+                DROP TYPE test::ConcIdx01;
+            ''')
+
+    async def test_server_proto_concurrent_index_build_02(self):
+        await self.con.execute('''
+            CONFIGURE SESSION SET concurrent_index_builds := true;
+
+            CREATE TYPE test::ConcIdx02 {
+                CREATE PROPERTY name -> str;
+            };
+
+            INSERT test::ConcIdx02 { name := 'a' };
+        ''')
+
+        try:
+            # The index is built, but the DDL transaction fails
+            # afterwards, as the existing object has no value for the
+            # new required property.  The built index must not be
+            # left behind.
+            with self.assertRaises(edgedb.EdgeDBError):
+                await self.con.execute('''
+                    ALTER TYPE test::ConcIdx02 {
+                        CREATE INDEX ON (.name);
+                        CREATE REQUIRED PROPERTY bad -> str;
+                    };
+                ''')
+
+            result = await self.con.fetchall('''
+                WITH T := (
+                    SELECT schema::ObjectType
+                    FILTER .name = 'test::ConcIdx02'
+                )
+                SELECT std::_get_valid_index_metadata(T.id)
+            ''')
+            self.assertEqual(len(result), 0)
+
+        finally:
+            await self.con.execute('''
+                CONFIGURE SESSION RESET concurrent_index_builds;
+                DROP TYPE test::ConcIdx02;
+            ''')
+
+    async def test_server_proto_concurrent_index_build_03(self):
+        await self.con.execute('''
+            CONFIGURE SESSION SET concurrent_index_builds := true;
+
+            CREATE TYPE test::ConcIdx03 {
+                CREATE PROPERTY name -> str;
+            };
+            CREATE TYPE test::ConcIdx03Child EXTENDING test::ConcIdx03;
+
+            INSERT test::ConcIdx03 { name := 'a' };
+            INSERT test::ConcIdx03Child { name := 'a' };
+        ''')
+
+        try:
+            # The unique index is built ahead of the DDL transaction
+            # and fails on the duplicate values, so the constraint is
+            # not created.
+            with self.assertRaises(edgedb.EdgeDBError):
+                await self.con.execute('''
+                    ALTER TYPE test::ConcIdx03 {
+                        ALTER PROPERTY name {
+                            CREATE CONSTRAINT exclusive;
+                        };
+                    };
+                ''')
+
+            await self.con.execute('''
+                INSERT test::ConcIdx03 { name := 'a' };
+            ''')
+
+            # Once the duplicates are gone, a retried build succeeds.
+            await self.con.execute('''
+                DELETE test::ConcIdx03;
+            ''')
+            await self.con.execute('''
+                ALTER TYPE test::ConcIdx03 {
+                    ALTER PROPERTY name {
+                        CREATE CONSTRAINT exclusive;
+                    };
+                };
+            ''')
+
+            await self.con.execute('''
+                INSERT test::ConcIdx03 { name := 'a' };
+            ''')
+
+            # The constraint is enforced on the type and its subtypes.
+            with self.assertRaises(edgedb.ConstraintViolationError):
+                await self.con.execute('''
+                    INSERT test::ConcIdx03 { name := 'a' };
+                ''')
+            with self.assertRaises(edgedb.ConstraintViolationError):
+                await self.con.execute('''
+                    INSERT test::ConcIdx03Child { name := 'a' };
+                ''')
+
+        finally:
+            await self.con.execute('''
+                CONFIGURE SESSION RESET concurrent_index_builds;
+                DROP TYPE test::ConcIdx03Child;
+                DROP TYPE test::ConcIdx03;
+            ''')
+
+    async def test_server_proto_concurrent_index_build_04(self):
+        await self.con.execute('''
+            CREATE TYPE test::ConcIdx04 {
+                CREATE PROPERTY name -> str;
+            };
+        ''')
+
+        try:
+            await self.con.execute('''
+                CONFIGURE SESSION SET concurrent_index_builds := true;
+            ''')
+
+            # The concurrent build runs outside of a transaction, so
+            # it cannot be a part of a larger atomic unit.
+            with self.assertRaisesRegex(
+                    edgedb.QueryError, 'in a multi-statement script'):
+                await self.con.execute('''
+                    ALTER TYPE test::ConcIdx04 {
+                        CREATE INDEX ON (.name);
+                    };
+                    CREATE TYPE test::ConcIdx04Other;
+                ''')
+
+            await self.con.execute('START TRANSACTION')
+            try:
+                with self.assertRaisesRegex(
+                        edgedb.QueryError, 'in a transaction block'):
+                    await self.con.execute('''
+                        ALTER TYPE test::ConcIdx04 {
+                            CREATE INDEX ON (.name);
+                        };
+                    ''')
+            finally:
+                await self.con.execute('ROLLBACK')
+
+            # Neither script has left anything behind.
+            await self.assert_query_result(
+                r'''
+                    WITH MODULE schema
+                    SELECT ObjectType {
+                        indexes: { expr }
+                    }
+                    FILTER .name LIKE 'test::ConcIdx04%';
+                ''',
+                [{
+                    'indexes': [],
+                }],
+            )
+
+            # Without the setting, the command is executed in the
+            # transaction as usual.
+            await self.con.execute('''
+                CONFIGURE SESSION RESET concurrent_index_builds;
+                ALTER TYPE test::ConcIdx04 {
+                    CREATE INDEX ON (.name);
+                };
+            ''')
+
+        finally:
+            await self.con.execute('''
+                CONFIGURE SESSION RESET concurrent_index_builds;
+                DROP TYPE test::ConcIdx04;
+            ''')
+
     async def test_server_proto_fetch_limit_01(self):
         try:
             await self.con.execute('''
@@ -2637,3 +2902,146 @@ class TestServerProtoDDL(tb.NonIsolatedDDLTestCase):
             SELECT {"test1", "test2"}
         ''')
         self.assertEqual(result, ['"test1"', '"test2"'])
+
+
+def _lp(data: bytes) -> bytes:
+    return struct.pack('!i', len(data)) + data
+
+
+class RawConnection:
+    """A bare-bones binary protocol client.
+
+    Exercises the protocol features that the client library does
+    not expose, such as arbitrary message headers.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(cls, *, host, port, user, password, database):
+        reader, writer = await asyncio.open_connection(host, port)
+        con = cls(reader, writer)
+        try:
+            await con._handshake(user, password, database)
+        except BaseException:
+            con.close()
+            raise
+        return con
+
+    def send(self, mtype: bytes, payload: bytes = b'') -> None:
+        self._writer.write(
+            mtype + struct.pack('!i', len(payload) + 4) + payload)
+
+    async def recv(self):
+        header = await self._reader.readexactly(5)
+        length, = struct.unpack('!i', header[1:])
+        payload = await self._reader.readexactly(length - 4)
+        mtype = header[:1]
+        if mtype == b'E':
+            raise AssertionError(f'unexpected ErrorResponse: {payload!r}')
+        return mtype, payload
+
+    async def recv_until(self, mtype: bytes):
+        messages = []
+        while True:
+            msg = await self.recv()
+            messages.append(msg)
+            if msg[0] == mtype:
+                return messages
+
+    async def _handshake(self, user, password, database):
+        major, minor = mng_port.CURRENT_PROTOCOL
+        self.send(
+            b'V',
+            struct.pack('!HHH', major, minor, 2) +
+            _lp(b'user') + _lp(user.encode()) +
+            _lp(b'database') + _lp(database.encode()) +
+            struct.pack('!H', 0),
+        )
+
+        client_first_bare = None
+        while True:
+            mtype, payload = await self.recv()
+            if mtype == b'Z':
+                return
+            elif mtype != b'R':
+                continue
+
+            status, = struct.unpack('!i', payload[:4])
+            if status == 10:
+                # SASL
+                nonce = scram.generate_nonce()
+                client_first, client_first_bare = (
+                    scram.build_client_first_message(nonce, user))
+                self.send(
+                    b'p',
+                    _lp(b'SCRAM-SHA-256') + _lp(client_first.encode()))
+            elif status == 11:
+                # SASLContinue
+                server_first = payload[8:]
+                server_nonce, salt, itercount = (
+                    scram.parse_server_first_message(server_first))
+                client_final, _ = scram.build_client_final_message(
+                    password, salt, itercount,
+                    client_first_bare.encode(), server_first,
+                    server_nonce)
+                self.send(b'r', _lp(client_final.encode()))
+
+    async def parse(self, query: str, headers: dict):
+        payload = struct.pack('!H', len(headers))
+        for key, value in headers.items():
+            payload += struct.pack('!H', key) + _lp(value)
+        payload += b'bm' + _lp(b'') + _lp(query.encode())
+
+        self.send(b'P', payload)
+        self.send(b'S')
+
+        messages = await self.recv_until(b'Z')
+        payload = next(p for mtype, p in messages if mtype == b'1')
+
+        result = {}
+        num_headers, = struct.unpack('!H', payload[:2])
+        pos = 2
+        for _ in range(num_headers):
+            key, length = struct.unpack('!Hi', payload[pos:pos + 6])
+            pos += 6
+            result[key] = payload[pos:pos + length]
+            pos += length
+        return result
+
+    def close(self):
+        self.send(b'X')
+        self._writer.close()
+
+
+class TestServerProtoHeaders(tb.ConnectedTestCase):
+
+    QUERY_OPT_COMPILE_STATS = 0xFF02
+
+    async def test_server_proto_compile_stats_01(self):
+        args = self.get_connect_args()
+        con = await RawConnection.connect(
+            host=args['host'], port=args['port'], user=args['user'],
+            password=args['password'], database=args['database'])
+        try:
+            headers = await con.parse(
+                'SELECT "compile_stats_01"',
+                {self.QUERY_OPT_COMPILE_STATS: b''})
+            self.assertEqual(list(headers), [self.QUERY_OPT_COMPILE_STATS])
+
+            stats = json.loads(headers[self.QUERY_OPT_COMPILE_STATS])
+            self.assertEqual(
+                list(stats),
+                ['parse', 'ql_compile', 'pg_compile', 'describe'])
+            for phase_stats in stats.values():
+                self.assertEqual(
+                    set(phase_stats), {'time', 'allocations'})
+                self.assertGreaterEqual(phase_stats['time'], 0)
+
+            # The stats are only reported when requested.
+            headers = await con.parse('SELECT "compile_stats_01"', {})
+            self.assertEqual(headers, {})
+        finally:
+            con.close()